@@ -21,6 +21,107 @@ def setup_logging():
     return logging.getLogger(__name__)
 
 # Other configuration constants
-SUPPORTED_OUTPUT_FORMATS = ['csv', 'parquet', 'excel']
-TABLE_START_OFFSET = 2  # Rows below 'date' where table starts
-EXPECTED_COLUMNS = 4    # Expected number of columns in the table
\ No newline at end of file
+SUPPORTED_OUTPUT_FORMATS = ['csv', 'parquet', 'feather', 'excel']
+DEFAULT_OUTPUT_FORMAT = 'csv'
+PARQUET_COMPRESSION = 'snappy'   # 'snappy', 'zstd', 'gzip' or None
+PARQUET_ROW_GROUP_SIZE = 100000  # Rows per Parquet row group
+FEATHER_COMPRESSION = 'lz4'      # 'lz4', 'zstd' or 'uncompressed'
+TABLE_START_OFFSET = 1  # Rows below the 'date' line where the table header row is
+EXPECTED_COLUMNS = 4    # Expected number of columns in the table
+
+# Typed read schema: only these leading columns are parsed, with these dtypes
+TABLE_COLUMNS = ['Date', 'Time', 'Temp', 'RH']
+MEASUREMENT_DTYPE = 'float64'  # dtype for Temp and RH ('float32' halves their memory)
+CSV_ENGINE = 'auto'            # 'auto' (pyarrow when installed and it parses a test table, else 'c'), 'c', 'pyarrow' or 'python'
+                               # (files pyarrow rejects, e.g. with a cut-off last row, are re-read with 'c')
+CSV_NA_VALUES = ['', 'NA', 'N/A', 'NaN', 'nan', '-', '--']
+
+# Date+Time layouts written by our loggers, tried in order (first full match wins)
+TIMESTAMP_FORMATS = [
+    '%d/%m/%Y %H:%M:%S',
+    '%d/%m/%Y %H:%M',
+    '%d/%m/%Y %I:%M:%S %p',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%d-%m-%Y %H:%M:%S',
+    '%m/%d/%Y %H:%M:%S',
+]
+TIMESTAMP_DAYFIRST = True  # Fallback when no format matches: dates are dd/mm/yyyy
+TIMESTAMP_SAMPLE_ROWS = 20  # Rows used to pick a format before parsing the whole column
+
+# Header detection rules, tried in order on each preamble line (the first rule
+# matching a line wins, wherever its signature is on the line). Each rule
+# lists the whole-word signatures (case-insensitive) that mark the table for
+# one logger vendor and how many rows below the matching line the table starts.
+HEADER_RULES = [
+    {'vendor': 'default', 'signatures': ['date'], 'offset': TABLE_START_OFFSET},
+]
+HEADER_MAX_SCAN_LINES = 1000         # Stop looking for a header after this many lines
+HEADER_MAX_SCAN_BYTES = 1024 * 1024  # ... or after this many bytes of preamble
+CSV_ENCODINGS = ['utf-8', 'cp1252']  # Tried in order for files without a byte order mark
+ENCODING_SNIFF_BYTES = 64 * 1024  # Bytes read to detect a file's encoding
+HEADER_SCAN_MMAP = True  # Memory-map files for the header scan and parse (False streams them line by line)
+
+# Parallel extraction settings
+EXTRACTION_EXECUTOR = 'serial'  # 'serial', 'thread' or 'process'
+EXTRACTION_MAX_WORKERS = None   # None lets the executor pick (CPU count based)
+SUPPORTED_EXECUTORS = ['serial', 'thread', 'process']
+PIPELINE_QUEUE_SIZE = 256  # Discovered files buffered ahead of parsing
+PIPELINE_MAX_IN_FLIGHT = None  # Files submitted to the pool at once, None for twice the workers
+
+# Combining settings
+COMBINE_MODE = 'position'  # 'position' (align by row number) or 'timestamp' (align by Date+Time)
+COMBINE_TOLERANCE = None   # e.g. '1min' to snap timestamps to a grid before aligning
+SUPPORTED_COMBINE_MODES = ['position', 'timestamp']
+
+# Streaming export (constant-memory mode)
+STREAMING_CHUNK_ROWS = 50000  # Rows written per chunk of Raw/Temp/RH
+READ_CHUNK_ROWS = 500000  # Rows parsed at a time from files read in chunks
+CHUNKED_READ_MIN_BYTES = 256 * 1024 * 1024  # In streaming mode, files this large are read in chunks
+
+# Charting
+CHART_POINTS_PER_PIXEL = 2  # Points drawn per pixel of plot width after min/max decimation
+SUPPORTED_CHART_FORMATS = ['png', 'svg', 'pdf']
+DEFAULT_CHART_FORMATS = ['png']
+CHART_FIGSIZE = (10, 6)  # Inches
+CHART_DPI = 300
+CHART_RASTERIZE_LINES = False  # Embed data lines in SVG/PDF charts as images; axes and text stay vector
+
+# Extraction cache (Parquet tables in SQLite in the output folder, keyed on path, size and mtime;
+# cleared when parsing settings or the pandas version change)
+EXTRACTION_CACHE_ENABLED = True
+EXTRACTION_CACHE_FILENAME = '.extraction_cache.sqlite'
+
+# Incremental / watch mode
+MANIFEST_FILENAME = '.extraction_manifest.json'  # Files already in the outputs, stored in the output folder
+WATCH_INTERVAL_SECONDS = 60
+WATCH_SETTLE_SECONDS = 5  # Files modified more recently are assumed to still be copying in
+
+# File discovery (fnmatch globs: without '/' against the name in any folder, with '/' against the
+# path relative to the main folder, where '*' stays within one folder and '**' spans folders)
+DISCOVERY_INCLUDE = ['*.csv']
+DISCOVERY_EXCLUDE = []
+DISCOVERY_MAX_DEPTH = None  # Deepest subfolder level to search, None for no limit
+
+# Benchmark (python main.py --benchmark)
+BENCHMARK_FOLDERS = 10
+BENCHMARK_FILES_PER_FOLDER = 10
+BENCHMARK_ROWS = 5000
+BENCHMARK_PREAMBLE_LINES = 20
+BENCHMARK_REPEAT = 3
+BENCHMARK_HISTORY_FILE = 'benchmark_history.json'
+BENCHMARK_REGRESSION_THRESHOLD = 0.2  # Warn when a stage is this much slower than the last comparable run
+BENCHMARK_MIN_REGRESSION_SECONDS = 0.01  # ...and slower by at least this many seconds
+
+# Run reports (written to the output folder after every extraction)
+RUN_REPORT_FILENAME = 'run_report.json'
+RUN_PROFILE_FILENAME = 'run_profile.prof'  # cProfile stats, written when profiling is switched on
+PROFILE_TOP_ENTRIES = 25  # Functions and allocation sites listed in the report when profiling
+
+# Aggregated outputs (min/max/mean per interval, written next to Raw/Temp/RH)
+AGGREGATION_ENABLED = False  # Always write them, without --aggregate
+AGGREGATION_INTERVALS = ['60min', '1D']  # pandas offset aliases
+AGGREGATION_LEVELS = ['logger', 'folder']
+SUPPORTED_AGGREGATION_LEVELS = ['logger', 'folder']
+AGGREGATION_FOLDER_LEVEL = None  # 'folder' level groups by the subfolder path down to this depth (1 = first subfolder), None for each file's folder
+AGGREGATION_STATS = ['min', 'max', 'mean']
\ No newline at end of file
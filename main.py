@@ -2,6 +2,7 @@
 
 import sys
 import os
+import multiprocessing
 import matplotlib
 
 # Add the src directory to the path
@@ -13,6 +14,81 @@ if getattr(sys, 'frozen', False):
     matplotlib.use('Agg')
     os.environ['MATPLOTLIBDATA'] = os.path.join(sys._MEIPASS, 'mpl-data')
 
+def parse_arguments(argv):
+    """
+    Parse command line arguments
+    
+    Args:
+        argv (list): Command line arguments (without the program name)
+        
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    import argparse
+    from config.settings import (
+        DEFAULT_MAIN_FOLDER, SUPPORTED_EXECUTORS, SUPPORTED_COMBINE_MODES,
+        SUPPORTED_OUTPUT_FORMATS, DEFAULT_OUTPUT_FORMAT, SUPPORTED_CHART_FORMATS, DEFAULT_CHART_FORMATS,
+        SUPPORTED_AGGREGATION_LEVELS
+    )
+    
+    parser = argparse.ArgumentParser(description="Extract and combine logger CSV data")
+    parser.add_argument("main_folder", nargs="?", default=DEFAULT_MAIN_FOLDER,
+                        help="Folder to search for CSV files")
+    parser.add_argument("output_folder", nargs="?", default="output",
+                        help="Folder to write the Raw, Temp and RH outputs to")
+    parser.add_argument("--format", choices=SUPPORTED_OUTPUT_FORMATS, default=DEFAULT_OUTPUT_FORMAT,
+                        help="Output file format")
+    parser.add_argument("--executor", choices=SUPPORTED_EXECUTORS,
+                        help="How to parse files (default from settings)")
+    parser.add_argument("--workers", type=int, help="Maximum number of parallel workers")
+    parser.add_argument("--combine-mode", choices=SUPPORTED_COMBINE_MODES,
+                        help="Align files by row position or by timestamp")
+    parser.add_argument("--tolerance", help="Timestamp tolerance for timestamp alignment, e.g. 1min")
+    parser.add_argument("--include", nargs="+", metavar="GLOB",
+                        help="Only process files matching these globs (default *.csv). Globs without '/' match the "
+                             "file name in any folder; globs with '/' match the path relative to the main folder, "
+                             "where '*' stays within one folder and '**' spans folders")
+    parser.add_argument("--exclude", nargs="+", metavar="GLOB",
+                        help="Skip files and folders matching these globs (same rules as --include)")
+    parser.add_argument("--max-depth", type=int, help="Deepest subfolder level to search (0 = main folder only)")
+    parser.add_argument("--no-cache", action="store_true", help="Parse every file, ignoring the extraction cache")
+    parser.add_argument("--stream", action="store_true",
+                        help="Constant-memory mode: write CSV outputs in row chunks (position alignment only)")
+    parser.add_argument("--chunk-rows", type=int, help="Rows per chunk in --stream mode")
+    parser.add_argument("--read-chunk-rows", type=int,
+                        help="Rows parsed at a time from very large files in --stream mode")
+    parser.add_argument("--aggregate", nargs="*", metavar="INTERVAL",
+                        help="Also export min/max/mean tables for these intervals, e.g. 60min 1D (default from settings)")
+    parser.add_argument("--aggregate-by", nargs="+", choices=SUPPORTED_AGGREGATION_LEVELS,
+                        help="Aggregate per logger and/or per folder (default from settings)")
+    parser.add_argument("--aggregate-folder-level", type=int, metavar="LEVEL",
+                        help="Group the per-folder aggregates by the subfolder at this depth (1 = first subfolder) "
+                             "instead of each file's own folder")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only process new or changed files and update the existing outputs")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep polling the main folder and update the outputs as files arrive")
+    parser.add_argument("--interval", type=float, help="Seconds between --watch passes")
+    parser.add_argument("--profile", action="store_true",
+                        help="Capture cProfile and tracemalloc data in the run report (slower)")
+    parser.add_argument("--catalog", metavar="FILE",
+                        help="Write a manifest (.csv or .json) of the files found in the main folder instead of extracting")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Time each stage on a synthetic logger tree and append the result to the benchmark history")
+    parser.add_argument("--bench-folders", type=int, help="Subfolders in the benchmark tree")
+    parser.add_argument("--bench-files", type=int, help="Files per subfolder in the benchmark tree")
+    parser.add_argument("--bench-rows", type=int, help="Rows per benchmark file")
+    parser.add_argument("--bench-preamble", type=int, help="Extra preamble lines per benchmark file")
+    parser.add_argument("--bench-repeat", type=int, help="Runs per benchmark stage (the best is kept)")
+    parser.add_argument("--bench-history", help="Benchmark history JSON file")
+    parser.add_argument("--charts", nargs="+", metavar="FOLDER",
+                        help="Render Temperature and Humidity charts for these output folders instead of extracting")
+    parser.add_argument("--chart-format", nargs="+", choices=SUPPORTED_CHART_FORMATS, default=DEFAULT_CHART_FORMATS,
+                        help="Chart file formats for --charts")
+    parser.add_argument("--rasterize-lines", action="store_true", default=None,
+                        help="Embed chart lines as images in SVG/PDF charts (axes and text stay vector)")
+    return parser.parse_args(argv)
+
 def main():
     """
     Main function to run the application
@@ -29,26 +105,146 @@ def main():
             run_tkinter_gui()
     else:
         # Command line mode
-        import logging
-        from config.settings import setup_logging, DEFAULT_MAIN_FOLDER
-        from src.utils import process_all_files
+        from config.settings import setup_logging
+        from src.utils import process_all_files, process_all_files_streaming
         from src.data_exporter import export_data
+        from src.extraction_cache import get_cache_path
+        from src.instrumentation import RunReport
+        from src.metadata_extractor import FileCatalog
+        from config.settings import AGGREGATION_ENABLED, AGGREGATION_INTERVALS
         
         # Parse command line arguments
-        main_folder = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_MAIN_FOLDER
-        output_folder = sys.argv[2] if len(sys.argv) > 2 else "output"
+        args = parse_arguments(sys.argv[1:])
+        main_folder = args.main_folder
+        output_folder = args.output_folder
+        cache_path = None if args.no_cache else get_cache_path(output_folder)
+        aggregate_intervals = None
+        if args.aggregate is not None or AGGREGATION_ENABLED:
+            aggregate_intervals = args.aggregate or AGGREGATION_INTERVALS
         
         # Setup logging
         logger = setup_logging()
         
+        if args.benchmark:
+            from src.benchmark import run_benchmark
+            
+            run_benchmark(
+                folders=args.bench_folders,
+                files_per_folder=args.bench_files,
+                rows=args.bench_rows,
+                preamble_lines=args.bench_preamble,
+                repeat=args.bench_repeat,
+                history_path=args.bench_history
+            )
+            return
+        
+        if args.catalog:
+            catalog = FileCatalog.from_folder(main_folder, args.include, args.exclude, args.max_depth)
+            if catalog.export_manifest(args.catalog):
+                for name, records in sorted(catalog.group_by_subfolder().items()):
+                    logger.info(f"{name or '(main folder)'}: {len(records)} files, {sum(r.size for r in records)} bytes")
+            return
+        
+        if args.charts:
+            # Headless chart rendering
+            matplotlib.use('Agg')
+            from src.chart_batch import render_charts_batch
+            
+            results = render_charts_batch(args.charts, args.chart_format, args.workers, args.rasterize_lines)
+            failed = [folder for folder in args.charts if not results.get(folder)]
+            if failed:
+                logger.error(f"Failed to render charts for {len(failed)} folders: {failed}")
+            else:
+                logger.info(f"Charts rendered for {len(args.charts)} folders")
+            return
+        
         try:
             logger.info("Starting CSV data extraction process")
             
-            # Process all files
-            raw_df, temp_df, rh_df = process_all_files(main_folder)
+            if args.stream and args.format != 'csv':
+                logger.error("--stream only writes CSV outputs")
+                return
+            
+            if args.stream and (args.incremental or args.watch):
+                logger.error("--stream cannot be combined with --incremental or --watch")
+                return
+            
+            if args.incremental or args.watch:
+                from src.incremental import update_outputs, watch_folder
+                
+                options = dict(
+                    output_format=args.format,
+                    executor=args.executor,
+                    max_workers=args.workers,
+                    cache_path=cache_path,
+                    combine_mode=args.combine_mode,
+                    tolerance=args.tolerance,
+                    include=args.include,
+                    exclude=args.exclude,
+                    max_depth=args.max_depth,
+                    aggregate_intervals=aggregate_intervals,
+                    aggregate_levels=args.aggregate_by,
+                    aggregate_folder_level=args.aggregate_folder_level
+                )
+                if args.watch:
+                    try:
+                        watch_folder(main_folder, output_folder, args.interval, **options)
+                    except KeyboardInterrupt:
+                        logger.info("Stopped watching")
+                    return
+                
+                report = RunReport(profile=args.profile)
+                success = update_outputs(main_folder, output_folder, report=report, **options)
+            elif args.stream:
+                if args.combine_mode == 'timestamp':
+                    logger.warning("--stream aligns files by row position; ignoring --combine-mode timestamp")
+                if aggregate_intervals:
+                    logger.warning("--stream does not keep the combined table in memory; skipping the aggregates")
+                
+                # Process and export in chunks
+                report = RunReport(profile=args.profile)
+                success = process_all_files_streaming(
+                    main_folder,
+                    output_folder,
+                    executor=args.executor,
+                    max_workers=args.workers,
+                    cache_path=cache_path,
+                    chunk_rows=args.chunk_rows,
+                    read_chunk_rows=args.read_chunk_rows,
+                    include=args.include,
+                    exclude=args.exclude,
+                    max_depth=args.max_depth,
+                    report=report
+                )
+            else:
+                # Process all files
+                report = RunReport(profile=args.profile)
+                catalog = FileCatalog(main_folder)
+                combined_df = process_all_files(
+                    main_folder,
+                    executor=args.executor,
+                    max_workers=args.workers,
+                    cache_path=cache_path,
+                    combine_mode=args.combine_mode,
+                    tolerance=args.tolerance,
+                    include=args.include,
+                    exclude=args.exclude,
+                    max_depth=args.max_depth,
+                    report=report,
+                    catalog=catalog
+                )
+                
+                # Export results
+                success = export_data(combined_df, output_folder, args.format, report)
+                
+                if success and aggregate_intervals:
+                    from src.aggregation import export_aggregates
+                    
+                    success = export_aggregates(combined_df, output_folder, args.format, aggregate_intervals,
+                                                args.aggregate_by, catalog, report, args.aggregate_folder_level)
+            
+            report.finish(output_folder)
             
-            # Export results
-            success = export_data(raw_df, temp_df, rh_df, output_folder)
             if success:
                 logger.info(f"Data extraction completed successfully. Output saved to {output_folder}")
             else:
@@ -58,4 +254,6 @@ def main():
             logger.error(f"Unexpected error in main process: {e}")
 
 if __name__ == "__main__":
+    # Required for the process pool executor in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,198 @@
+# Rolled-up min/max/mean tables of the combined data, per logger or per folder
+
+import logging
+
+import pandas as pd
+
+from config.settings import (
+    TABLE_COLUMNS, AGGREGATION_INTERVALS, AGGREGATION_LEVELS, AGGREGATION_STATS,
+    SUPPORTED_AGGREGATION_LEVELS, AGGREGATION_FOLDER_LEVEL, DEFAULT_OUTPUT_FORMAT
+)
+
+logger = logging.getLogger(__name__)
+
+def get_logger_columns(columns):
+    """
+    Find the Timestamp and measurement columns of every logger in the combined table
+    
+    Args:
+        columns (list): Column names of the combined table
+    
+    Returns:
+        tuple: ({logger prefix: {'Timestamp'|'Temp'|'RH': column position}}, position of a shared
+                Timestamp column or None)
+    """
+    suffixes = ['Timestamp'] + TABLE_COLUMNS[2:]
+    loggers = {}
+    shared_timestamp = None
+    for position, name in enumerate(map(str, columns)):
+        if name == 'Timestamp':
+            shared_timestamp = position
+            continue
+        for suffix in suffixes:
+            if name.endswith(f"_{suffix}"):
+                loggers.setdefault(name[:-len(suffix) - 1], {})[suffix] = position
+                break
+    return loggers, shared_timestamp
+
+def _logger_frames(combined_df):
+    """
+    Split the combined table into one time-indexed frame per logger
+    
+    Args:
+        combined_df (pd.DataFrame): Combined table from process_all_files
+    
+    Yields:
+        tuple: (logger prefix, DataFrame of its measurements indexed by timestamp)
+    """
+    loggers, shared_timestamp = get_logger_columns(combined_df.columns)
+    for prefix, positions in loggers.items():
+        time_position = positions.get('Timestamp', shared_timestamp)
+        measurements = [name for name in TABLE_COLUMNS[2:] if name in positions]
+        if time_position is None or not measurements:
+            continue
+        
+        index = pd.DatetimeIndex(pd.to_datetime(combined_df.iloc[:, time_position]), name='Timestamp')
+        frame = pd.DataFrame(
+            {name: combined_df.iloc[:, positions[name]].to_numpy() for name in measurements},
+            index=index
+        )
+        # Padding rows of shorter loggers have no timestamp
+        yield prefix, frame[frame.index.notna()]
+
+def get_folder_groups(records, folder_level=None):
+    """
+    Find the folder group of every logger for the 'folder' aggregation level
+    
+    Args:
+        records (iterable): FileRecord of every file in the run (e.g. a FileCatalog)
+        folder_level (int): Group by the subfolder path down to this level below the main folder
+                            (1 for 'site1', 2 for 'site1/roomA', ...); None groups by each file's own folder
+    
+    Returns:
+        dict: {logger prefix ('parent_filename'): group name}; files directly in the main folder, or
+              not that deep, are grouped under their own folder
+    """
+    groups = {}
+    for record in records:
+        group = record.parent_folder
+        if folder_level is not None and record.folders:
+            group = '/'.join(record.folders[:folder_level])
+        groups[f"{record.parent_folder}_{record.filename}"] = group
+    return groups
+
+def aggregate_data(combined_df, interval, level='logger', groups=None, stats=None):
+    """
+    Resample the combined table into min/max/mean (or other) statistics per interval
+    
+    Each logger's readings are resampled on their own timestamps, so the
+    result is the same in position and timestamp combine modes. At the
+    'folder' level the readings of all loggers in a folder are pooled
+    before resampling. Intervals without readings are left out.
+    
+    Args:
+        combined_df (pd.DataFrame): Combined table from process_all_files
+        interval (str): pandas offset alias, e.g. '60min' or '1D'
+        level (str): 'logger' or 'folder'
+        groups (dict): Folder of each logger prefix ('parent_filename'); without it the
+                       folder is the prefix up to the first underscore
+        stats (list): Statistics to compute (defaults to AGGREGATION_STATS)
+    
+    Returns:
+        pandas.DataFrame: Timestamp (interval start) column, then one column per
+                          group, measurement and statistic
+    """
+    if level not in SUPPORTED_AGGREGATION_LEVELS:
+        raise ValueError(f"Unsupported aggregation level '{level}'. Expected one of {SUPPORTED_AGGREGATION_LEVELS}")
+    stats = stats or AGGREGATION_STATS
+    groups = groups or {}
+    
+    frames = {}
+    for prefix, frame in _logger_frames(combined_df):
+        key = prefix if level == 'logger' else groups.get(prefix, prefix.split('_', 1)[0])
+        frames.setdefault(key, []).append(frame)
+    
+    results = []
+    for key, parts in frames.items():
+        pooled = parts[0] if len(parts) == 1 else pd.concat(parts)
+        resampled = pooled.sort_index().resample(interval).agg(stats).dropna(how='all')
+        resampled.columns = [f"{key}_{name}_{stat}" for name, stat in resampled.columns]
+        results.append(resampled)
+    
+    if not results:
+        return pd.DataFrame()
+    
+    aggregated = pd.concat(results, axis=1).sort_index()
+    aggregated.index.name = 'Timestamp'
+    return aggregated.reset_index()
+
+def get_aggregate_name(interval, level):
+    """
+    Get the output name of an aggregated table
+    
+    Args:
+        interval (str): pandas offset alias
+        level (str): 'logger' or 'folder'
+    
+    Returns:
+        str: e.g. 'Aggregate_1D_by_logger'
+    """
+    return f"Aggregate_{interval}_by_{level}"
+
+def export_aggregates(combined_df, output_folder, output_format=None, intervals=None, levels=None,
+                      records=None, report=None, folder_level=None):
+    """
+    Export aggregated tables for every interval and level next to the Raw, Temp and RH outputs
+    
+    Args:
+        combined_df (pd.DataFrame): Combined table from process_all_files
+        output_folder (str): Path to the output folder
+        output_format (str): One of SUPPORTED_OUTPUT_FORMATS (defaults to DEFAULT_OUTPUT_FORMAT)
+        intervals (list): pandas offset aliases (defaults to AGGREGATION_INTERVALS)
+        levels (list): 'logger' and/or 'folder' (defaults to AGGREGATION_LEVELS)
+        records (iterable): FileRecord of every file in the run (e.g. the FileCatalog it filled), used
+                            to find each logger's folder
+        report (RunReport): Records the aggregate stage, or None
+        folder_level (int): Subfolder level to group by at the 'folder' level (defaults to
+                            AGGREGATION_FOLDER_LEVEL; None for each file's own folder)
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    from src.data_exporter import get_output_path, write_dataframe
+    from src.instrumentation import measure
+    
+    output_format = output_format or DEFAULT_OUTPUT_FORMAT
+    intervals = intervals or AGGREGATION_INTERVALS
+    levels = levels or AGGREGATION_LEVELS
+    folder_level = AGGREGATION_FOLDER_LEVEL if folder_level is None else folder_level
+    
+    if combined_df.empty:
+        logger.warning("No data to aggregate")
+        return False
+    
+    groups = None
+    if 'folder' in levels and records is not None:
+        groups = get_folder_groups(records, folder_level)
+    
+    success = True
+    with measure(report, 'aggregate') as stage:
+        rows = 0
+        for interval in intervals:
+            for level in levels:
+                try:
+                    aggregated = aggregate_data(combined_df, interval, level, groups)
+                except Exception as e:
+                    logger.error(f"Error aggregating by {level} every {interval}: {e}")
+                    success = False
+                    continue
+                
+                output_path = get_output_path(output_folder, get_aggregate_name(interval, level), output_format)
+                if write_dataframe(aggregated, output_path, output_format):
+                    logger.info(f"{level.capitalize()} aggregates every {interval} exported to {output_path}")
+                    rows += len(aggregated)
+                else:
+                    success = False
+        stage['rows'] = rows
+    
+    return success
@@ -0,0 +1,264 @@
+# Benchmark harness: synthetic logger trees and per-stage timings
+
+import os
+import json
+import time
+import shutil
+import logging
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from config.settings import (
+    BENCHMARK_FOLDERS, BENCHMARK_FILES_PER_FOLDER, BENCHMARK_ROWS, BENCHMARK_PREAMBLE_LINES,
+    BENCHMARK_REPEAT, BENCHMARK_HISTORY_FILE, BENCHMARK_REGRESSION_THRESHOLD, BENCHMARK_MIN_REGRESSION_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+# Stages timed by run_benchmark, in pipeline order
+BENCHMARK_STAGES = ['discovery', 'header', 'parse', 'combine', 'export']
+
+def generate_logger_tree(root, folders=None, files_per_folder=None, rows=None, preamble_lines=None, seed=0):
+    """
+    Write a synthetic tree of logger CSV files
+    
+    Each file has a preamble (logger name, serial number, preamble_lines
+    note lines and a Download Date line), the Date,Time,Temperature,Humidity
+    header with two extra diagnostic columns, and rows at 10-minute
+    intervals.
+    
+    Args:
+        root (str): Folder to create the tree in
+        folders (int): Number of subfolders (defaults to BENCHMARK_FOLDERS)
+        files_per_folder (int): Files per subfolder (defaults to BENCHMARK_FILES_PER_FOLDER)
+        rows (int): Data rows per file (defaults to BENCHMARK_ROWS)
+        preamble_lines (int): Extra note lines before the table (defaults to BENCHMARK_PREAMBLE_LINES)
+        seed (int): Random seed, so a given size always produces the same data
+    
+    Returns:
+        tuple: (file count, total bytes)
+    """
+    folders = folders or BENCHMARK_FOLDERS
+    files_per_folder = files_per_folder or BENCHMARK_FILES_PER_FOLDER
+    rows = rows or BENCHMARK_ROWS
+    preamble_lines = BENCHMARK_PREAMBLE_LINES if preamble_lines is None else preamble_lines
+    
+    rng = np.random.default_rng(seed)
+    minutes = np.arange(rows) * 10
+    stamps = pd.Timestamp('2024-01-01') + pd.to_timedelta(minutes, unit='min')
+    dates = stamps.strftime('%d/%m/%Y')
+    times = stamps.strftime('%H:%M:%S')
+    
+    total_bytes = 0
+    count = 0
+    for folder in range(folders):
+        folder_path = os.path.join(root, f"site{folder:03d}")
+        os.makedirs(folder_path, exist_ok=True)
+        
+        for k in range(files_per_folder):
+            temp = 20 + rng.standard_normal(rows).cumsum() * 0.05
+            rh = 50 + rng.standard_normal(rows).cumsum() * 0.1
+            
+            preamble = [f"Logger Name,DL{folder:03d}-{k:03d}", f"Serial Number,{rng.integers(10**6, 10**7)}"]
+            preamble += [f"Note {i},calibration ok" for i in range(preamble_lines)]
+            preamble += ["Download Date,01/02/2024 10:00:00",
+                         "Date,Time,Temperature(C),Humidity(%RH),Dew Point,Battery"]
+            body = [f"{d},{t},{a:.1f},{b:.1f},10.0,3.3" for d, t, a, b in zip(dates, times, temp, rh)]
+            
+            file_path = os.path.join(folder_path, f"logger{k:03d}.csv")
+            with open(file_path, 'w', newline='', encoding='utf-8') as f:
+                f.write('\n'.join(preamble + body) + '\n')
+            total_bytes += os.path.getsize(file_path)
+            count += 1
+    
+    logger.info(f"Generated {count} files ({total_bytes / 1e6:.1f} MB) in {root}")
+    return count, total_bytes
+
+def _time_stages(data_folder, output_folder):
+    """
+    Run every stage once and time it
+    
+    Args:
+        data_folder (str): Synthetic main folder
+        output_folder (str): Folder to export to
+    
+    Returns:
+        tuple: ({stage: seconds}, rows parsed)
+    """
+    from src.file_finder import find_csv_files
+    from src.csv_processor import find_table_start, read_table, label_table
+    from src.metadata_extractor import extract_metadata_from_path
+    from src.utils import combine_dataframes
+    from src.data_exporter import export_data
+    
+    timings = {}
+    
+    start = time.perf_counter()
+    entries = find_csv_files(data_folder)
+    timings['discovery'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for entry in entries:
+        find_table_start(entry.path)
+    timings['header'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    tables = [
+        label_table(read_table(entry.path), extract_metadata_from_path(entry.path, data_folder, entry))
+        for entry in entries
+    ]
+    timings['parse'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    combined_df = combine_dataframes([table for table in tables if not table.empty])
+    timings['combine'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    export_data(combined_df, output_folder)
+    timings['export'] = time.perf_counter() - start
+    
+    return timings, sum(len(table) for table in tables)
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+def load_history(history_path):
+    """
+    Load the benchmark history
+    
+    Args:
+        history_path (str): Path to the JSON history file
+    
+    Returns:
+        list: Previous benchmark records (empty if there are none)
+    """
+    if not os.path.exists(history_path):
+        return []
+    try:
+        with open(history_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable benchmark history {history_path}: {e}")
+        return []
+
+def find_regressions(record, history, threshold=None):
+    """
+    Compare a benchmark record with the last one of the same size
+    
+    Args:
+        record (dict): New benchmark record
+        history (list): Previous records
+        threshold (float): Relative slowdown to report (defaults to BENCHMARK_REGRESSION_THRESHOLD)
+    
+    Returns:
+        list: (stage, previous seconds, new seconds) for every stage that got slower
+              (by more than BENCHMARK_MIN_REGRESSION_SECONDS, so timer noise on tiny stages is ignored)
+    """
+    threshold = BENCHMARK_REGRESSION_THRESHOLD if threshold is None else threshold
+    previous = [entry for entry in history if entry.get('params') == record['params']]
+    if not previous:
+        return []
+    
+    baseline = previous[-1]['stages']
+    return [
+        (stage, baseline[stage], seconds)
+        for stage, seconds in record['stages'].items()
+        if stage in baseline and seconds > baseline[stage] * (1 + threshold)
+        and seconds - baseline[stage] > BENCHMARK_MIN_REGRESSION_SECONDS
+    ]
+
+def run_benchmark(folders=None, files_per_folder=None, rows=None, preamble_lines=None, repeat=None,
+                  history_path=None, work_folder=None):
+    """
+    Benchmark discovery, header detection, parsing, combining and export on a synthetic tree
+    
+    Each stage is run repeat times and its best time is kept, which is the
+    least noisy figure on a busy machine. The record (with the parameters,
+    git revision and library versions) is appended to the JSON history, and
+    stages more than BENCHMARK_REGRESSION_THRESHOLD slower than the last run
+    with the same parameters are reported.
+    
+    Args:
+        folders (int): Number of subfolders (defaults to BENCHMARK_FOLDERS)
+        files_per_folder (int): Files per subfolder (defaults to BENCHMARK_FILES_PER_FOLDER)
+        rows (int): Data rows per file (defaults to BENCHMARK_ROWS)
+        preamble_lines (int): Extra preamble lines per file (defaults to BENCHMARK_PREAMBLE_LINES)
+        repeat (int): Runs per stage (defaults to BENCHMARK_REPEAT)
+        history_path (str): JSON history file (defaults to BENCHMARK_HISTORY_FILE)
+        work_folder (str): Where to generate the tree (defaults to a temporary folder)
+    
+    Returns:
+        dict: The benchmark record
+    """
+    params = {
+        'folders': folders or BENCHMARK_FOLDERS,
+        'files_per_folder': files_per_folder or BENCHMARK_FILES_PER_FOLDER,
+        'rows': rows or BENCHMARK_ROWS,
+        'preamble_lines': BENCHMARK_PREAMBLE_LINES if preamble_lines is None else preamble_lines
+    }
+    repeat = repeat or BENCHMARK_REPEAT
+    history_path = history_path or BENCHMARK_HISTORY_FILE
+    
+    root = tempfile.mkdtemp(prefix='csv_benchmark_', dir=work_folder)
+    try:
+        data_folder = os.path.join(root, 'data')
+        file_count, total_bytes = generate_logger_tree(data_folder, **params)
+        
+        best = {}
+        rows_parsed = 0
+        for run in range(repeat):
+            output_folder = os.path.join(root, f'output{run}')
+            timings, rows_parsed = _time_stages(data_folder, output_folder)
+            shutil.rmtree(output_folder, ignore_errors=True)
+            
+            for stage, seconds in timings.items():
+                best[stage] = min(best.get(stage, seconds), seconds)
+            logger.info(f"Benchmark run {run + 1}/{repeat}: " +
+                        ", ".join(f"{stage} {seconds:.3f}s" for stage, seconds in timings.items()))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    
+    record = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'params': params,
+        'repeat': repeat,
+        'files': file_count,
+        'bytes': total_bytes,
+        'rows': rows_parsed,
+        'stages': {stage: round(best[stage], 6) for stage in BENCHMARK_STAGES},
+        'parse_rows_per_second': round(rows_parsed / best['parse'], 1) if best['parse'] else None,
+        'parse_mb_per_second': round(total_bytes / 1e6 / best['parse'], 2) if best['parse'] else None
+    }
+    
+    history = load_history(history_path)
+    for stage, before, after in find_regressions(record, history):
+        logger.warning(f"Regression in {stage}: {before:.3f}s -> {after:.3f}s")
+    
+    history.append(record)
+    try:
+        with open(history_path, 'w', encoding='utf-8') as f:
+            json.dump(history, f, indent=2)
+        logger.info(f"Benchmark record appended to {history_path}")
+    except Exception as e:
+        logger.error(f"Error writing benchmark history {history_path}: {e}")
+    
+    for stage in BENCHMARK_STAGES:
+        logger.info(f"{stage:>10}: {record['stages'][stage]:.3f}s")
+    logger.info(f"Parse throughput: {record['parse_rows_per_second']} rows/s, {record['parse_mb_per_second']} MB/s")
+    return record
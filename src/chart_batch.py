@@ -0,0 +1,184 @@
+# Headless batch rendering of Temperature and Humidity charts
+
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from config.settings import (
+    SUPPORTED_CHART_FORMATS, DEFAULT_CHART_FORMATS, CHART_FIGSIZE, CHART_DPI,
+    CHART_POINTS_PER_PIXEL, SUPPORTED_OUTPUT_FORMATS
+)
+
+logger = logging.getLogger(__name__)
+
+# Chart file name for each measurement
+CHART_FILENAMES = {
+    'Temp': 'temperature_chart',
+    'RH': 'humidity_chart',
+}
+
+# Figure templates of this process, built once per measurement
+_templates = {}
+
+def _init_worker():
+    """Select the non-interactive Agg backend in each worker process"""
+    import matplotlib
+    matplotlib.use('Agg')
+
+def _get_template(measurement):
+    """
+    Get this process's reusable figure for a measurement
+    
+    The figure, axes, labels, grid and tick formatting are created once;
+    each render only swaps the lines and legend.
+    
+    Args:
+        measurement (str): 'Temp' or 'RH'
+    
+    Returns:
+        tuple: (figure, axes)
+    """
+    if measurement not in _templates:
+        from matplotlib.figure import Figure
+        from src.chart_preview import style_chart_axes
+        
+        figure = Figure(figsize=CHART_FIGSIZE)
+        ax = figure.add_subplot()
+        style_chart_axes(ax, measurement)
+        _templates[measurement] = (figure, ax)
+    return _templates[measurement]
+
+def render_chart(chart_data, measurement, output_paths, rasterize_lines=None):
+    """
+    Render one chart with the measurement's template and save it in one or more formats
+    
+    Lines are min/max decimated to the pixel width of the saved PNG, so
+    every format stays small without losing spikes.
+    
+    Args:
+        chart_data (dict): Chart data from prepare_chart_data
+        measurement (str): 'Temp' or 'RH'
+        output_paths (list): Files to write; the format comes from each extension
+        rasterize_lines (bool): Rasterize the data lines in SVG/PDF files (defaults to CHART_RASTERIZE_LINES)
+    """
+    from src.chart_preview import iter_chart_series, save_chart
+    from src.chart_decimation import minmax_decimate
+    
+    figure, ax = _get_template(measurement)
+    
+    # Clear the previous chart's lines and legend
+    for line in list(ax.lines):
+        line.remove()
+    if ax.get_legend() is not None:
+        ax.get_legend().remove()
+    ax.set_prop_cycle(None)
+    
+    n_bins = int(ax.get_position().width * CHART_FIGSIZE[0] * CHART_DPI * CHART_POINTS_PER_PIXEL / 2)
+    for label, x, y in iter_chart_series(chart_data, measurement):
+        valid = ~np.isnan(x)
+        ax.plot(*minmax_decimate(x[valid], y[valid], n_bins), label=label, alpha=0.7, linewidth=1.5)
+    
+    ax.relim()
+    ax.autoscale_view()
+    ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+    
+    for output_path in output_paths:
+        save_chart(figure, output_path, rasterize_lines)
+
+def find_chart_source(folder):
+    """
+    Find the Raw output of an output folder in any supported format
+    
+    Args:
+        folder (str): Output folder of an extraction run
+    
+    Returns:
+        str: Path to the Raw file, or None if there is none
+    """
+    from src.data_exporter import get_output_path
+    
+    for output_format in SUPPORTED_OUTPUT_FORMATS:
+        path = get_output_path(folder, 'Raw', output_format)
+        if os.path.exists(path):
+            return path
+    return None
+
+def render_folder_charts(folder, formats=None, rasterize_lines=None):
+    """
+    Render the Temperature and Humidity charts of one output folder into that folder
+    
+    Args:
+        folder (str): Output folder containing a Raw file
+        formats (list): Chart formats from SUPPORTED_CHART_FORMATS (defaults to DEFAULT_CHART_FORMATS)
+        rasterize_lines (bool): Rasterize the data lines in SVG/PDF files (defaults to CHART_RASTERIZE_LINES)
+    
+    Returns:
+        list: Paths of the written chart files (empty if nothing could be charted)
+    """
+    from src.data_exporter import read_exported_data
+    from src.chart_preview import prepare_chart_data
+    
+    formats = formats or DEFAULT_CHART_FORMATS
+    
+    source = find_chart_source(folder)
+    if source is None:
+        logger.warning(f"No Raw output found in {folder}")
+        return []
+    
+    try:
+        chart_data = prepare_chart_data(read_exported_data(source))
+        if chart_data is None:
+            logger.warning(f"No temperature or humidity data found in {source}")
+            return []
+        
+        written = []
+        for measurement, filename in CHART_FILENAMES.items():
+            output_paths = [os.path.join(folder, f"{filename}.{fmt}") for fmt in formats]
+            render_chart(chart_data, measurement, output_paths, rasterize_lines)
+            written.extend(output_paths)
+        
+        logger.info(f"Rendered {len(written)} charts for {folder}")
+        return written
+    
+    except Exception as e:
+        logger.error(f"Error rendering charts for {folder}: {e}")
+        return []
+
+def render_charts_batch(folders, formats=None, max_workers=None, rasterize_lines=None):
+    """
+    Render charts for many output folders in parallel worker processes
+    
+    Each worker uses the Agg backend and keeps its own figure templates,
+    so no pyplot or GUI state is involved.
+    
+    Args:
+        folders (list): Output folders to chart
+        formats (list): Chart formats from SUPPORTED_CHART_FORMATS (defaults to DEFAULT_CHART_FORMATS)
+        max_workers (int): Maximum number of worker processes, or None for the default
+        rasterize_lines (bool): Rasterize the data lines in SVG/PDF files (defaults to CHART_RASTERIZE_LINES)
+    
+    Returns:
+        dict: Written chart paths for each folder
+    """
+    formats = formats or DEFAULT_CHART_FORMATS
+    unsupported = [fmt for fmt in formats if fmt not in SUPPORTED_CHART_FORMATS]
+    if unsupported:
+        logger.error(f"Unsupported chart formats {unsupported}. Expected some of {SUPPORTED_CHART_FORMATS}")
+        return {}
+    
+    results = {}
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as pool:
+        futures = {pool.submit(render_folder_charts, folder, formats, rasterize_lines): folder for folder in folders}
+        
+        for completed, future in enumerate(as_completed(futures), start=1):
+            folder = futures[future]
+            try:
+                results[folder] = future.result()
+            except Exception as e:
+                logger.error(f"Error rendering charts for {folder}: {e}")
+                results[folder] = []
+            logger.info(f"Charted {completed}/{len(folders)} folders")
+    
+    return results
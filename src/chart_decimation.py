@@ -0,0 +1,112 @@
+# Min/max decimation of dense series for fast, faithful line charts
+
+import numpy as np
+import logging
+
+from config.settings import CHART_POINTS_PER_PIXEL
+
+logger = logging.getLogger(__name__)
+
+def minmax_decimate(x, y, n_bins):
+    """
+    Reduce a series to the minimum and maximum of each of n_bins bins
+    
+    With one bin per horizontal pixel the decimated line draws the same
+    envelope as the full series (every spike is kept) while having at most
+    2 * n_bins + 2 points. The first and last points are always kept so the
+    line spans the same x range.
+    
+    Args:
+        x (numpy.ndarray): Sorted x values
+        y (numpy.ndarray): y values (NaN for missing readings)
+        n_bins (int): Number of bins, normally the plot width in pixels
+        
+    Returns:
+        tuple: (x, y) - Decimated arrays (the inputs if already small enough)
+    """
+    n = len(x)
+    n_bins = max(int(n_bins), 1)
+    if n <= 2 * n_bins + 2:
+        return x, y
+    
+    # Equal-count bins: pad to a full (n_bins, bin_size) grid
+    bin_size = -(-n // n_bins)
+    padded = np.full(n_bins * bin_size, np.nan)
+    padded[:n] = y
+    grid = padded.reshape(n_bins, bin_size)
+    missing = np.isnan(grid)
+    
+    offsets = np.arange(n_bins) * bin_size
+    lowest = np.where(missing, np.inf, grid).argmin(axis=1) + offsets
+    highest = np.where(missing, -np.inf, grid).argmax(axis=1) + offsets
+    
+    keep = np.unique(np.concatenate(([0, n - 1], lowest, highest)))
+    keep = keep[keep < n]
+    
+    # Bins without any reading would contribute a NaN point; drop those
+    keep = keep[~np.isnan(y[keep]) | (keep == 0) | (keep == n - 1)]
+    return x[keep], y[keep]
+
+class LineDecimator:
+    """
+    Plot decimated lines on an Axes and re-decimate them when the view changes
+    
+    The full series are kept here; the Axes only ever holds about
+    CHART_POINTS_PER_PIXEL points per pixel of plot width. When the user
+    zooms or pans with the navigation toolbar, the visible range of every
+    series is decimated again, so detail appears as the view narrows.
+    Keep a reference to the decimator for as long as the chart is shown.
+    """
+    
+    def __init__(self, ax, points_per_pixel=None):
+        self.ax = ax
+        self.points_per_pixel = points_per_pixel or CHART_POINTS_PER_PIXEL
+        self.series = []
+        ax.callbacks.connect('xlim_changed', self._on_xlim_changed)
+    
+    def _n_bins(self):
+        width = self.ax.get_window_extent().width
+        return max(int(width * self.points_per_pixel / 2), 1)
+    
+    def plot(self, x, y, **kwargs):
+        """
+        Plot a series through the decimator (same keyword arguments as Axes.plot)
+        
+        Args:
+            x (array-like): x values
+            y (array-like): y values
+            
+        Returns:
+            matplotlib.lines.Line2D: The plotted line
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        
+        # Points without an x position cannot be drawn
+        valid = ~np.isnan(x)
+        x = x[valid]
+        y = y[valid]
+        is_sorted = bool(np.all(x[1:] >= x[:-1]))
+        
+        line, = self.ax.plot(*minmax_decimate(x, y, self._n_bins()), **kwargs)
+        self.series.append((line, x, y, is_sorted))
+        return line
+    
+    def _visible(self, x, y, is_sorted, xmin, xmax):
+        if is_sorted:
+            # One point either side so lines run to the plot edges
+            start = max(np.searchsorted(x, xmin, side='left') - 1, 0)
+            stop = np.searchsorted(x, xmax, side='right') + 1
+            return x[start:stop], y[start:stop]
+        
+        mask = (x >= xmin) & (x <= xmax)
+        return x[mask], y[mask]
+    
+    def _on_xlim_changed(self, ax):
+        xmin, xmax = sorted(ax.get_xlim())
+        n_bins = self._n_bins()
+        
+        for line, x, y, is_sorted in self.series:
+            line.set_data(*minmax_decimate(*self._visible(x, y, is_sorted, xmin, xmax), n_bins))
+        
+        ax.figure.canvas.draw_idle()
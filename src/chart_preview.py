@@ -1,9 +1,195 @@
 # Chart preview functionality for future use with matplotlib
 
 import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
 from io import BytesIO
 import base64
+import os
+import time
+import logging
+
+from config.settings import CHART_DPI, CHART_RASTERIZE_LINES
+
+logger = logging.getLogger(__name__)
+
+# Spacing assumed for files without timestamp columns (older exports)
+DEFAULT_INTERVAL_MINUTES = 10
+
+def _is_time_column(name):
+    """Timestamp column of an export: Timestamp, Timestamp.1, ... or folder_file_Timestamp"""
+    name = str(name)
+    return name == 'Timestamp' or name.startswith('Timestamp.') or name.endswith('_Timestamp')
+
+def prepare_chart_data(df):
+    """
+    Prepare an exported Raw, Temp or RH table for charting
+    
+    Each value column is plotted against the timestamp column that precedes
+    it (its own logger's Timestamp, or the shared one of a timestamp-aligned
+    export), as hours since the earliest reading. Files without timestamps
+    fall back to a fixed 10-minute grid.
+    
+    Args:
+        df (pd.DataFrame): Loaded export
+        
+    Returns:
+        dict: Chart data with per-column x values, or None if there is nothing to plot
+    """
+    temp_columns = [col for col in df.columns if 'Temp' in str(col) and not _is_time_column(col)]
+    rh_columns = [col for col in df.columns if 'RH' in str(col) and not _is_time_column(col)]
+    
+    if not temp_columns or not rh_columns:
+        return None
+    
+    # Pair every value column with the nearest time column to its left
+    timestamps = {}
+    time_column_of = {}
+    current = None
+    for col in df.columns:
+        if _is_time_column(col):
+            current = col
+            timestamps[col] = pd.to_datetime(df[col], errors='coerce')
+        elif current is not None:
+            time_column_of[col] = current
+    
+    value_columns = temp_columns + rh_columns
+    if timestamps and all(col in time_column_of for col in value_columns):
+        start = min(t.min() for t in timestamps.values())
+        hours = {
+            col: ((t - start) / pd.Timedelta(hours=1)).to_numpy(dtype=float, na_value=np.nan)
+            for col, t in timestamps.items()
+        }
+        series_times = {col: hours[time_column_of[col]] for col in value_columns}
+    else:
+        grid = np.arange(len(df)) * DEFAULT_INTERVAL_MINUTES / 60
+        series_times = {col: grid for col in value_columns}
+    
+    duration = max((np.nanmax(x) for x in series_times.values() if np.isfinite(x).any()), default=0.0)
+    
+    return {
+        'series_times': series_times,
+        'temperature_data': df[temp_columns],
+        'humidity_data': df[rh_columns],
+        'temp_columns': temp_columns,
+        'rh_columns': rh_columns,
+        'time_points': len(df),
+        'duration_hours': duration
+    }
+
+# Data key, column key, y-axis label and title of each chart
+CHART_SPECS = {
+    'Temp': ('temperature_data', 'temp_columns', 'Temperature', 'Temperature vs Time'),
+    'RH': ('humidity_data', 'rh_columns', 'Relative Humidity (%)', 'Relative Humidity vs Time'),
+}
+
+def style_chart_axes(ax, measurement):
+    """
+    Apply the labels, title, grid and hour formatting of a Temperature or Humidity chart
+    
+    Args:
+        ax (matplotlib.axes.Axes): Axes to style
+        measurement (str): 'Temp' or 'RH'
+    """
+    from matplotlib.ticker import FuncFormatter
+    
+    _, _, ylabel, title = CHART_SPECS[measurement]
+    ax.set_xlabel('Time (hours)', fontsize=12)
+    ax.set_ylabel(ylabel, fontsize=12)
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3)
+    
+    # Format x-axis to show hours properly
+    ax.xaxis.set_major_formatter(FuncFormatter(lambda x, _: f'{x:.1f}'))
+
+def iter_chart_series(chart_data, measurement):
+    """
+    Yield the series of a Temperature or Humidity chart
+    
+    Args:
+        chart_data (dict): Chart data from prepare_chart_data
+        measurement (str): 'Temp' or 'RH'
+        
+    Yields:
+        tuple: (label, x, y) - Legend label (folder_filename part), hours and values
+    """
+    data_key, columns_key, _, _ = CHART_SPECS[measurement]
+    series_times = chart_data['series_times']
+    data = chart_data[data_key]
+    
+    for col in chart_data[columns_key]:
+        label = '_'.join(str(col).split('_')[:-1])
+        yield label, series_times[col], data[col].to_numpy(dtype=float, na_value=np.nan)
+
+def build_chart_figure(chart_data, measurement, figsize=(10, 6)):
+    """
+    Build a Temperature or Humidity chart as a standalone Figure
+    
+    The figure is created with the object-oriented matplotlib API rather
+    than pyplot, so it can be built on a worker thread and attached to a
+    canvas (or saved) afterwards. Lines are min/max decimated to the plot
+    width.
+    
+    Args:
+        chart_data (dict): Chart data from prepare_chart_data
+        measurement (str): 'Temp' or 'RH'
+        figsize (tuple): Figure size in inches
+        
+    Returns:
+        tuple: (figure, decimator) - Keep the decimator while the chart is displayed
+    """
+    from matplotlib.figure import Figure
+    from src.chart_decimation import LineDecimator
+    
+    figure = Figure(figsize=figsize)
+    ax = figure.add_subplot()
+    decimator = LineDecimator(ax)
+    
+    # Plot each column against its own timestamps
+    for label, x, y in iter_chart_series(chart_data, measurement):
+        decimator.plot(x, y, label=label, alpha=0.7, linewidth=1.5)
+    
+    style_chart_axes(ax, measurement)
+    ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+    
+    figure.tight_layout()
+    return figure, decimator
+
+def save_chart(figure, output_path, rasterize_lines=None, dpi=None):
+    """
+    Save a chart, optionally rasterizing its data lines
+    
+    With rasterize_lines, the plotted lines are embedded in SVG and PDF files
+    as a single image at the save dpi, while the axes, ticks, labels and
+    legend stay vector. File size then no longer grows with the number of
+    points and loggers. The format comes from the file extension.
+    
+    Args:
+        figure (matplotlib.figure.Figure): Chart to save
+        output_path (str): Destination file path
+        rasterize_lines (bool): Rasterize the data lines (defaults to CHART_RASTERIZE_LINES)
+        dpi (int): Resolution of raster output (defaults to CHART_DPI)
+        
+    Returns:
+        tuple: (size_bytes, seconds) - Size of the written file and time taken to save it
+    """
+    rasterize_lines = CHART_RASTERIZE_LINES if rasterize_lines is None else rasterize_lines
+    lines = [line for ax in figure.axes for line in ax.lines]
+    previous = [line.get_rasterized() for line in lines]
+    
+    start = time.perf_counter()
+    try:
+        for line in lines:
+            line.set_rasterized(rasterize_lines)
+        figure.savefig(output_path, dpi=dpi or CHART_DPI, bbox_inches='tight')
+    finally:
+        for line, rasterized in zip(lines, previous):
+            line.set_rasterized(rasterized)
+    seconds = time.perf_counter() - start
+    
+    size = os.path.getsize(output_path)
+    logger.info(f"Saved {output_path} ({size / 1024:.1f} KB in {seconds:.2f}s)")
+    return size, seconds
 
 def create_sample_chart(dataframe, chart_type='bar'):
     """
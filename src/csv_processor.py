@@ -1,110 +1,699 @@
 # Handles CSV file processing and table extraction
 
 import pandas as pd
-import re
+import codecs
+import csv
+import io
+import mmap
 import logging
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 
+from pandas.errors import EmptyDataError
+
+from config.settings import (
+    TABLE_START_OFFSET, HEADER_MAX_SCAN_LINES, HEADER_MAX_SCAN_BYTES, HEADER_SCAN_MMAP,
+    TABLE_COLUMNS, MEASUREMENT_DTYPE, CSV_ENGINE, CSV_NA_VALUES, READ_CHUNK_ROWS
+)
+from src.timestamp_parser import parse_timestamps
+from src.header_rules import compile_header_rules, get_default_header_rules, match_header_rule
+from src.encoding_detector import detect_file_encoding, is_ascii_compatible
+
 logger = logging.getLogger(__name__)
 
-def find_table_start(file_path, search_term='date', offset=1):
+_csv_engine = None
+_csv_engine_lock = threading.Lock()
+
+def locate_table(handle, file_path, rules=None, max_lines=None, max_bytes=None):
+    """
+    Stream an open binary file until a header rule matches
+    
+    Lines are read one at a time and matched as raw bytes against the
+    precompiled rules, and scanning stops at the first match or when the
+    scan limits are reached, so only the preamble is read. On success the
+    handle is left positioned at the first byte of the table, ready to be
+    handed to the CSV parser.
+    
+    Args:
+        handle (file): File object opened in binary mode
+        file_path (Path): Path to the CSV file (used for log messages)
+        rules (CompiledHeaderRules): Rules to match (defaults to HEADER_RULES)
+        max_lines (int): Maximum number of lines to scan (defaults to HEADER_MAX_SCAN_LINES)
+        max_bytes (int): Maximum number of bytes to scan (defaults to HEADER_MAX_SCAN_BYTES)
+        
+    Returns:
+        int: Row index where the table starts, or -1 if not found
+    """
+    rules = rules or get_default_header_rules()
+    max_lines = max_lines or HEADER_MAX_SCAN_LINES
+    max_bytes = max_bytes or HEADER_MAX_SCAN_BYTES
+    
+    scanned_bytes = 0
+    for i in range(max_lines):
+        line_start = handle.tell()
+        line = handle.readline()
+        if not line:
+            break
+        
+        rule = match_header_rule(rules, line)
+        if rule is None:
+            scanned_bytes += len(line)
+            if scanned_bytes >= max_bytes:
+                break
+            continue
+        
+        # Table starts offset rows below this line (0 for this line itself)
+        offset = rule.get('offset', TABLE_START_OFFSET)
+        table_start = i + offset
+        handle.seek(line_start)
+        for _ in range(offset):
+            handle.readline()
+        
+        # Make sure there is a row at the table start without consuming it
+        position = handle.tell()
+        if handle.readline():
+            handle.seek(position)
+            logger.info(
+                f"Found table starting at row {table_start + 1} "  # +1 for 1-based indexing
+                f"({rule.get('vendor', 'unknown')} header)"
+            )
+            return table_start
+        
+        logger.warning(f"Header found at end of file in {Path(file_path).name}")
+        return -1
+    
+    logger.warning(f"No header signature found in the scanned preamble of {Path(file_path).name}")
+    return -1
+
+def locate_table_mapped(buffer, file_path, rules=None, max_lines=None, max_bytes=None):
+    """
+    Search a memory-mapped file for the first header rule match
+    
+    The compiled byte pattern is run once over the preamble window of the
+    mapping instead of line by line, and nothing is decoded or copied. The
+    same limits as locate_table apply: the matching line must be within
+    the first max_lines lines and start before max_bytes.
+    
+    Args:
+        buffer (mmap.mmap): Read-only mapping of the whole file
+        file_path (Path): Path to the CSV file (used for log messages)
+        rules (CompiledHeaderRules): Rules to match (defaults to HEADER_RULES)
+        max_lines (int): Maximum number of lines to scan (defaults to HEADER_MAX_SCAN_LINES)
+        max_bytes (int): Maximum number of bytes to scan (defaults to HEADER_MAX_SCAN_BYTES)
+        
+    Returns:
+        tuple: (row index where the table starts, byte offset of that row), or (-1, None) if not found
+    """
+    rules = rules or get_default_header_rules()
+    max_lines = max_lines or HEADER_MAX_SCAN_LINES
+    max_bytes = max_bytes or HEADER_MAX_SCAN_BYTES
+    size = len(buffer)
+    
+    # Only lines starting inside the byte limit are scanned, so stop at the end of the line crossing it
+    window_end = buffer.find(b'\n', max_bytes - 1) if size > max_bytes else -1
+    window_end = size if window_end == -1 else window_end + 1
+    
+    match = rules.pattern.search(buffer, 0, window_end)
+    if match is None:
+        logger.warning(f"No header signature found in the scanned preamble of {Path(file_path).name}")
+        return -1, None
+    
+    # Row index and start of the matching line
+    line_index = 0
+    line_start = buffer.rfind(b'\n', 0, match.start()) + 1
+    position = buffer.find(b'\n', 0, line_start)
+    while position != -1:
+        line_index += 1
+        if line_index >= max_lines:
+            logger.warning(f"No header signature found in the scanned preamble of {Path(file_path).name}")
+            return -1, None
+        position = buffer.find(b'\n', position + 1, line_start)
+    
+    # The first configured rule matching the line wins, not the leftmost signature
+    line_end = buffer.find(b'\n', line_start)
+    rule = match_header_rule(rules, buffer[line_start:size if line_end == -1 else line_end])
+    
+    # Table starts offset rows below this line (0 for this line itself)
+    offset = rule.get('offset', TABLE_START_OFFSET)
+    position = line_start
+    for _ in range(offset):
+        position = buffer.find(b'\n', position)
+        if position == -1:
+            break
+        position += 1
+    
+    # Make sure there is a row at the table start
+    if position == -1 or position >= size:
+        logger.warning(f"Header found at end of file in {Path(file_path).name}")
+        return -1, None
+    
+    table_start = line_index + offset
+    logger.info(
+        f"Found table starting at row {table_start + 1} "  # +1 for 1-based indexing
+        f"({rule.get('vendor', 'unknown')} header)"
+    )
+    return table_start, position
+
+class _BufferReader(io.RawIOBase):
+    """
+    Seekable binary stream over a memoryview
+    
+    Lets the CSV parser read the table straight from a slice of the file
+    mapping, without first copying it into a bytes object.
+    """
+    
+    def __init__(self, view):
+        self._view = view
+        self._position = 0
+    
+    def readable(self):
+        return True
+    
+    def seekable(self):
+        return True
+    
+    def readinto(self, buffer):
+        count = max(0, min(len(buffer), len(self._view) - self._position))
+        buffer[:count] = self._view[self._position:self._position + count]
+        self._position += count
+        return count
+    
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: len(self._view)}[whence]
+        self._position = max(0, base + offset)
+        return self._position
+    
+    def tell(self):
+        return self._position
+    
+    def close(self):
+        if not self.closed:
+            # Release the view so the mapping can be closed
+            self._view.release()
+        super().close()
+
+def _map_file(handle):
+    """
+    Memory-map an open file for reading
+    
+    Args:
+        handle (file): File object opened in binary mode
+        
+    Returns:
+        mmap.mmap: Read-only mapping, or None if disabled, the file is empty or it cannot be mapped
+    """
+    if not HEADER_SCAN_MMAP:
+        return None
+    try:
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError):
+        # Empty files and pipes or special files cannot be mapped; stream them instead
+        return None
+
+class _TranscodingReader(io.RawIOBase):
+    """
+    Binary stream that decodes a UTF-16 or UTF-32 file and re-encodes it as UTF-8 while it is read
+    
+    The header rules match ASCII bytes, which these encodings do not use,
+    so the file is scanned and parsed as UTF-8. Only one block of the file
+    is decoded at a time. Seeking back restarts the decoding from the start
+    of the file, which is cheap for the positions the header scan and the
+    parser return to (in or just after the preamble).
+    """
+    
+    def __init__(self, handle, encoding, bom_length, block_size=1024 * 1024):
+        self._handle = handle
+        self._encoding = encoding
+        self._start = bom_length
+        self._block_size = block_size
+        self._rewind()
+    
+    def _rewind(self):
+        self._handle.seek(self._start)
+        self._decoder = codecs.getincrementaldecoder(self._encoding)(errors='replace')
+        self._pending = b''
+        self._offset = 0
+        self._position = 0
+        self._eof = False
+    
+    def readable(self):
+        return True
+    
+    def seekable(self):
+        return True
+    
+    def readinto(self, buffer):
+        while self._offset == len(self._pending) and not self._eof:
+            block = self._handle.read(self._block_size)
+            self._eof = not block
+            self._pending = self._decoder.decode(block, final=self._eof).encode('utf-8')
+            self._offset = 0
+        
+        count = min(len(buffer), len(self._pending) - self._offset)
+        buffer[:count] = self._pending[self._offset:self._offset + count]
+        self._offset += count
+        self._position += count
+        return count
+    
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_END:
+            raise io.UnsupportedOperation("Cannot seek from the end of a transcoded stream")
+        target = max(0, offset + (self._position if whence == io.SEEK_CUR else 0))
+        if target < self._position:
+            self._rewind()
+        
+        # Decode forward to the target
+        skip = bytearray(64 * 1024)
+        while self._position < target:
+            if not self.readinto(memoryview(skip)[:target - self._position]):
+                break
+        return self._position
+    
+    def tell(self):
+        return self._position
+
+@contextmanager
+def _open_table(file_path, rules=None):
+    """
+    Open a CSV file and locate its table
+    
+    The encoding is detected first (and remembered per parent folder).
+    Files in ASCII-compatible encodings are memory-mapped, or streamed if
+    they cannot be mapped; UTF-16 and UTF-32 files are transcoded to UTF-8
+    block by block as they are read.
+    
+    Args:
+        file_path (Path): Path to the CSV file
+        rules (CompiledHeaderRules): Rules to match (defaults to HEADER_RULES)
+        
+    Yields:
+        tuple: (row index where the table starts or -1, binary stream positioned at the table
+                header row or None, encoding to parse the stream with)
+    """
+    with open(file_path, 'rb') as f:
+        encoding, bom_length = detect_file_encoding(f, source=str(Path(file_path).parent))
+        
+        if not is_ascii_compatible(encoding):
+            with io.BufferedReader(_TranscodingReader(f, encoding, bom_length)) as stream:
+                yield locate_table(stream, file_path, rules), stream, 'utf-8'
+            return
+        
+        mapped = _map_file(f)
+        if mapped is None:
+            yield locate_table(f, file_path, rules), f, encoding
+            return
+        
+        with mapped:
+            table_start, position = locate_table_mapped(mapped, file_path, rules)
+            if table_start == -1:
+                yield -1, None, encoding
+                return
+            
+            with io.BufferedReader(_BufferReader(memoryview(mapped)[position:])) as handle:
+                yield table_start, handle, encoding
+
+def find_table_start(file_path, search_term=None, offset=None):
     """
     Find the starting row of the table (offset rows below the search term)
     
     Args:
         file_path (Path): Path to the CSV file
-        search_term (str): Term to search for to locate the table
+        search_term (str): Term to search for instead of the configured HEADER_RULES
         offset (int): Number of rows below the search term where table starts
         
     Returns:
         int: Row index where the table starts, or -1 if not found
     """
+    rules = None
+    if search_term is not None:
+        rules = compile_header_rules([{
+            'vendor': search_term,
+            'signatures': [search_term],
+            'offset': TABLE_START_OFFSET if offset is None else offset
+        }])
+    
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
-        
-        # Look for the search term (case-insensitive)
-        for i, line in enumerate(lines):
-            if re.search(rf'\b{search_term}\b', line, re.IGNORECASE):
-                # Table starts offset rows below this line
-                table_start = i + offset
-                if table_start < len(lines):
-                    logger.info(f"Found table starting at row {table_start + 1}")  # +1 for 1-based indexing
-                    return table_start
-                else:
-                    logger.warning(f"'{search_term}' found at end of file in {file_path.name}")
-                    return -1
-        
-        logger.warning(f"Word '{search_term}' not found in {file_path.name}")
-        return -1
+        with _open_table(file_path, rules) as (table_start, _, _):
+            return table_start
         
     except Exception as e:
         logger.error(f"Error finding table start in {file_path}: {e}")
         return -1
 
-def read_csv_file(file_path, metadata, expected_columns=4):
+def _pyarrow_reads_tables():
     """
-    Read CSV file starting from the table and extract first 4 columns
+    Check that the installed pandas and pyarrow can parse a table with the typed read schema
+    
+    Some pandas/pyarrow combinations reject options the C engine accepts,
+    so a small sample is parsed once before pyarrow is picked.
     
-    Args:
-        file_path (Path): Path to the CSV file
-        metadata (dict): Metadata extracted from the file path
-        expected_columns (int): Expected number of columns in the table
-        
     Returns:
-        tuple: (raw_df, temp_df, rh_df) - Three DataFrames with different data
+        bool: True if the sample parsed into TABLE_COLUMNS with the expected values
     """
+    sample = b'01/01/2024,00:00:00,20.5,50.0,3.3\n'
+    dtypes = {**{name: str for name in TABLE_COLUMNS}, **{name: MEASUREMENT_DTYPE for name in TABLE_COLUMNS[2:]}}
     try:
-        # Find where the table starts
-        table_start = find_table_start(file_path)
-        
-        if table_start == -1:
-            logger.warning(f"Could not find table start in {file_path.name}")
-            return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+        df = _parse_table(io.BytesIO(sample), dtypes, engine='pyarrow')
+        return list(df.columns) == TABLE_COLUMNS and df.iloc[0].tolist() == ['01/01/2024', '00:00:00', 20.5, 50.0]
+    except Exception as e:
+        logger.info(f"pyarrow cannot parse tables here, using the C engine: {e}")
+        return False
+
+def get_csv_engine():
+    """
+    Resolve the CSV_ENGINE setting to a pandas parser engine
+    
+    Returns:
+        str: 'pyarrow' if requested (or 'auto', installed and able to parse a sample table),
+             otherwise the configured engine
+    """
+    global _csv_engine
+    # Thread workers must not see the engine before the probe has resolved it
+    with _csv_engine_lock:
+        if _csv_engine is None:
+            engine = CSV_ENGINE
+            if engine == 'auto':
+                try:
+                    import pyarrow  # noqa: F401
+                    engine = 'pyarrow' if _pyarrow_reads_tables() else 'c'
+                except ImportError:
+                    engine = 'c'
+            _csv_engine = engine
+    return _csv_engine
+
+def _parse_table(handle, dtypes, encoding='utf-8', engine=None):
+    """
+    Parse the table rows from an open handle with the typed read schema
+    
+    The C engine skips the diagnostic columns while parsing. pyarrow cannot
+    select columns by position, so it parses every column and the extra
+    ones are dropped afterwards.
+    
+    Args:
+        handle (file): Binary file object positioned at the first data row
+        dtypes (dict): dtype for each of TABLE_COLUMNS
+        encoding (str): Encoding of the file
+        engine (str): pandas parser engine (defaults to get_csv_engine())
         
-        # Read CSV file starting from the table row
+    Returns:
+        pandas.DataFrame: Parsed table with TABLE_COLUMNS
+    """
+    engine = engine or get_csv_engine()
+    if engine == 'pyarrow':
         df = pd.read_csv(
-            file_path,
-            skiprows=table_start,
-            encoding='utf-8',  # Adjust encoding if needed
-            low_memory=False   # Prevents mixed type warnings
+            handle,
+            header=None,
+            dtype={position: dtypes[name] for position, name in enumerate(TABLE_COLUMNS)},
+            na_values=CSV_NA_VALUES,
+            engine='pyarrow',
+            encoding=encoding
         )
+        return df.iloc[:, :len(TABLE_COLUMNS)].set_axis(TABLE_COLUMNS, axis=1)
+    
+    return pd.read_csv(
+        handle,
+        header=None,
+        names=TABLE_COLUMNS,
+        usecols=range(len(TABLE_COLUMNS)),  # Skip diagnostic columns while parsing
+        dtype=dtypes,
+        na_values=CSV_NA_VALUES,
+        engine=engine,
+        encoding=encoding
+    )
+
+def _parse_rows(handle, dtypes, encoding='utf-8', file_path=None):
+    """
+    Parse the table rows, falling back to the C engine if pyarrow rejects the layout
+    
+    pyarrow refuses rows with fewer fields than the first one (e.g. a last
+    line cut short while the logger was writing), which the C engine reads
+    with the missing fields empty.
+    
+    Args:
+        handle (file): Seekable binary stream positioned at the first data row
+        dtypes (dict): dtype for each of TABLE_COLUMNS
+        encoding (str): Encoding of the file
+        file_path (Path): Path to the CSV file (used for log messages)
         
-        # Check if we have at least the expected columns
-        if len(df.columns) < expected_columns:
-            logger.warning(
-                f"Expected at least {expected_columns} columns but found {len(df.columns)} in {file_path.name}. "
-                f"Columns: {list(df.columns)}"
-            )
-            return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
-        
-        # Extract only the first 4 columns
-        df = df.iloc[:, :expected_columns]
+    Returns:
+        pandas.DataFrame: Parsed table with TABLE_COLUMNS
+    """
+    engine = get_csv_engine()
+    data_start = handle.tell()
+    try:
+        return _parse_table(handle, dtypes, encoding, engine)
+    except ValueError as e:
+        # A plain ValueError is a dtype failure, which the C engine would hit too
+        if engine != 'pyarrow' or type(e) is ValueError:
+            raise
+        name = file_path.name if file_path else 'table'
+        logger.info(f"pyarrow could not parse {name}, re-parsing it with the C engine: {e}")
+        handle.seek(data_start)
+        return _parse_table(handle, dtypes, encoding, 'c')
+
+def _check_header(handle, file_path, expected_columns, encoding='utf-8'):
+    """
+    Read the table header row and check it has enough columns
+    
+    Args:
+        handle (file): Binary stream positioned at the table header row
+        file_path (Path): Path to the CSV file (used for log messages)
+        expected_columns (int): Expected number of columns in the table
+        encoding (str): Encoding of the file
         
-        # Rename columns to standard names
-        df.columns = ["Date", "Time", "Temp", "RH"]
+    Returns:
+        bool: True if the header has at least expected_columns columns
+    """
+    header = next(csv.reader([handle.readline().decode(encoding, errors='replace')]), [])
+    if len(header) < expected_columns:
+        logger.warning(
+            f"Expected at least {expected_columns} columns but found {len(header)} in {file_path.name}. "
+            f"Columns: {header}"
+        )
+        return False
+    return True
+
+def _standardize(df, file_path):
+    """
+    Replace the Date and Time text with one native timestamp column
+    
+    Args:
+        df (pd.DataFrame): Parsed table (or chunk) with TABLE_COLUMNS
+        file_path (Path): Path to the CSV file (its folder keys the timestamp format cache)
         
-        # Add metadata for hierarchical structure
-        parent_folder = metadata.get('parent_folder', 'Unknown')
-        filename = metadata.get('filename', 'Unknown')
+    Returns:
+        pandas.DataFrame: Table with Timestamp, Temp and RH columns
+    """
+    timestamps = parse_timestamps(df['Date'], df['Time'], source=str(Path(file_path).parent))
+    return pd.DataFrame({'Timestamp': timestamps, 'Temp': df['Temp'], 'RH': df['RH']})
+
+def _has_rows(handle):
+    """
+    Check whether anything but blank lines follows, without moving the stream
+    
+    pyarrow fails on an empty table instead of returning no rows.
+    
+    Args:
+        handle (file): Seekable binary stream positioned at the first data row
         
-        # Create hierarchical column names for raw data
-        hierarchical_columns = {}
-        for col in df.columns:
-            hierarchical_columns[col] = f"{parent_folder}_{filename}_{col}"
+    Returns:
+        bool: True if a non-blank byte follows
+    """
+    position = handle.tell()
+    try:
+        while True:
+            block = handle.read(64 * 1024)
+            if not block:
+                return False
+            if block.strip():
+                return True
+    finally:
+        handle.seek(position)
+
+def _empty_table(dtypes):
+    # Table with TABLE_COLUMNS and no rows, for files whose table has only a header row
+    return pd.DataFrame({name: pd.Series(dtype=dtypes[name]) for name in TABLE_COLUMNS})
+
+def _read_rows(handle, file_path, expected_columns, encoding='utf-8'):
+    """
+    Check the table header and parse the rows below it
+    
+    Args:
+        handle (file): Seekable binary stream positioned at the table header row
+        file_path (Path): Path to the CSV file (used for log messages)
+        expected_columns (int): Expected number of columns in the table
+        encoding (str): Encoding of the file
         
-        raw_df = df.rename(columns=hierarchical_columns)
+    Returns:
+        pandas.DataFrame: Parsed table with TABLE_COLUMNS, or None if the header has too few columns
+    """
+    if not _check_header(handle, file_path, expected_columns, encoding):
+        return None
+    
+    data_start = handle.tell()
+    text_dtypes = {name: str for name in TABLE_COLUMNS}
+    dtypes = {**text_dtypes, **{name: MEASUREMENT_DTYPE for name in TABLE_COLUMNS[2:]}}
+    if not _has_rows(handle):
+        return _empty_table(dtypes)
+    
+    try:
+        return _parse_rows(handle, dtypes, encoding, file_path)
+    except EmptyDataError:
+        return _empty_table(dtypes)
+    except ValueError as e:
+        # Text in a typed column raises a plain ValueError; parser and decoding errors are subclasses
+        if type(e) is not ValueError:
+            raise
+        logger.warning(f"Non-numeric measurements in {file_path.name}, coercing them to missing: {e}")
+        handle.seek(data_start)
+        df = _parse_rows(handle, text_dtypes, encoding, file_path)
+        for name in TABLE_COLUMNS[2:]:
+            df[name] = pd.to_numeric(df[name], errors='coerce').astype(MEASUREMENT_DTYPE)
+        return df
+
+def read_table(file_path, expected_columns=4):
+    """
+    Read the table from a CSV file and standardize its first 4 columns
+    
+    Only the first len(TABLE_COLUMNS) columns are parsed: Date and Time as
+    text and Temp and RH as MEASUREMENT_DTYPE. Files whose measurements
+    contain text that is not a number are re-parsed once and the bad values
+    become missing. Date and Time are then combined into a single
+    datetime64[ns] Timestamp column.
+    
+    The file is memory-mapped: the header is found with one byte-pattern
+    search over the preamble and the parser reads the table from a view of
+    the mapping starting at the table's byte offset. Files that cannot be
+    mapped (empty files, special files) are streamed instead. The encoding
+    is detected from the BOM and first bytes before anything is parsed, so
+    a UTF-16 or cp1252 export is never parsed twice.
+    
+    Args:
+        file_path (Path): Path to the CSV file
+        expected_columns (int): Expected number of columns in the table
         
-        # Create separate DataFrames for Temp and RH
-        temp_df = df[["Date", "Time", "Temp"]].copy()
-        temp_df.columns = ["Date", "Time", f"{parent_folder}_{filename}_Temp"]
+    Returns:
+        pandas.DataFrame: Table with Timestamp, Temp and RH columns, or an empty DataFrame
+    """
+    try:
+        # Open once: locate the table, then parse from the same position
+        with _open_table(file_path) as (table_start, handle, encoding):
+            if table_start == -1:
+                logger.warning(f"Could not find table start in {file_path.name}")
+                return pd.DataFrame()
+            
+            df = _read_rows(handle, file_path, expected_columns, encoding)
+            if df is None:
+                return pd.DataFrame()
         
-        rh_df = df[["Date", "Time", "RH"]].copy()
-        rh_df.columns = ["Date", "Time", f"{parent_folder}_{filename}_RH"]
+        df = _standardize(df, file_path)
         
         logger.info(f"Successfully read {len(df)} rows from {file_path.name}")
-        return raw_df, temp_df, rh_df
+        return df
         
     except Exception as e:
         logger.error(f"Error reading {file_path}: {e}")
-        return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
\ No newline at end of file
+        return pd.DataFrame()
+
+def iter_table_chunks(file_path, chunk_rows=None, expected_columns=4):
+    """
+    Read the table of a CSV file a chunk of rows at a time
+    
+    For files too large to hold in memory: the table is located as in
+    read_table, then parsed chunk_rows rows at a time with the C engine
+    (pyarrow cannot read in chunks). Every chunk is typed and standardized
+    the same way as a whole table (measurements that are not numbers
+    become missing) before it is yielded, so only one chunk is in memory
+    at a time. UTF-16 and UTF-32 files are transcoded as they are read, so
+    they are never held in memory whole either.
+    
+    Args:
+        file_path (Path): Path to the CSV file
+        chunk_rows (int): Rows per chunk (defaults to READ_CHUNK_ROWS)
+        expected_columns (int): Expected number of columns in the table
+        
+    Yields:
+        pandas.DataFrame: Chunks with Timestamp, Temp and RH columns, in file order
+    """
+    chunk_rows = chunk_rows or READ_CHUNK_ROWS
+    
+    try:
+        with _open_table(file_path) as (table_start, handle, encoding):
+            if table_start == -1:
+                logger.warning(f"Could not find table start in {file_path.name}")
+                return
+            if not _check_header(handle, file_path, expected_columns, encoding):
+                return
+            
+            reader = pd.read_csv(
+                handle,
+                header=None,
+                names=TABLE_COLUMNS,
+                usecols=range(len(TABLE_COLUMNS)),
+                dtype=str,  # Measurements are typed per chunk, so one bad value cannot fail the file
+                na_values=CSV_NA_VALUES,
+                engine='c',
+                encoding=encoding,
+                chunksize=chunk_rows
+            )
+            
+            rows = 0
+            coerced = 0
+            with reader:
+                for chunk in reader:
+                    for name in TABLE_COLUMNS[2:]:
+                        values = pd.to_numeric(chunk[name], errors='coerce').astype(MEASUREMENT_DTYPE)
+                        coerced += int(chunk[name].notna().sum() - values.notna().sum())
+                        chunk[name] = values
+                    rows += len(chunk)
+                    yield _standardize(chunk, file_path)
+            
+            if coerced:
+                logger.warning(f"{coerced} non-numeric measurements in {file_path.name} were read as missing")
+            logger.info(f"Successfully read {rows} rows in chunks of {chunk_rows} from {file_path.name}")
+        
+    except Exception as e:
+        logger.error(f"Error reading {file_path} in chunks: {e}")
+
+def label_table(df, metadata):
+    """
+    Give a standardized table its hierarchical column names
+    
+    Args:
+        df (pd.DataFrame): Table with Timestamp, Temp and RH columns
+        metadata (FileRecord): Metadata extracted from the file path
+        
+    Returns:
+        pandas.DataFrame: Table with parent_folder_filename_column names
+    """
+    if len(df.columns) == 0:
+        return pd.DataFrame()
+    
+    # Add metadata for hierarchical structure
+    parent_folder = metadata.parent_folder if metadata else 'Unknown'
+    filename = metadata.filename if metadata else 'Unknown'
+    
+    # Create hierarchical column names (renaming does not copy the data)
+    hierarchical_columns = {}
+    for col in df.columns:
+        hierarchical_columns[col] = f"{parent_folder}_{filename}_{col}"
+    
+    return df.rename(columns=hierarchical_columns)
+
+def read_csv_file(file_path, metadata, expected_columns=4):
+    """
+    Read CSV file starting from the table and extract first 4 columns
+    
+    The Temp and RH outputs are projections of this table made at export
+    time, so the timestamps are only stored once.
+    
+    Args:
+        file_path (Path): Path to the CSV file
+        metadata (FileRecord): Metadata extracted from the file path
+        expected_columns (int): Expected number of columns in the table
+        
+    Returns:
+        pandas.DataFrame: Table with hierarchical Timestamp, Temp and RH columns
+    """
+    return label_table(read_table(file_path, expected_columns), metadata)
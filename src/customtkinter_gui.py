@@ -8,16 +8,15 @@ from pathlib import Path
 import threading
 import queue
 import sys
-import pandas as pd
 import matplotlib
 from datetime import datetime, timedelta
-import numpy as np
 
 # Use Agg backend for better compatibility
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-import matplotlib.dates as mdates
+
+from config.settings import SUPPORTED_OUTPUT_FORMATS, DEFAULT_OUTPUT_FORMAT, CHART_RASTERIZE_LINES, AGGREGATION_ENABLED
 
 # Set appearance mode and color theme
 ctk.set_appearance_mode("Dark")  # "System", "Dark", "Light"
@@ -47,6 +46,11 @@ class CBDataManagementGUI:
         # Variables
         self.main_folder = ctk.StringVar()
         self.output_folder = ctk.StringVar()
+        self.low_memory = ctk.BooleanVar(value=False)
+        self.profile_run = ctk.BooleanVar(value=False)
+        self.export_aggregates = ctk.BooleanVar(value=AGGREGATION_ENABLED)
+        self.output_format = ctk.StringVar(value=DEFAULT_OUTPUT_FORMAT)
+        self.rasterize_lines = ctk.BooleanVar(value=CHART_RASTERIZE_LINES)
         
         # Progress tracking
         self.progress = ctk.DoubleVar(value=0)
@@ -61,8 +65,15 @@ class CBDataManagementGUI:
         self.rh_fig = None
         self.temp_canvas = None
         self.rh_canvas = None
+        self.temp_decimator = None
+        self.rh_decimator = None
         self.processed_data = None
         
+        # Charting runs on its own worker thread and can be cancelled
+        self.chart_thread = None
+        self.chart_cancel = threading.Event()
+        self.chart_buttons = []
+        
         # Set up proper cleanup
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         atexit.register(self.cleanup)
@@ -125,6 +136,9 @@ class CBDataManagementGUI:
 
     def cleanup(self):
         """Clean up resources before closing"""
+        # Ask a running charting task to stop
+        self.chart_cancel.set()
+        
         # Cancel any pending after callbacks
         if self.after_id:
             self.root.after_cancel(self.after_id)
@@ -142,6 +156,8 @@ class CBDataManagementGUI:
         # Clear canvas references
         self.temp_canvas = None
         self.rh_canvas = None
+        self.temp_decimator = None
+        self.rh_decimator = None
         
         # Clear processed data
         self.processed_data = None
@@ -203,7 +219,7 @@ class CBDataManagementGUI:
         )
         
         # Info about output files
-        info_text = "Output files will be created:\n• Raw.csv (all data)\n• Temp.csv (temperature only)\n• RH.csv (humidity only)"
+        info_text = "Output files will be created:\n• Raw (all data)\n• Temp (temperature only)\n• RH (humidity only)"
         info_label = ctk.CTkLabel(main_frame, text=info_text, justify="left")
         info_label.grid(row=3, column=0, columnspan=2, sticky="w", padx=20, pady=10)
         
@@ -229,6 +245,33 @@ class CBDataManagementGUI:
             width=120
         ).pack(side="left", padx=10)
         
+        ctk.CTkLabel(button_frame, text="Format:").pack(side="left", padx=(10, 5))
+        
+        ctk.CTkOptionMenu(
+            button_frame,
+            values=SUPPORTED_OUTPUT_FORMATS,
+            variable=self.output_format,
+            width=100
+        ).pack(side="left")
+        
+        ctk.CTkCheckBox(
+            button_frame,
+            text="Low memory mode",
+            variable=self.low_memory
+        ).pack(side="left", padx=10)
+        
+        ctk.CTkCheckBox(
+            button_frame,
+            text="Profile run",
+            variable=self.profile_run
+        ).pack(side="left", padx=10)
+        
+        ctk.CTkCheckBox(
+            button_frame,
+            text="Aggregates",
+            variable=self.export_aggregates
+        ).pack(side="left", padx=10)
+        
         # Progress section
         progress_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
         progress_frame.grid(row=5, column=0, columnspan=2, sticky="ew", padx=20, pady=10)
@@ -286,33 +329,54 @@ class CBDataManagementGUI:
         options_frame = ctk.CTkFrame(control_frame, fg_color="transparent")
         options_frame.grid(row=1, column=0, columnspan=2, sticky="ew", padx=20, pady=5)
         
-        ctk.CTkButton(
+        load_button = ctk.CTkButton(
             options_frame,
             text="Load and Process Data",
             command=self.load_and_process_data,
             fg_color="#3B8ED0",
             hover_color="#3679B5",
             width=180
-        ).pack(side="left", padx=(0, 10))
+        )
+        load_button.pack(side="left", padx=(0, 10))
         
-        ctk.CTkButton(
+        generate_button = ctk.CTkButton(
             options_frame,
             text="Generate Charts",
             command=self.generate_charts,
             fg_color="#2AA876",
             hover_color="#228B69",
             width=120
-        ).pack(side="left", padx=(0, 10))
+        )
+        generate_button.pack(side="left", padx=(0, 10))
         
-        ctk.CTkButton(
+        export_button = ctk.CTkButton(
             options_frame,
             text="Export Charts",
             command=self.export_charts,
             fg_color="#D35B5B",
             hover_color="#B84A4A",
             width=120
+        )
+        export_button.pack(side="left", padx=(0, 10))
+        
+        self.cancel_button = ctk.CTkButton(
+            options_frame,
+            text="Cancel",
+            command=self.cancel_chart_task,
+            fg_color="gray",
+            width=80,
+            state="disabled"
+        )
+        self.cancel_button.pack(side="left", padx=(0, 10))
+        
+        ctk.CTkCheckBox(
+            options_frame,
+            text="Rasterize lines",
+            variable=self.rasterize_lines
         ).pack(side="left")
         
+        self.chart_buttons = [load_button, generate_button, export_button]
+        
         # Chart display frame
         chart_frame = ctk.CTkFrame(tab)
         chart_frame.grid(row=1, column=0, sticky="nsew", padx=20, pady=(0, 20))
@@ -333,12 +397,6 @@ class CBDataManagementGUI:
         self.chart_notebook.tab("Humidity Chart").grid_columnconfigure(0, weight=1)
         self.chart_notebook.tab("Humidity Chart").grid_rowconfigure(0, weight=1)
         
-        # Initialize chart variables
-        self.temp_fig = None
-        self.rh_fig = None
-        self.temp_canvas = None
-        self.rh_canvas = None
-        self.processed_data = None
     
     def load_charting_data(self):
         """Placeholder function for charting data loading"""
@@ -419,25 +477,50 @@ class CBDataManagementGUI:
             if src_path not in sys.path:
                 sys.path.append(src_path)
             
-            from utils import process_all_files_with_progress
+            from utils import process_all_files_with_progress, process_all_files_streaming
             from data_exporter import export_data
+            from extraction_cache import get_cache_path
+            from instrumentation import RunReport
+            from metadata_extractor import FileCatalog
             
             # Process files with progress updates
             def progress_callback(current, total, message):
                 progress_percent = (current / total) * 100 if total > 0 else 0
                 self.queue.put(('progress', progress_percent, message))
             
-            raw_df, temp_df, rh_df = process_all_files_with_progress(
-                main_folder, 
-                progress_callback=progress_callback
-            )
-            
-            # Export data
-            success = export_data(raw_df, temp_df, rh_df, output_folder)
+            report = RunReport(profile=self.profile_run.get())
+            if self.low_memory.get():
+                # Process and export in chunks
+                success = process_all_files_streaming(
+                    main_folder,
+                    output_folder,
+                    progress_callback=progress_callback,
+                    cache_path=get_cache_path(output_folder),
+                    report=report
+                )
+            else:
+                catalog = FileCatalog(main_folder)
+                combined_df = process_all_files_with_progress(
+                    main_folder, 
+                    progress_callback=progress_callback,
+                    cache_path=get_cache_path(output_folder),
+                    report=report,
+                    catalog=catalog
+                )
+                
+                # Export data
+                success = export_data(combined_df, output_folder, self.output_format.get(), report)
+                
+                if success and self.export_aggregates.get():
+                    from aggregation import export_aggregates
+                    success = export_aggregates(combined_df, output_folder, self.output_format.get(),
+                                                records=catalog, report=report)
+            report.finish(output_folder)
             if success:
                 self.queue.put(('success', f'Data extraction completed successfully!\nOutput saved to {output_folder}'))
             else:
                 self.queue.put(('error', 'Failed to export some data'))
+            self.queue.put(('report', report.summary()))
                 
         except Exception as e:
             self.queue.put(('error', f'An error occurred: {str(e)}'))
@@ -476,6 +559,39 @@ class CBDataManagementGUI:
                     self.progress_label.set("Extraction completed with warnings")
                     self.status_label.configure(text="Extraction completed with warnings")
                     self.set_buttons_state("normal")
+                
+                elif message_type == 'report':
+                    summary = args[0]
+                    self.output_text.insert("end", f"Run report: {summary}\n")
+                    self.output_text.see("end")
+                    self.status_label.configure(text=summary)
+                
+                # Charting worker messages
+                elif message_type == 'chart_status':
+                    self.status_label.configure(text=args[0])
+                
+                elif message_type == 'chart_data':
+                    self.set_chart_buttons_state("normal")
+                    self.show_loaded_data(args[0])
+                
+                elif message_type == 'charts':
+                    self.set_chart_buttons_state("normal")
+                    self.show_charts(args[0])
+                
+                elif message_type == 'charts_exported':
+                    self.set_chart_buttons_state("normal")
+                    export_dir, report = args
+                    self.status_label.configure(text=f"Charts exported to {export_dir} ({'; '.join(report)})")
+                    messagebox.showinfo("Success", f"Charts exported successfully to:\n{export_dir}\n\n" + "\n".join(report))
+                
+                elif message_type == 'chart_cancelled':
+                    self.set_chart_buttons_state("normal")
+                    self.status_label.configure(text="Charting task cancelled")
+                
+                elif message_type == 'chart_error':
+                    self.set_chart_buttons_state("normal")
+                    messagebox.showerror("Error", args[0])
+                    self.status_label.configure(text="Charting task failed")
                     
         except queue.Empty:
             pass
@@ -503,200 +619,214 @@ class CBDataManagementGUI:
         if not output_folder:
             messagebox.showerror("Error", "Please select an output folder")
             return False
+        
+        if self.low_memory.get() and self.output_format.get() != 'csv':
+            messagebox.showerror("Error", "Low memory mode only writes CSV files")
+            return False
             
         return True
     
     def browse_data_file(self):
         file_path = filedialog.askopenfilename(
             title="Select Data File",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+            filetypes=[
+                ("Data files", "*.csv *.parquet *.feather *.xlsx"),
+                ("CSV files", "*.csv"),
+                ("Parquet files", "*.parquet"),
+                ("Feather files", "*.feather"),
+                ("Excel files", "*.xlsx"),
+                ("All files", "*.*")
+            ]
         )
         if file_path:
             self.data_file_var.set(file_path)
             self.status_label.configure(text=f"Data file: {os.path.basename(file_path)}")
 
+    def start_chart_task(self, target, *args):
+        """
+        Run a charting task on a worker thread
+        
+        Results come back through self.queue; only one charting task runs
+        at a time and it can be stopped with the Cancel button.
+        
+        Returns:
+            bool: True if the task was started
+        """
+        if self.chart_thread is not None and self.chart_thread.is_alive():
+            messagebox.showwarning("Busy", "A charting task is already running")
+            return False
+        
+        self.chart_cancel.clear()
+        self.set_chart_buttons_state("disabled")
+        self.chart_thread = threading.Thread(target=target, args=args)
+        self.chart_thread.daemon = True
+        self.chart_thread.start()
+        return True
+    
+    def cancel_chart_task(self):
+        if self.chart_thread is not None and self.chart_thread.is_alive():
+            self.chart_cancel.set()
+            self.status_label.configure(text="Cancelling...")
+    
+    def set_chart_buttons_state(self, state):
+        """Enable or disable the charting buttons (Cancel is enabled only while a task runs)"""
+        for button in self.chart_buttons:
+            button.configure(state=state)
+        self.cancel_button.configure(state="normal" if state == "disabled" else "disabled")
+
     def load_and_process_data(self):
         file_path = self.data_file_var.get()
         if not file_path or not os.path.exists(file_path):
             messagebox.showerror("Error", "Please select a valid data file")
             return
         
-        try:
+        if self.start_chart_task(self.run_load_data, file_path):
             self.status_label.configure(text="Loading and processing data...")
+    
+    def run_load_data(self, file_path):
+        try:
+            from data_exporter import read_exported_data
+            from chart_preview import prepare_chart_data
             
-            # Load the CSV file
-            df = pd.read_csv(file_path)
-            
-            # Extract temperature and humidity columns
-            temp_columns = [col for col in df.columns if 'Temp' in col]
-            rh_columns = [col for col in df.columns if 'RH' in col]
-            
-            if not temp_columns or not rh_columns:
-                messagebox.showerror("Error", "No temperature or humidity data found in the file")
+            # Load the exported data file
+            df = read_exported_data(file_path)
+            if self.chart_cancel.is_set():
+                self.queue.put(('chart_cancelled',))
                 return
             
-            # Calculate time intervals (10-minute intervals in hours)
-            num_rows = len(df)
-            time_intervals = np.arange(0, num_rows * 10/60, 10/60)  # 10 minutes = 10/60 hours
+            self.queue.put(('chart_status', f"Loaded {len(df)} rows, preparing chart data..."))
             
-            # Prepare data for plotting
-            self.processed_data = {
-                'time_intervals': time_intervals,
-                'temperature_data': df[temp_columns],
-                'humidity_data': df[rh_columns],
-                'temp_columns': temp_columns,
-                'rh_columns': rh_columns
-            }
+            # Prepare data for plotting against the real timestamps
+            processed_data = prepare_chart_data(df)
             
-            self.status_label.configure(text=f"Data loaded: {len(temp_columns)} temp columns, {len(rh_columns)} RH columns")
-            messagebox.showinfo("Success", f"Data loaded successfully!\n"
-                                        f"Temperature columns: {len(temp_columns)}\n"
-                                        f"Humidity columns: {len(rh_columns)}\n"
-                                        f"Time points: {num_rows}")
+            if processed_data is None:
+                self.queue.put(('chart_error', "No temperature or humidity data found in the file"))
+            elif self.chart_cancel.is_set():
+                self.queue.put(('chart_cancelled',))
+            else:
+                self.queue.put(('chart_data', processed_data))
             
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to load data: {str(e)}")
-            self.status_label.configure(text="Data loading failed")
+            self.queue.put(('chart_error', f"Failed to load data: {str(e)}"))
+    
+    def show_loaded_data(self, processed_data):
+        self.processed_data = processed_data
+        temp_columns = processed_data['temp_columns']
+        rh_columns = processed_data['rh_columns']
+        
+        self.status_label.configure(text=f"Data loaded: {len(temp_columns)} temp columns, {len(rh_columns)} RH columns")
+        messagebox.showinfo("Success", f"Data loaded successfully!\n"
+                                    f"Temperature columns: {len(temp_columns)}\n"
+                                    f"Humidity columns: {len(rh_columns)}\n"
+                                    f"Time points: {processed_data['time_points']}")
 
     def generate_charts(self):
         if self.processed_data is None:
             messagebox.showerror("Error", "Please load and process data first")
             return
         
-        try:
+        if self.start_chart_task(self.run_generate_charts, self.processed_data):
             self.status_label.configure(text="Generating charts...")
+    
+    def run_generate_charts(self, processed_data):
+        try:
+            from chart_preview import build_chart_figure
             
-            # Generate temperature chart
-            self.create_temperature_chart()
-            
-            # Generate humidity chart
-            self.create_humidity_chart()
+            # Build both figures off the Tk thread; they are only attached
+            # to canvases once they come back through the queue
+            charts = {}
+            for measurement, name in (('Temp', 'temperature'), ('RH', 'humidity')):
+                if self.chart_cancel.is_set():
+                    self.queue.put(('chart_cancelled',))
+                    return
+                
+                self.queue.put(('chart_status', f"Building {name} chart..."))
+                charts[measurement] = build_chart_figure(processed_data, measurement)
             
-            self.status_label.configure(text="Charts generated successfully")
+            self.queue.put(('charts', charts))
             
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to generate charts: {str(e)}")
-            self.status_label.configure(text="Chart generation failed")
-
-    def create_temperature_chart(self):
-    # Clear previous chart and figures
-        for widget in self.chart_notebook.tab("Temperature Chart").winfo_children():
-            widget.destroy()
-        
-        if self.temp_fig:
-            plt.close(self.temp_fig)
-        
-        # Create figure with explicit reference
-        self.temp_fig, ax = plt.subplots(figsize=(10, 6))
-        
-        # Plot each temperature column
-        time_intervals = self.processed_data['time_intervals']
-        temp_data = self.processed_data['temperature_data']
-        
-        for col in self.processed_data['temp_columns']:
-            # Get the label (folder_filename part)
-            label_parts = col.split('_')
-            label = '_'.join(label_parts[:-1])  # Remove the 'Temp' part
-            ax.plot(time_intervals, temp_data[col], label=label, alpha=0.7, linewidth=1.5)
-        
-        # Customize chart
-        ax.set_xlabel('Time (hours)', fontsize=12)
-        ax.set_ylabel('Temperature', fontsize=12)
-        ax.set_title('Temperature vs Time', fontsize=14, fontweight='bold')
-        ax.grid(True, alpha=0.3)
-        ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
-        
-        # Format x-axis to show hours properly
-        ax.xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f'{x:.1f}'))
+            self.queue.put(('chart_error', f"Failed to generate charts: {str(e)}"))
+    
+    def show_charts(self, charts):
+        self.temp_fig, self.temp_decimator = charts['Temp']
+        self.temp_canvas = self.embed_chart(self.temp_fig, "Temperature Chart")
         
-        plt.tight_layout()
+        self.rh_fig, self.rh_decimator = charts['RH']
+        self.rh_canvas = self.embed_chart(self.rh_fig, "Humidity Chart")
         
-        # Embed in tkinter with proper cleanup handling
-        self.temp_canvas = FigureCanvasTkAgg(self.temp_fig, self.chart_notebook.tab("Temperature Chart"))
-        self.temp_canvas.draw()
-        self.temp_canvas.get_tk_widget().pack(fill='both', expand=True)
+        self.status_label.configure(text="Charts generated successfully")
 
-    def create_humidity_chart(self):
-        # Clear previous chart and figures
-        for widget in self.chart_notebook.tab("Humidity Chart").winfo_children():
-            widget.destroy()
-        
-        if self.rh_fig:
-            plt.close(self.rh_fig)
-        
-        # Create figure with explicit reference
-        self.rh_fig, ax = plt.subplots(figsize=(10, 6))
+    def embed_chart(self, figure, tab_name):
+        tab = self.chart_notebook.tab(tab_name)
         
-        # Plot each humidity column
-        time_intervals = self.processed_data['time_intervals']
-        rh_data = self.processed_data['humidity_data']
-        
-        for col in self.processed_data['rh_columns']:
-            # Get the label (folder_filename part)
-            label_parts = col.split('_')
-            label = '_'.join(label_parts[:-1])  # Remove the 'RH' part
-            ax.plot(time_intervals, rh_data[col], label=label, alpha=0.7, linewidth=1.5)
-        
-        # Customize chart
-        ax.set_xlabel('Time (hours)', fontsize=12)
-        ax.set_ylabel('Relative Humidity (%)', fontsize=12)
-        ax.set_title('Relative Humidity vs Time', fontsize=14, fontweight='bold')
-        ax.grid(True, alpha=0.3)
-        ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
-        
-        # Format x-axis to show hours properly
-        ax.xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f'{x:.1f}'))
-        
-        plt.tight_layout()
+        # Clear previous chart
+        for widget in tab.winfo_children():
+            widget.destroy()
         
         # Embed in tkinter with proper cleanup handling
-        self.rh_canvas = FigureCanvasTkAgg(self.rh_fig, self.chart_notebook.tab("Humidity Chart"))
-        self.rh_canvas.draw()
-        self.rh_canvas.get_tk_widget().pack(fill='both', expand=True)
+        canvas = FigureCanvasTkAgg(figure, tab)
+        canvas.draw()
+        
+        # Zoom and pan toolbar; the decimator re-decimates the lines to each new view
+        toolbar = NavigationToolbar2Tk(canvas, tab, pack_toolbar=False)
+        toolbar.update()
+        toolbar.pack(side='bottom', fill='x')
+        canvas.get_tk_widget().pack(fill='both', expand=True)
+        return canvas
 
     def export_charts(self):
         if self.temp_fig is None or self.rh_fig is None:
             messagebox.showerror("Error", "Please generate charts first")
             return
         
+        # Ask for export directory
+        export_dir = filedialog.askdirectory(title="Select Export Directory")
+        if not export_dir:
+            return
+        
+        if self.start_chart_task(self.run_export_charts, export_dir, self.processed_data, self.rasterize_lines.get()):
+            self.status_label.configure(text="Exporting charts...")
+    
+    def run_export_charts(self, export_dir, processed_data, rasterize_lines):
         try:
-            # Ask for export directory
-            export_dir = filedialog.askdirectory(title="Select Export Directory")
-            if not export_dir:
-                return
+            from chart_preview import build_chart_figure, save_chart
             
-            # Export temperature chart
-            temp_path = os.path.join(export_dir, "temperature_chart.svg")
-            self.temp_fig.savefig(temp_path, dpi=300, bbox_inches='tight', format="svg")
-            
-            # Export humidity chart
-            rh_path = os.path.join(export_dir, "humidity_chart.svg")
-            self.rh_fig.savefig(rh_path, dpi=300, bbox_inches='tight', format="svg")
+            # Export temperature and humidity charts from figures of their own,
+            # so the worker never touches the figures the Tk thread is drawing
+            report = []
+            for measurement, filename in (('Temp', "temperature_chart.svg"), ('RH', "humidity_chart.svg")):
+                if self.chart_cancel.is_set():
+                    self.queue.put(('chart_cancelled',))
+                    return
+                
+                self.queue.put(('chart_status', f"Saving {filename}..."))
+                figure, _decimator = build_chart_figure(processed_data, measurement)
+                size, seconds = save_chart(figure, os.path.join(export_dir, filename), rasterize_lines)
+                report.append(f"{filename}: {size / 1024:.1f} KB in {seconds:.2f}s")
             
             # Export data summary
             summary_path = os.path.join(export_dir, "chart_data_summary.txt")
             with open(summary_path, 'w') as f:
                 f.write("Chart Data Summary\n")
                 f.write("=================\n\n")
-                f.write(f"Temperature columns: {len(self.processed_data['temp_columns'])}\n")
-                f.write(f"Humidity columns: {len(self.processed_data['rh_columns'])}\n")
-                f.write(f"Time points: {len(self.processed_data['time_intervals'])}\n")
-                f.write(f"Total duration: {self.processed_data['time_intervals'][-1]:.2f} hours\n\n")
+                f.write(f"Temperature columns: {len(processed_data['temp_columns'])}\n")
+                f.write(f"Humidity columns: {len(processed_data['rh_columns'])}\n")
+                f.write(f"Time points: {processed_data['time_points']}\n")
+                f.write(f"Total duration: {processed_data['duration_hours']:.2f} hours\n\n")
                 
                 f.write("Temperature Columns:\n")
-                for col in self.processed_data['temp_columns']:
+                for col in processed_data['temp_columns']:
                     f.write(f"  - {col}\n")
                 
                 f.write("\nHumidity Columns:\n")
-                for col in self.processed_data['rh_columns']:
+                for col in processed_data['rh_columns']:
                     f.write(f"  - {col}\n")
             
-            self.status_label.configure(text=f"Charts exported to {export_dir}")
-            messagebox.showinfo("Success", f"Charts exported successfully to:\n{export_dir}")
+            self.queue.put(('charts_exported', export_dir, report))
             
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to export charts: {str(e)}")
-            self.status_label.configure(text="Chart export failed")
+            self.queue.put(('chart_error', f"Failed to export charts: {str(e)}"))
 
 def run_customtkinter_gui():
     """Run the CustomTkinter GUI application"""
@@ -1,59 +1,378 @@
 # Handles data export functionality
 
 import pandas as pd
+import numpy as np
 import logging
 import os
+import tempfile
+
+from config.settings import (
+    STREAMING_CHUNK_ROWS, SUPPORTED_OUTPUT_FORMATS, DEFAULT_OUTPUT_FORMAT,
+    PARQUET_COMPRESSION, PARQUET_ROW_GROUP_SIZE, FEATHER_COMPRESSION
+)
 
 logger = logging.getLogger(__name__)
 
-def export_data(raw_df, temp_df, rh_df, output_folder):
+# Excel worksheet limits
+EXCEL_MAX_ROWS = 1048576
+EXCEL_MAX_COLUMNS = 16384
+
+def _with_unique_columns(df):
     """
-    Export the three DataFrames to CSV files in the output folder
+    Make duplicate column names unique (Date, Date.1, ...) for columnar formats
+    
+    Uses the same suffixes pandas gives duplicate CSV headers, so a Temp or
+    RH file has the same column names whichever format it is loaded from.
     
     Args:
-        raw_df (pd.DataFrame): Raw combined data
-        temp_df (pd.DataFrame): Temperature data
-        rh_df (pd.DataFrame): Relative humidity data
+        df (pd.DataFrame): DataFrame to export
+        
+    Returns:
+        pandas.DataFrame: DataFrame with unique string column names
+    """
+    seen = {}
+    columns = []
+    for name in map(str, df.columns):
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        columns.append(name if count == 0 else f"{name}.{count}")
+    return df.set_axis(columns, axis=1)
+
+# Output views of the canonical table: name, log title, measurement kept
+OUTPUT_VIEWS = [
+    ("Raw", "Raw data", None),
+    ("Temp", "Temperature data", "Temp"),
+    ("RH", "RH data", "RH"),
+]
+
+def get_view_columns(columns, measurement=None):
+    """
+    Work out which columns of the canonical table make up an output view
+    
+    The Raw view is the whole table. The Temp and RH views keep the time
+    columns (each logger's Timestamp, or the common one) under the plain
+    name Timestamp plus the columns for that measurement.
+    
+    Args:
+        columns (list): Column names of the canonical table
+        measurement (str): 'Temp', 'RH', or None for the Raw view
+        
+    Returns:
+        tuple: (positions, labels) - Column positions and their output headers
+    """
+    positions = []
+    labels = []
+    for position, name in enumerate(map(str, columns)):
+        if measurement is None or name.endswith(f"_{measurement}"):
+            label = name
+        elif name == "Timestamp" or name.endswith("_Timestamp"):
+            label = "Timestamp"
+        else:
+            continue
+        positions.append(position)
+        labels.append(label)
+    return positions, labels
+
+def _write_csv(df, output_path, positions=None, labels=None):
+    if positions is None:
+        df.to_csv(output_path, index=False)
+        return
+    
+    # Write the projection a slice of rows at a time, so only one slice of
+    # the selected columns is ever materialized
+    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        pd.DataFrame(columns=labels).to_csv(f, index=False)
+        for start in range(0, len(df), STREAMING_CHUNK_ROWS):
+            df.iloc[start:start + STREAMING_CHUNK_ROWS, positions].to_csv(f, index=False, header=False)
+
+def _project(df, positions, labels):
+    if positions is None:
+        return df
+    return df.iloc[:, positions].set_axis(labels, axis=1)
+
+def _write_parquet(df, output_path, positions=None, labels=None):
+    _with_unique_columns(_project(df, positions, labels)).to_parquet(
+        output_path,
+        index=False,
+        compression=PARQUET_COMPRESSION,
+        row_group_size=PARQUET_ROW_GROUP_SIZE
+    )
+
+def _write_feather(df, output_path, positions=None, labels=None):
+    _with_unique_columns(_project(df, positions, labels)).reset_index(drop=True).to_feather(
+        output_path,
+        compression=FEATHER_COMPRESSION
+    )
+
+def _write_excel(df, output_path, positions=None, labels=None):
+    n_columns = len(df.columns) if positions is None else len(positions)
+    if len(df) + 1 > EXCEL_MAX_ROWS or n_columns > EXCEL_MAX_COLUMNS:
+        raise ValueError(
+            f"{len(df)} rows x {n_columns} columns exceeds the Excel sheet limit "
+            f"of {EXCEL_MAX_ROWS - 1} rows x {EXCEL_MAX_COLUMNS} columns"
+        )
+    _project(df, positions, labels).to_excel(output_path, index=False, engine='openpyxl')
+
+# Writer and file extension for each supported output format
+OUTPUT_WRITERS = {
+    'csv': ('.csv', _write_csv),
+    'parquet': ('.parquet', _write_parquet),
+    'feather': ('.feather', _write_feather),
+    'excel': ('.xlsx', _write_excel),
+}
+
+def get_output_path(output_folder, name, output_format='csv'):
+    """
+    Get the path of an output file for the given format
+    
+    Args:
+        output_folder (str): Path to the output folder
+        name (str): Output name ('Raw', 'Temp' or 'RH')
+        output_format (str): One of SUPPORTED_OUTPUT_FORMATS
+        
+    Returns:
+        str: Path to the output file
+    """
+    extension, _ = OUTPUT_WRITERS[output_format]
+    return os.path.join(output_folder, f"{name}{extension}")
+
+def write_dataframe(df, output_path, output_format='csv', positions=None, labels=None):
+    """
+    Write a DataFrame, or a projection of its columns, with the writer for the given format
+    
+    Args:
+        df (pd.DataFrame): DataFrame to write
+        output_path (str): Destination file path
+        output_format (str): One of SUPPORTED_OUTPUT_FORMATS
+        positions (list): Column positions to write, or None for all columns
+        labels (list): Output headers for the selected columns
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    _, writer = OUTPUT_WRITERS[output_format]
+    
+    try:
+        writer(df, output_path, positions, labels)
+        return True
+    except ImportError as e:
+        logger.error(f"Cannot write {output_format} output, a required package is missing: {e}")
+    except Exception as e:
+        logger.error(f"Error writing {output_path}: {e}")
+    return False
+
+def export_data(combined_df, output_folder, output_format=None, report=None):
+    """
+    Export the Raw, Temp and RH views of the combined table to the output folder
+    
+    Temp and RH are column projections of the same table, so the shared
+    Date/Time data is held in memory once.
+    
+    Args:
+        combined_df (pd.DataFrame): Combined table from process_all_files
         output_folder (str): Path to the output folder
+        output_format (str): One of SUPPORTED_OUTPUT_FORMATS (defaults to DEFAULT_OUTPUT_FORMAT)
+        report (RunReport): Records the export stage, or None
         
     Returns:
         bool: True if successful, False otherwise
     """
+    from src.instrumentation import measure
+    
+    output_format = output_format or DEFAULT_OUTPUT_FORMAT
+    if output_format not in OUTPUT_WRITERS:
+        logger.error(f"Unsupported output format '{output_format}'. Expected one of {SUPPORTED_OUTPUT_FORMATS}")
+        return False
+    
+    if combined_df.empty:
+        logger.warning("No data to export")
+        return False
+    
     try:
         # Create output folder if it doesn't exist
         os.makedirs(output_folder, exist_ok=True)
         
-        # Define output file paths
-        raw_output_path = os.path.join(output_folder, "Raw.csv")
-        temp_output_path = os.path.join(output_folder, "Temp.csv")
-        rh_output_path = os.path.join(output_folder, "RH.csv")
-        
-        # Export each DataFrame
+        # Export each view
         success = True
         
-        if not raw_df.empty:
-            raw_df.to_csv(raw_output_path, index=False)
-            logger.info(f"Raw data exported successfully to {raw_output_path}")
-        else:
-            logger.warning("No raw data to export")
-            success = False
+        with measure(report, 'export') as stage:
+            written = 0
+            for name, title, measurement in OUTPUT_VIEWS:
+                output_path = get_output_path(output_folder, name, output_format)
+                
+                if measurement is None:
+                    positions, labels = None, None
+                else:
+                    positions, labels = get_view_columns(combined_df.columns, measurement)
+                
+                if write_dataframe(combined_df, output_path, output_format, positions, labels):
+                    logger.info(f"{title} exported successfully to {output_path}")
+                    written += os.path.getsize(output_path)
+                else:
+                    success = False
+            
+            stage['bytes'] = written
+            stage['rows'] = len(combined_df)
         
-        if not temp_df.empty:
-            temp_df.to_csv(temp_output_path, index=False)
-            logger.info(f"Temperature data exported successfully to {temp_output_path}")
-        else:
-            logger.warning("No temperature data to export")
-            success = False
+        return success
         
-        if not rh_df.empty:
-            rh_df.to_csv(rh_output_path, index=False)
-            logger.info(f"RH data exported successfully to {rh_output_path}")
+    except Exception as e:
+        logger.error(f"Error exporting data: {e}")
+        return False
+
+def read_exported_data(file_path):
+    """
+    Load an exported Raw, Temp or RH file in any supported format
+    
+    Args:
+        file_path (str): Path to a .csv, .parquet, .feather or .xlsx file
+        
+    Returns:
+        pandas.DataFrame: Loaded data
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    
+    if extension == '.parquet':
+        return pd.read_parquet(file_path)
+    if extension in ('.feather', '.arrow'):
+        return pd.read_feather(file_path)
+    if extension in ('.xlsx', '.xls'):
+        return pd.read_excel(file_path)
+    return pd.read_csv(file_path)
+
+def _table_to_records(table):
+    """
+    Convert a standardized table to a structured array for spilling to disk
+    
+    Numeric columns are stored as floats of their own precision (see
+    get_float_dtype), timestamps as datetime64[ns] and everything else as
+    fixed-width strings, so the spill file can be appended to chunk by
+    chunk, memory-mapped and sliced by row.
+    
+    Args:
+        table (pd.DataFrame): Table with Timestamp, Temp and RH columns
+        
+    Returns:
+        numpy.ndarray: Structured array with one field per column
+    """
+    from src.utils import get_float_dtype
+    
+    fields = []
+    columns = []
+    for name in table.columns:
+        column = table[name]
+        if pd.api.types.is_numeric_dtype(column.dtype) and not pd.api.types.is_bool_dtype(column.dtype):
+            dtype = get_float_dtype([column.dtype])
+            values = column.to_numpy(dtype=dtype, na_value=np.nan)
+            fields.append((name, dtype))
+        elif pd.api.types.is_datetime64_dtype(column.dtype):
+            values = column.to_numpy(dtype='datetime64[ns]')
+            fields.append((name, 'datetime64[ns]'))
         else:
-            logger.warning("No RH data to export")
-            success = False
+            values = column.astype(object).where(column.notna(), '').astype(str).to_numpy(dtype=object)
+            width = max((len(value) for value in values), default=1)
+            fields.append((name, f'U{max(width, 1)}'))
+        columns.append(values)
+    
+    records = np.empty(len(table), dtype=fields)
+    for (name, _), values in zip(fields, columns):
+        records[name] = values
+    return records
+
+def _load_spilled_rows(spill_path, dtype, n_rows, start, stop):
+    """
+    Load a row range of a spilled table
+    
+    Args:
+        spill_path (str): Path to the raw spill file
+        dtype (numpy.dtype): Record layout of the spill file
+        n_rows (int): Number of records in the spill file
+        start (int): First row to load
+        stop (int): Row to stop before
         
-        return success
+    Returns:
+        pandas.DataFrame: The rows (possibly none) with the table's columns
+    """
+    records = np.memmap(spill_path, dtype=dtype, mode='r', shape=(n_rows,))
+    rows = np.array(records[start:stop])
+    del records  # Release the memory map
+    return pd.DataFrame({name: rows[name] for name in rows.dtype.names})
+
+def export_data_streaming(tables, output_folder, chunk_rows=None):
+    """
+    Export Raw, Temp and RH CSV files in row chunks with bounded memory
+    
+    Every table is spilled to a temporary file in the output folder as soon
+    as it arrives, so only one parsed file (or chunk of a file) is held in
+    memory at a time. The outputs are then written chunk_rows rows at a time
+    by slicing the memory-mapped spill files, aligning files by row position.
+    
+    Args:
+        tables (iterable): (index, metadata, table) tuples; index sets the column order, and
+                           tables sharing an index are consecutive chunks of one file
+        output_folder (str): Path to the output folder
+        chunk_rows (int): Rows per written chunk (defaults to STREAMING_CHUNK_ROWS)
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    from src.csv_processor import label_table
+    from src.utils import combine_dataframes_horizontally
+    
+    chunk_rows = chunk_rows or STREAMING_CHUNK_ROWS
+    
+    try:
+        # Create output folder if it doesn't exist
+        os.makedirs(output_folder, exist_ok=True)
+        
+        with tempfile.TemporaryDirectory(prefix='.spill_', dir=output_folder) as spill_dir:
+            # index -> [metadata, spill path, rows, record dtype]
+            spills = {}
+            for i, metadata, table in tables:
+                if table.empty:
+                    continue
+                
+                records = _table_to_records(table)
+                if i not in spills:
+                    spills[i] = [metadata, os.path.join(spill_dir, f"{i}.bin"), 0, records.dtype]
+                spill = spills[i]
+                
+                # Later chunks of a file are appended in the layout of its first chunk
+                with open(spill[1], 'ab') as f:
+                    records.astype(spill[3], copy=False).tofile(f)
+                spill[2] += len(records)
+            
+            if not spills:
+                logger.warning("No data to export")
+                return False
+            
+            spilled = [spills[i] for i in sorted(spills)]
+            max_rows = max(n_rows for _, _, n_rows, _ in spilled)
+            
+            for start in range(0, max_rows, chunk_rows):
+                stop = min(start + chunk_rows, max_rows)
+                
+                chunk = combine_dataframes_horizontally([
+                    label_table(_load_spilled_rows(spill_path, dtype, n_rows, start, stop), metadata)
+                    for metadata, spill_path, n_rows, dtype in spilled
+                ])
+                
+                # Write the Raw, Temp and RH projections of this chunk
+                for name, _, measurement in OUTPUT_VIEWS:
+                    positions, labels = get_view_columns(chunk.columns, measurement)
+                    chunk.iloc[:, positions].to_csv(
+                        get_output_path(output_folder, name, 'csv'),
+                        index=False,
+                        mode='w' if start == 0 else 'a',
+                        header=labels if start == 0 else False
+                    )
+                
+                logger.info(f"Exported rows {start + 1}-{stop} of {max_rows}")
+        
+        for name, title, _ in OUTPUT_VIEWS:
+            logger.info(f"{title} exported successfully to {get_output_path(output_folder, name, 'csv')}")
+        return True
         
     except Exception as e:
         logger.error(f"Error exporting data: {e}")
-        return False
\ No newline at end of file
+        return False
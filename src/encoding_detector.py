@@ -0,0 +1,114 @@
+# Encoding and byte order mark detection for logger exports
+
+import codecs
+import logging
+
+from config.settings import CSV_ENCODINGS, ENCODING_SNIFF_BYTES
+
+logger = logging.getLogger(__name__)
+
+# Byte order marks, longest first (the UTF-32 LE mark starts with the UTF-16 LE one)
+BOMS = [
+    (codecs.BOM_UTF32_LE, 'utf-32-le'),
+    (codecs.BOM_UTF32_BE, 'utf-32-be'),
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+]
+
+# Encoding that last worked for each source (e.g. a logger folder), per process
+_encoding_cache = {}
+
+def is_ascii_compatible(encoding):
+    """
+    Check whether ASCII text is encoded as plain ASCII bytes
+    
+    Only then can the header rules be matched against the raw bytes.
+    
+    Args:
+        encoding (str): Codec name
+    
+    Returns:
+        bool: False for UTF-16 and UTF-32, True otherwise
+    """
+    return codecs.lookup(encoding).name not in ('utf-16', 'utf-16-le', 'utf-16-be', 'utf-32', 'utf-32-le', 'utf-32-be')
+
+def _sniff_wide(head):
+    # Mostly-ASCII UTF-16 without a BOM has a NUL in every other byte
+    if len(head) < 4:
+        return None
+    even = head[0::2].count(0) / len(head[0::2])
+    odd = head[1::2].count(0) / len(head[1::2])
+    if odd > 0.3 and even < 0.05:
+        return 'utf-16-le'
+    if even > 0.3 and odd < 0.05:
+        return 'utf-16-be'
+    return None
+
+def _decodes(head, encoding, complete):
+    if not complete:
+        # The sample may end part way through a character; only check whole lines
+        head = head[:head.rfind(b'\n') + 1] or head
+    try:
+        head.decode(encoding)
+        return True
+    except (UnicodeDecodeError, LookupError):
+        return False
+
+def detect_encoding(head, source=None, complete=False):
+    """
+    Detect the encoding of a file from its first bytes
+    
+    A byte order mark decides the encoding outright. Otherwise UTF-16
+    without a BOM is recognised by its NUL bytes, then CSV_ENCODINGS are
+    tried in order and the first that decodes the sample is remembered for
+    the source. The remembered encoding is only tried first among
+    CSV_ENCODINGS, so files from the same logger usually decode on the first
+    attempt, but a UTF-16 file is never read as cp1252 because the last
+    file in its folder was.
+    
+    Args:
+        head (bytes): First ENCODING_SNIFF_BYTES of the file
+        source (str): Key to remember the encoding under (e.g. the parent folder)
+        complete (bool): True if head is the whole file
+    
+    Returns:
+        tuple: (encoding, length of the byte order mark in bytes)
+    """
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding, len(bom)
+    
+    encoding = _sniff_wide(head)
+    if encoding is not None:
+        return encoding, 0
+    
+    cached = _encoding_cache.get(source)
+    candidates = sorted(CSV_ENCODINGS, key=lambda enc: enc != cached)
+    encoding = next((enc for enc in candidates if _decodes(head, enc, complete)), None)
+    if encoding is None:
+        # latin-1 maps every byte, so the file can still be read
+        logger.warning(f"None of {CSV_ENCODINGS} decodes the start of a file from {source}, reading it as latin-1")
+        return 'latin-1', 0
+    
+    if source is not None and cached != encoding:
+        logger.info(f"Using {encoding} encoding for files in {source}")
+        _encoding_cache[source] = encoding
+    return encoding, 0
+
+def detect_file_encoding(handle, source=None):
+    """
+    Detect the encoding of an open binary file without moving its position
+    
+    Args:
+        handle (file): File object opened in binary mode
+        source (str): Key to remember the encoding under (e.g. the parent folder)
+    
+    Returns:
+        tuple: (encoding, length of the byte order mark in bytes)
+    """
+    position = handle.tell()
+    handle.seek(0)
+    head = handle.read(ENCODING_SNIFF_BYTES + 1)
+    handle.seek(position)
+    return detect_encoding(head[:ENCODING_SNIFF_BYTES], source, complete=len(head) <= ENCODING_SNIFF_BYTES)
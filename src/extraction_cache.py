@@ -0,0 +1,180 @@
+# Persistent cache of parsed tables, so unchanged files are not re-read
+
+import sqlite3
+import hashlib
+import io
+import json
+import logging
+import os
+
+import pandas as pd
+
+from config.settings import (
+    EXTRACTION_CACHE_ENABLED, EXTRACTION_CACHE_FILENAME, HEADER_RULES, TABLE_START_OFFSET,
+    HEADER_MAX_SCAN_LINES, HEADER_MAX_SCAN_BYTES, TABLE_COLUMNS, MEASUREMENT_DTYPE, CSV_NA_VALUES,
+    CSV_ENCODINGS, TIMESTAMP_FORMATS, TIMESTAMP_DAYFIRST
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the layout of the cached tables changes
+CACHE_SCHEMA_VERSION = 4
+
+def get_cache_path(output_folder):
+    """
+    Get the cache file path for an output folder
+    
+    Args:
+        output_folder (str): Path to the output folder
+        
+    Returns:
+        str: Path to the cache file, or None if caching is disabled
+    """
+    if not EXTRACTION_CACHE_ENABLED or not output_folder:
+        return None
+    return os.path.join(output_folder, EXTRACTION_CACHE_FILENAME)
+
+def get_cache_version():
+    """
+    Get the version cached tables are stored under
+    
+    Combines CACHE_SCHEMA_VERSION with a hash of every setting that changes
+    how a file is parsed and of the pandas version (which decides the
+    parsed dtypes), so changing one of them invalidates the cache.
+    
+    Returns:
+        int: Non-negative 31-bit version (stored as the SQLite user_version)
+    """
+    from src.csv_processor import get_csv_engine
+    
+    # The resolved engine, since 'auto' picks a different parser depending on what is installed
+    settings = [
+        CACHE_SCHEMA_VERSION, HEADER_RULES, TABLE_START_OFFSET, HEADER_MAX_SCAN_LINES, HEADER_MAX_SCAN_BYTES,
+        TABLE_COLUMNS, MEASUREMENT_DTYPE, CSV_NA_VALUES, CSV_ENCODINGS, TIMESTAMP_FORMATS, TIMESTAMP_DAYFIRST,
+        get_csv_engine(), pd.__version__
+    ]
+    digest = hashlib.sha1(json.dumps(settings, sort_keys=True, default=str).encode('utf-8')).digest()
+    return int.from_bytes(digest[:4], 'big') & 0x7FFFFFFF
+
+def prune_cache(conn):
+    """
+    Remove the entries of files that no longer exist
+    
+    Args:
+        conn (sqlite3.Connection): Open cache connection
+        
+    Returns:
+        int: Number of entries removed
+    """
+    missing = [(path,) for (path,) in conn.execute("SELECT path FROM tables") if not os.path.exists(path)]
+    if missing:
+        conn.executemany("DELETE FROM tables WHERE path = ?", missing)
+        logger.info(f"Removed {len(missing)} extraction cache entries of deleted files")
+    return len(missing)
+
+def open_cache(cache_path):
+    """
+    Open (and create if needed) the extraction cache
+    
+    Args:
+        cache_path (str): Path to the SQLite cache file
+        
+    Returns:
+        sqlite3.Connection: Open connection, or None if the cache is unavailable
+    """
+    if not cache_path:
+        return None
+    
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        logger.warning("pyarrow is not installed, so parsed tables are not cached")
+        return None
+    
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+        conn = sqlite3.connect(cache_path)
+        
+        # Drop entries written with an older table layout or other parsing settings
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        expected = get_cache_version()
+        if version != expected:
+            if version:
+                logger.info("Parsing settings or cache layout changed, clearing the extraction cache")
+            conn.execute("DROP TABLE IF EXISTS tables")
+            conn.execute(f"PRAGMA user_version = {expected}")
+        
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS tables ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, data BLOB)"
+        )
+        prune_cache(conn)
+        conn.commit()
+        return conn
+        
+    except Exception as e:
+        logger.error(f"Error opening extraction cache {cache_path}: {e}")
+        return None
+
+def _cache_key(file_path):
+    return os.path.abspath(str(file_path))
+
+def _table_to_bytes(df):
+    # Parquet rather than pickle: loading a cache entry written by someone else must not run code
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, engine='pyarrow')
+    return buffer.getvalue()
+
+def _table_from_bytes(data):
+    return pd.read_parquet(io.BytesIO(data), engine='pyarrow')
+
+def load_cached_table(conn, file_path, size, mtime_ns):
+    """
+    Load a parsed table from the cache if the file is unchanged
+    
+    Args:
+        conn (sqlite3.Connection): Open cache connection
+        file_path (Path): Path to the CSV file
+        size (int): Current file size in bytes
+        mtime_ns (int): Current modification time in nanoseconds
+        
+    Returns:
+        pandas.DataFrame: Cached table, or None on a cache miss
+    """
+    if conn is None:
+        return None
+    
+    try:
+        row = conn.execute(
+            "SELECT data FROM tables WHERE path = ? AND size = ? AND mtime_ns = ?",
+            (_cache_key(file_path), size, mtime_ns)
+        ).fetchone()
+        return _table_from_bytes(row[0]) if row else None
+        
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable cache entry for {file_path}: {e}")
+        return None
+
+def store_cached_table(conn, file_path, size, mtime_ns, df):
+    """
+    Store a parsed table in the cache
+    
+    Args:
+        conn (sqlite3.Connection): Open cache connection
+        file_path (Path): Path to the CSV file
+        size (int): File size in bytes when it was parsed
+        mtime_ns (int): Modification time in nanoseconds when it was parsed
+        df (pd.DataFrame): Parsed table
+    """
+    if conn is None:
+        return
+    
+    try:
+        conn.execute(
+            "INSERT OR REPLACE INTO tables (path, size, mtime_ns, data) VALUES (?, ?, ?, ?)",
+            (_cache_key(file_path), size, mtime_ns,
+             sqlite3.Binary(_table_to_bytes(df)))
+        )
+        
+    except Exception as e:
+        logger.warning(f"Could not cache {file_path}: {e}")
@@ -1,24 +1,144 @@
 # Handles finding and managing CSV files
 
-from pathlib import Path
+import os
+import fnmatch
 import logging
+from collections import namedtuple
+from pathlib import Path
+
+from config.settings import DISCOVERY_INCLUDE, DISCOVERY_EXCLUDE, DISCOVERY_MAX_DEPTH
 
 logger = logging.getLogger(__name__)
 
-def get_csv_files(main_folder_path):
+# One discovered file, with the stat fields captured during the walk
+FileEntry = namedtuple('FileEntry', ['path', 'size', 'mtime_ns', 'depth'])
+
+def _matches_parts(parts, pattern_parts):
+    # Match path segments against pattern segments, '**' standing for any number of segments
+    if not pattern_parts:
+        return not parts
+    if pattern_parts[0] == '**':
+        return any(_matches_parts(parts[i:], pattern_parts[1:]) for i in range(len(parts) + 1))
+    return bool(parts) and fnmatch.fnmatch(parts[0], pattern_parts[0]) and _matches_parts(parts[1:], pattern_parts[1:])
+
+def _matches(relative_path, patterns):
     """
-    Recursively find all CSV files in the main folder and its subfolders
+    Check a path relative to the main folder against glob patterns
+    
+    A pattern without '/' is matched against the name alone, in any folder.
+    A pattern with '/' is matched against the whole relative path one
+    folder level at a time, so '*' never crosses a '/' ('a/*.csv' matches
+    a/x.csv but not a/b/x.csv) and '**' stands for any number of folders.
+    
+    Args:
+        relative_path (str): Path relative to the main folder, with '/' separators
+        patterns (list): fnmatch globs
+        
+    Returns:
+        bool: True if any pattern matches
+    """
+    parts = relative_path.split('/')
+    for pattern in patterns:
+        if '/' in pattern:
+            if _matches_parts(parts, pattern.strip('/').split('/')):
+                return True
+        elif fnmatch.fnmatch(parts[-1], pattern):
+            return True
+    return False
+
+def iter_csv_files(main_folder_path, include=None, exclude=None, max_depth=None):
+    """
+    Walk the main folder with os.scandir and yield matching files as they are found
+    
+    Each directory is listed once and the size and mtime are taken from its
+    directory entries while walking (on Windows they come with the listing,
+    elsewhere it is the only stat() of the file), so later stages do not
+    stat the file again. Entries are visited in name order. Patterns are
+    fnmatch globs: without a '/' they match the file or folder name at any
+    depth, with a '/' the path relative to the main folder one folder level
+    at a time ('*' does not cross folders, '**' matches any number of them).
+    A directory matching an exclude pattern is not entered. Symbolic links
+    to directories are not followed.
     
     Args:
         main_folder_path (str): Path to the main folder
+        include (list): Globs a file must match (defaults to DISCOVERY_INCLUDE)
+        exclude (list): Globs of files and directories to skip (defaults to DISCOVERY_EXCLUDE)
+        max_depth (int): Deepest subfolder level to enter, 0 for the main folder only
+                         (defaults to DISCOVERY_MAX_DEPTH, None for no limit)
+    
+    Yields:
+        FileEntry: path, size, mtime_ns and depth of each matching file
+    """
+    include = DISCOVERY_INCLUDE if include is None else include
+    exclude = DISCOVERY_EXCLUDE if exclude is None else exclude
+    max_depth = DISCOVERY_MAX_DEPTH if max_depth is None else max_depth
+    
+    # Depth-first, with the stack reversed so folders come out in name order
+    stack = [(str(main_folder_path), '', 0)]
+    while stack:
+        folder, relative_folder, depth = stack.pop()
+        
+        try:
+            with os.scandir(folder) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError as e:
+            logger.warning(f"Cannot list {folder}: {e}")
+            continue
         
+        subfolders = []
+        for entry in entries:
+            relative_path = f"{relative_folder}{entry.name}"
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if (max_depth is None or depth < max_depth) and not _matches(relative_path, exclude):
+                        subfolders.append((entry.path, f"{relative_path}/", depth + 1))
+                    continue
+                
+                if not entry.is_file() or not _matches(relative_path, include) or _matches(relative_path, exclude):
+                    continue
+                
+                stat_result = entry.stat()
+            except OSError as e:
+                logger.warning(f"Skipping {entry.path}: {e}")
+                continue
+            
+            yield FileEntry(Path(entry.path), stat_result.st_size, stat_result.st_mtime_ns, depth)
+        
+        stack.extend(reversed(subfolders))
+
+def find_csv_files(main_folder_path, include=None, exclude=None, max_depth=None):
+    """
+    Find all matching CSV files with their size and mtime
+    
+    Args:
+        main_folder_path (str): Path to the main folder
+        include (list): Globs a file must match (defaults to DISCOVERY_INCLUDE)
+        exclude (list): Globs of files and directories to skip (defaults to DISCOVERY_EXCLUDE)
+        max_depth (int): Deepest subfolder level to enter (defaults to DISCOVERY_MAX_DEPTH)
+    
     Returns:
-        list: List of Path objects for all CSV files found
+        list: FileEntry records for all CSV files found
     """
     try:
-        csv_files = list(Path(main_folder_path).rglob("*.csv"))
-        logger.info(f"Found {len(csv_files)} CSV files")
-        return csv_files
+        entries = list(iter_csv_files(main_folder_path, include, exclude, max_depth))
+        logger.info(f"Found {len(entries)} CSV files")
+        return entries
     except Exception as e:
         logger.error(f"Error finding CSV files: {e}")
-        return []
\ No newline at end of file
+        return []
+
+def get_csv_files(main_folder_path, include=None, exclude=None, max_depth=None):
+    """
+    Recursively find all CSV files in the main folder and its subfolders
+    
+    Args:
+        main_folder_path (str): Path to the main folder
+        include (list): Globs a file must match (defaults to DISCOVERY_INCLUDE)
+        exclude (list): Globs of files and directories to skip (defaults to DISCOVERY_EXCLUDE)
+        max_depth (int): Deepest subfolder level to enter (defaults to DISCOVERY_MAX_DEPTH)
+    
+    Returns:
+        list: List of Path objects for all CSV files found
+    """
+    return [entry.path for entry in find_csv_files(main_folder_path, include, exclude, max_depth)]
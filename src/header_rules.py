@@ -0,0 +1,88 @@
+# Header detection rules used to locate the data table in logger exports
+
+import re
+import logging
+from collections import namedtuple
+
+from config.settings import HEADER_RULES, TABLE_START_OFFSET
+
+logger = logging.getLogger(__name__)
+
+# A compiled rule set: one combined byte pattern plus (pattern, rule) pairs in priority order
+CompiledHeaderRules = namedtuple('CompiledHeaderRules', ['pattern', 'rules'])
+
+_default_rules = None
+
+def compile_header_rules(rules):
+    """
+    Compile header rules into a single byte-level pattern
+    
+    The signatures of all rules are joined into one alternation, so a line
+    is checked against all vendors with a single regex search. Each rule
+    also gets its own pattern: on a matching line they are tried in order
+    and the first rule that matches wins, wherever its signature is on
+    the line. A rule's offset is the number of rows below the matching
+    line where the table header row is (0 if the matching line is the
+    header row itself).
+    
+    Args:
+        rules (list): List of dicts with 'vendor', 'signatures' and 'offset'
+        
+    Returns:
+        CompiledHeaderRules: Combined pattern and the compiled rules in order
+    """
+    alternatives = []
+    compiled = []
+    
+    for i, rule in enumerate(rules):
+        if not rule.get('signatures'):
+            logger.warning(f"Header rule '{rule.get('vendor', i)}' has no signatures, skipping")
+            continue
+        
+        offset = rule.get('offset', TABLE_START_OFFSET)
+        if not isinstance(offset, int) or offset < 0:
+            raise ValueError(f"Header rule '{rule.get('vendor', i)}' has offset {offset!r}, expected a whole number >= 0")
+        
+        signatures = b'|'.join(re.escape(sig.encode('utf-8')) for sig in rule['signatures'])
+        alternative = b'\\b(?:' + signatures + b')\\b'
+        alternatives.append(alternative)
+        compiled.append((re.compile(alternative, re.IGNORECASE), rule))
+    
+    if not alternatives:
+        raise ValueError("No usable header rules configured")
+    
+    pattern = re.compile(b'|'.join(alternatives), re.IGNORECASE)
+    return CompiledHeaderRules(pattern, compiled)
+
+def get_default_header_rules():
+    """
+    Get the compiled HEADER_RULES from the settings (compiled once per process)
+    
+    Returns:
+        CompiledHeaderRules: Compiled default rules
+    """
+    global _default_rules
+    if _default_rules is None:
+        _default_rules = compile_header_rules(HEADER_RULES)
+    return _default_rules
+
+def match_header_rule(compiled_rules, line):
+    """
+    Check a raw line against the compiled rules
+    
+    The combined pattern rules out non-matching lines with one search; on a
+    match the earliest configured rule that matches the line is returned.
+    
+    Args:
+        compiled_rules (CompiledHeaderRules): Compiled rule set
+        line (bytes): Raw line from the file
+        
+    Returns:
+        dict: The matching rule, or None if the line matches no rule
+    """
+    if compiled_rules.pattern.search(line) is None:
+        return None
+    for pattern, rule in compiled_rules.rules:
+        if pattern.search(line):
+            return rule
+    return None
@@ -0,0 +1,298 @@
+# Incremental updates of the outputs as new logger files arrive
+
+import os
+import json
+import time
+import logging
+
+import pandas as pd
+
+from config.settings import (
+    MANIFEST_FILENAME, WATCH_INTERVAL_SECONDS, WATCH_SETTLE_SECONDS,
+    DEFAULT_OUTPUT_FORMAT, COMBINE_MODE, EXTRACTION_EXECUTOR, EXTRACTION_MAX_WORKERS
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the layout of the manifest changes
+MANIFEST_VERSION = 1
+
+def get_manifest_path(output_folder):
+    """
+    Get the manifest file path for an output folder
+    
+    Args:
+        output_folder (str): Path to the output folder
+    
+    Returns:
+        str: Path to the manifest file
+    """
+    return os.path.join(output_folder, MANIFEST_FILENAME)
+
+def load_manifest(manifest_path):
+    """
+    Load the manifest of files already in the outputs
+    
+    Args:
+        manifest_path (str): Path to the manifest file
+    
+    Returns:
+        dict: The manifest, or None if it is missing, unreadable or from another version
+    """
+    if not os.path.exists(manifest_path):
+        return None
+    
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable manifest {manifest_path}: {e}")
+        return None
+    
+    if manifest.get('version') != MANIFEST_VERSION:
+        logger.info("Manifest was written by another version, rebuilding the outputs")
+        return None
+    return manifest
+
+def save_manifest(manifest_path, manifest):
+    """
+    Write the manifest atomically, so an interrupted run never leaves half a file
+    
+    Args:
+        manifest_path (str): Path to the manifest file
+        manifest (dict): Manifest to write
+    """
+    temp_path = f"{manifest_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temp_path, manifest_path)
+
+def _settled_files(entries, settle_seconds):
+    """
+    Select the discovered files that are no longer being written
+    
+    Files modified within the last settle_seconds may still be copying in
+    and are left for the next pass.
+    
+    Args:
+        entries (list): FileEntry records from file discovery
+        settle_seconds (float): Minimum age of a file's last modification
+    
+    Returns:
+        dict: {path string: FileEntry} of the settled files
+    """
+    cutoff = time.time_ns() - int(settle_seconds * 1e9)
+    settled = {}
+    for entry in entries:
+        if entry.mtime_ns > cutoff:
+            logger.info(f"Skipping {entry.path.name} until it has not changed for {settle_seconds}s")
+            continue
+        settled[str(entry.path)] = entry
+    return settled
+
+def _load_existing_outputs(output_folder, output_format, combine_mode, stale_columns):
+    """
+    Load the current Raw output without the columns of changed or removed files
+    
+    Args:
+        output_folder (str): Path to the output folder
+        output_format (str): Format the outputs were written in
+        combine_mode (str): 'position' or 'timestamp'
+        stale_columns (list): Columns to drop
+    
+    Returns:
+        pandas.DataFrame: Existing table ready to combine with the new tables, or None if missing
+    """
+    from src.data_exporter import get_output_path, read_exported_data
+    
+    raw_path = get_output_path(output_folder, 'Raw', output_format)
+    if not os.path.exists(raw_path):
+        return None
+    
+    existing = read_exported_data(raw_path)
+    stale_columns = [col for col in stale_columns if col in existing.columns]
+    existing = existing.drop(columns=stale_columns)
+    
+    if combine_mode == 'timestamp':
+        # The shared Timestamp column leads, as combine_dataframes_by_timestamp expects
+        existing['Timestamp'] = pd.to_datetime(existing['Timestamp'])
+        if stale_columns:
+            # Drop timestamps only the dropped files had readings for
+            existing = existing[existing.iloc[:, 1:].notna().any(axis=1)]
+        return existing
+    
+    # Trim rows only a removed file reached
+    last_row = existing.last_valid_index()
+    return existing.iloc[:0] if last_row is None else existing.loc[:last_row]
+
+def update_outputs(main_folder_path, output_folder, output_format=None, executor=None, max_workers=None,
+                   cache_path=None, combine_mode=None, tolerance=None, settle_seconds=None,
+                   include=None, exclude=None, max_depth=None, aggregate_intervals=None, aggregate_levels=None,
+                   report=None, aggregate_folder_level=None):
+    """
+    Bring the outputs up to date with the CSV files in the main folder
+    
+    A manifest in the output folder records the size, mtime and output
+    columns of every file already exported. Only new and changed files are
+    parsed; their columns are appended to the existing Raw table (the columns
+    of changed and removed files are dropped first), and the Raw, Temp and
+    RH outputs are rewritten from it. Without a matching manifest everything
+    is rebuilt.
+    
+    Args:
+        main_folder_path (str): Path to the main folder
+        output_folder (str): Path to the output folder
+        output_format (str): One of SUPPORTED_OUTPUT_FORMATS (defaults to DEFAULT_OUTPUT_FORMAT)
+        executor (str): 'serial', 'thread' or 'process' (defaults to EXTRACTION_EXECUTOR)
+        max_workers (int): Maximum number of workers (defaults to EXTRACTION_MAX_WORKERS)
+        cache_path (str): Path to the extraction cache, or None to parse every file
+        combine_mode (str): 'position' or 'timestamp' (defaults to COMBINE_MODE)
+        tolerance (str): Timestamp tolerance for 'timestamp' mode
+        settle_seconds (float): Skip files modified more recently than this (defaults to WATCH_SETTLE_SECONDS)
+        include (list): Globs of files to process (defaults to DISCOVERY_INCLUDE)
+        exclude (list): Globs of files and folders to skip (defaults to DISCOVERY_EXCLUDE)
+        max_depth (int): Deepest subfolder level to search (defaults to DISCOVERY_MAX_DEPTH)
+        aggregate_intervals (list): Also export aggregated tables for these intervals, or None
+        aggregate_levels (list): 'logger' and/or 'folder' (defaults to AGGREGATION_LEVELS)
+        report (RunReport): Records the extract, combine and export stages and every parsed file, or None
+        aggregate_folder_level (int): Subfolder level to group by at the 'folder' aggregation level
+                                      (defaults to AGGREGATION_FOLDER_LEVEL)
+    
+    Returns:
+        bool: True if the outputs are up to date, False otherwise
+    """
+    from src.file_finder import find_csv_files
+    from src.csv_processor import label_table
+    from src.data_exporter import export_data
+    from src.utils import _iter_tables, combine_dataframes
+    from src.instrumentation import measure
+    
+    output_format = output_format or DEFAULT_OUTPUT_FORMAT
+    combine_mode = combine_mode or COMBINE_MODE
+    executor = executor or EXTRACTION_EXECUTOR
+    max_workers = max_workers or EXTRACTION_MAX_WORKERS
+    settle_seconds = WATCH_SETTLE_SECONDS if settle_seconds is None else settle_seconds
+    
+    try:
+        manifest_path = get_manifest_path(output_folder)
+        manifest = load_manifest(manifest_path)
+        if manifest is not None and (manifest.get('output_format') != output_format
+                                     or manifest.get('combine_mode') != combine_mode
+                                     or manifest.get('tolerance') != tolerance):
+            logger.info("Output settings changed since the last run, rebuilding the outputs")
+            manifest = None
+        
+        known = manifest['files'] if manifest else {}
+        entries = find_csv_files(main_folder_path, include, exclude, max_depth)
+        settled = _settled_files(entries, settle_seconds)
+        
+        changed = [path for path, entry in settled.items()
+                   if path not in known or (known[path]['size'], known[path]['mtime_ns']) != (entry.size, entry.mtime_ns)]
+        discovered = {str(entry.path) for entry in entries}
+        removed = [path for path in known if path not in discovered]
+        
+        if manifest is not None and not changed and not removed:
+            logger.info("Outputs are up to date")
+            return True
+        
+        logger.info(f"{len(changed)} new or changed files, {len(removed)} removed files")
+        
+        existing = None
+        files = {}
+        if manifest is not None:
+            stale_columns = [col for path in changed + removed if path in known for col in known[path]['columns']]
+            existing = _load_existing_outputs(output_folder, output_format, combine_mode, stale_columns)
+            if existing is None:
+                logger.info("Existing outputs not found, rebuilding the outputs")
+                changed = list(settled)
+            else:
+                files = {path: info for path, info in known.items() if path not in changed and path not in removed}
+        
+        # Parse only the new and changed files, in discovery order
+        new_entries = [settled[path] for path in changed]
+        new_tables = [None] * len(new_entries)
+        with measure(report, 'extract') as stage:
+            for i, metadata, table in _iter_tables(new_entries, main_folder_path, executor, max_workers,
+                                                   cache_path=cache_path, report=report):
+                labelled = label_table(table, metadata)
+                new_tables[i] = labelled
+                entry = new_entries[i]
+                files[str(entry.path)] = {
+                    'size': entry.size,
+                    'mtime_ns': entry.mtime_ns,
+                    'columns': list(map(str, labelled.columns))
+                }
+            stage['files'] = len(new_entries)
+            stage['bytes'] = sum(entry.size for entry in new_entries)
+            stage['rows'] = sum(len(table) for table in new_tables)
+        
+        tables = [table for table in new_tables if not table.empty]
+        if existing is not None and len(existing.columns):
+            tables.insert(0, existing)
+        
+        with measure(report, 'combine') as stage:
+            combined_df = combine_dataframes(tables, combine_mode, tolerance)
+            stage['rows'] = len(combined_df)
+            stage['columns'] = len(combined_df.columns)
+        if not export_data(combined_df, output_folder, output_format, report):
+            return False
+        
+        if aggregate_intervals:
+            from src.aggregation import export_aggregates
+            from src.metadata_extractor import FileCatalog, extract_metadata_from_path
+            
+            # Every file in the outputs was found by this pass's discovery, so the tree is not walked again
+            catalog = FileCatalog(main_folder_path)
+            for entry in entries:
+                catalog.add(extract_metadata_from_path(entry.path, main_folder_path, entry))
+            if not export_aggregates(combined_df, output_folder, output_format, aggregate_intervals,
+                                     aggregate_levels, catalog, report, aggregate_folder_level):
+                return False
+        
+        save_manifest(manifest_path, {
+            'version': MANIFEST_VERSION,
+            'output_format': output_format,
+            'combine_mode': combine_mode,
+            'tolerance': tolerance,
+            'files': files
+        })
+        logger.info(f"Outputs updated with {len(new_entries)} new or changed files")
+        return True
+    
+    except Exception as e:
+        logger.error(f"Error updating outputs in {output_folder}: {e}")
+        return False
+
+def watch_folder(main_folder_path, output_folder, interval=None, stop_event=None, max_passes=None, **options):
+    """
+    Poll the main folder and update the outputs whenever files are added or changed
+    
+    Args:
+        main_folder_path (str): Path to the main folder
+        output_folder (str): Path to the output folder
+        interval (float): Seconds between passes (defaults to WATCH_INTERVAL_SECONDS)
+        stop_event (threading.Event): Stops the loop when set
+        max_passes (int): Stop after this many passes, or None to run until stopped
+        **options: Passed on to update_outputs
+    
+    Returns:
+        bool: True if the last pass succeeded, False otherwise
+    """
+    interval = interval or WATCH_INTERVAL_SECONDS
+    logger.info(f"Watching {main_folder_path} every {interval}s")
+    
+    passes = 0
+    success = False
+    while True:
+        success = update_outputs(main_folder_path, output_folder, **options)
+        passes += 1
+        
+        if max_passes is not None and passes >= max_passes:
+            break
+        if stop_event is not None:
+            if stop_event.wait(interval):
+                break
+        else:
+            time.sleep(interval)
+    
+    return success
@@ -0,0 +1,287 @@
+# Per-stage and per-file timing, run reports and optional profiling
+
+import os
+import json
+import time
+import pstats
+import logging
+import cProfile
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+from config.settings import RUN_REPORT_FILENAME, RUN_PROFILE_FILENAME, PROFILE_TOP_ENTRIES
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+def _cpu_seconds():
+    # User + system time of this process and of its finished worker processes
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+def _peak_rss_bytes():
+    """
+    Get the peak resident memory of this process so far (its high-water mark, which never goes down)
+    
+    Returns:
+        int: Peak RSS in bytes, or None where the resource module is unavailable
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if os.uname().sysname == 'Darwin' else peak * 1024
+
+def _short_path(path):
+    # Parent folder and file name, enough to tell loggers with the same file name apart
+    return os.path.join(os.path.basename(os.path.dirname(path)), os.path.basename(path))
+
+def _format_bytes(size):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+def _tracing_peaks():
+    # reset_peak is only available from Python 3.9
+    return tracemalloc.is_tracing() and hasattr(tracemalloc, 'reset_peak')
+
+class RunReport:
+    """
+    Measurements of one extraction run
+    
+    Stages (extract, combine, export, ...) record wall time, CPU time, the
+    process's peak RSS so far and how much the stage raised it, and whatever
+    counts the stage adds (bytes, rows, files); every file records where its
+    table came from, its size on disk, rows and the wall and CPU time spent
+    parsing it. With profile=True the run is also captured with cProfile
+    (main thread only; thread and process workers are not profiled) and
+    tracemalloc, which adds noticeable overhead. tracemalloc then also gives
+    the peak traced memory of every stage and of every file read on the
+    main thread (serial executor and chunked reads).
+    """
+    
+    def __init__(self, profile=False):
+        self.profile = profile
+        self.started = datetime.now()
+        self.stages = []
+        self.files = []
+        self._clock = time.perf_counter()
+        self._profiler = None
+        self._traced_peak = 0
+        
+        if profile:
+            tracemalloc.start()
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+    
+    @contextmanager
+    def stage(self, name):
+        """
+        Measure a stage of the run
+        
+        Args:
+            name (str): Stage name
+        
+        Yields:
+            dict: The stage record, for the caller to add counts such as bytes and rows
+        """
+        record = {'stage': name}
+        if _tracing_peaks():
+            self._traced_peak = 0
+            tracemalloc.reset_peak()
+        rss = _peak_rss_bytes()
+        wall = time.perf_counter()
+        cpu = _cpu_seconds()
+        try:
+            yield record
+        finally:
+            record['wall_seconds'] = round(time.perf_counter() - wall, 6)
+            record['cpu_seconds'] = round(_cpu_seconds() - cpu, 6)
+            record['max_rss_so_far_bytes'] = _peak_rss_bytes()
+            record['max_rss_increase_bytes'] = None if rss is None else record['max_rss_so_far_bytes'] - rss
+            if _tracing_peaks():
+                record['peak_traced_bytes'] = max(self._traced_peak, tracemalloc.get_traced_memory()[1])
+            self.stages.append(record)
+            logger.info(f"Stage {name}: {record['wall_seconds']:.2f}s wall, {record['cpu_seconds']:.2f}s CPU")
+    
+    @contextmanager
+    def file_memory(self):
+        """
+        Measure the peak traced memory of reading a file on this thread
+        
+        Only measured while profiling; without tracemalloc the record stays
+        empty. The peak is counted from the memory traced when the block
+        starts, and the enclosing stage keeps its own peak.
+        
+        Yields:
+            dict: Gets 'peak_traced_bytes' when the block ends
+        """
+        record = {}
+        if not _tracing_peaks():
+            yield record
+            return
+        
+        # Resetting the peak for the file must not lose the stage's peak so far
+        self._traced_peak = max(self._traced_peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        try:
+            yield record
+        finally:
+            record['peak_traced_bytes'] = max(tracemalloc.get_traced_memory()[1] - start, 0)
+    
+    def record_file(self, path, source, size, rows, wall_seconds=None, cpu_seconds=None, peak_traced_bytes=None):
+        """
+        Record the extraction of one file
+        
+        Args:
+            path (str): Path to the CSV file
+            source (str): 'parsed', 'chunked', 'cached' or 'failed'
+            size (int): File size on disk in bytes
+            rows (int): Rows in the extracted table
+            wall_seconds (float): Time spent reading the table
+            cpu_seconds (float): CPU time spent reading the table (on the thread that read it)
+            peak_traced_bytes (int): Peak traced memory while reading the table (see file_memory)
+        """
+        self.files.append({
+            'path': str(path),
+            'source': source,
+            'file_bytes': size,
+            'rows': rows,
+            'wall_seconds': None if wall_seconds is None else round(wall_seconds, 6),
+            'cpu_seconds': None if cpu_seconds is None else round(cpu_seconds, 6),
+            'peak_traced_bytes': peak_traced_bytes
+        })
+    
+    def summary(self):
+        """
+        Summarise the run in one line, for status bars and logs
+        
+        Returns:
+            str: Stage times, file and row counts and peak memory
+        """
+        parts = []
+        for record in self.stages:
+            text = f"{record['stage']} {record['wall_seconds']:.2f}s"
+            counts = []
+            if record.get('files') is not None:
+                counts.append(f"{record['files']} files")
+            if record.get('bytes') is not None:
+                counts.append(_format_bytes(record['bytes']))
+            if record.get('rows') is not None:
+                counts.append(f"{record['rows']} rows")
+            if counts:
+                text += f" ({', '.join(counts)})"
+            parts.append(text)
+        
+        peaks = [record['max_rss_so_far_bytes'] for record in self.stages if record.get('max_rss_so_far_bytes')]
+        if peaks:
+            parts.append(f"peak memory {_format_bytes(max(peaks))}")
+        return "; ".join(parts) or "no stages run"
+    
+    def _stop_profiling(self, output_folder):
+        """
+        Stop cProfile and tracemalloc and summarise what they captured
+        
+        Args:
+            output_folder (str): Folder to write the full cProfile stats to
+        
+        Returns:
+            dict: Top functions by cumulative time and top allocation sites
+        """
+        self._profiler.disable()
+        profile_path = os.path.join(output_folder, RUN_PROFILE_FILENAME)
+        self._profiler.dump_stats(profile_path)
+        
+        stats = pstats.Stats(self._profiler)
+        entries = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+        functions = [
+            {
+                'function': f"{filename}:{line}({name})",
+                'calls': calls,
+                'total_seconds': round(total, 6),
+                'cumulative_seconds': round(cumulative, 6)
+            }
+            for (filename, line, name), (_, calls, total, cumulative, _) in entries[:PROFILE_TOP_ENTRIES]
+        ]
+        
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        allocations = [
+            {'location': str(stat.traceback), 'bytes': stat.size, 'count': stat.count}
+            for stat in snapshot.statistics('lineno')[:PROFILE_TOP_ENTRIES]
+        ]
+        
+        logger.info(f"Profile written to {profile_path}")
+        return {'stats_file': profile_path, 'functions': functions, 'allocations': allocations}
+    
+    def finish(self, output_folder):
+        """
+        Finish the run and write the report (and profile) next to the outputs
+        
+        Args:
+            output_folder (str): Path to the output folder
+        
+        Returns:
+            str: Path to the report, or None if it could not be written
+        """
+        report = {
+            'started': self.started.isoformat(timespec='seconds'),
+            'finished': datetime.now().isoformat(timespec='seconds'),
+            'wall_seconds': round(time.perf_counter() - self._clock, 6),
+            'stages': self.stages,
+            'files': self.files
+        }
+        
+        try:
+            os.makedirs(output_folder, exist_ok=True)
+            if self._profiler is not None:
+                report['profile'] = self._stop_profiling(output_folder)
+                self._profiler = None
+            
+            report_path = os.path.join(output_folder, RUN_REPORT_FILENAME)
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            
+            slowest = sorted((f for f in self.files if f['wall_seconds'] is not None),
+                             key=lambda f: f['wall_seconds'], reverse=True)[:3]
+            if slowest:
+                logger.info("Slowest files: " + ", ".join(
+                    f"{_short_path(f['path'])} {f['wall_seconds']:.3f}s" for f in slowest))
+            logger.info(f"Run report written to {report_path}: {self.summary()}")
+            return report_path
+        
+        except Exception as e:
+            logger.error(f"Error writing run report to {output_folder}: {e}")
+            return None
+
+def measure(report, name):
+    """
+    Measure a stage if a report is being recorded
+    
+    Args:
+        report (RunReport): Report of the run, or None
+        name (str): Stage name
+    
+    Returns:
+        Context manager yielding the stage record (a throwaway dict without a report)
+    """
+    return report.stage(name) if report is not None else nullcontext({})
+
+def measure_file_memory(report):
+    """
+    Measure the peak traced memory of reading a file if a report is being recorded
+    
+    Args:
+        report (RunReport): Report of the run, or None
+    
+    Returns:
+        Context manager yielding a dict that gets 'peak_traced_bytes' while profiling
+    """
+    return report.file_memory() if report is not None else nullcontext({})
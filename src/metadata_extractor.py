@@ -1,43 +1,168 @@
 # Handles metadata extraction from file paths
 
-from pathlib import Path
+import sys
+import csv
+import json
 import logging
+from collections import namedtuple
+from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
-def extract_metadata_from_path(file_path, main_folder_path):
+class FileRecord(namedtuple('FileRecord', ['path', 'folders', 'size', 'mtime_ns'])):
+    """
+    Metadata of one CSV file
+    
+    A tuple with no per-instance dict: the path, the subfolder names between
+    the main folder and the file, and the stat fields. Folder names are
+    interned, so a folder shared by thousands of files is stored once.
+    """
+    __slots__ = ()
+    
+    @property
+    def filename(self):
+        """File name without extension"""
+        return Path(self.path).stem
+    
+    @property
+    def parent_folder(self):
+        """Name of the folder containing the file"""
+        return Path(self.path).parent.name
+    
+    def to_dict(self):
+        """
+        Flatten the record for a manifest
+        
+        Returns:
+            dict: full_path, filename, parent_folder, file_size, modified_time and subfolder_N fields
+        """
+        fields = {
+            'full_path': self.path,
+            'filename': self.filename,
+            'parent_folder': self.parent_folder,
+            'file_size': self.size,
+            'modified_time': self.mtime_ns
+        }
+        for i, folder in enumerate(self.folders):
+            fields[f'subfolder_{i+1}'] = folder
+        return fields
+
+def extract_metadata_from_path(file_path, main_folder_path, entry=None):
     """
     Extract metadata from the file path and subfolder structure
     
     Args:
         file_path (Path): Path object for the CSV file
         main_folder_path (str): Path to the main folder
-        
+        entry (FileEntry): Discovery record with the size and mtime, to avoid another stat()
+    
     Returns:
-        dict: Dictionary containing metadata extracted from the path
+        FileRecord: Metadata of the file, or None if it could not be read
     """
     try:
         # Extract subfolder names (excluding filename and main folder)
         relative_path = file_path.relative_to(main_folder_path)
-        subfolders = list(relative_path.parent.parts)
+        folders = tuple(sys.intern(folder) for folder in relative_path.parent.parts)
         
-        # Extract filename without extension
-        filename = file_path.stem
+        if entry is None:
+            stat_result = file_path.stat()
+            size, mtime_ns = stat_result.st_size, stat_result.st_mtime_ns
+        else:
+            size, mtime_ns = entry.size, entry.mtime_ns
         
-        metadata = {
-            'full_path': str(file_path),
-            'filename': filename,
-            'subfolders': subfolders,
-            'parent_folder': str(file_path.parent.name),
-            'file_size': file_path.stat().st_size
-        }
+        return FileRecord(str(file_path), folders, size, mtime_ns)
+    
+    except Exception as e:
+        logger.error(f"Error extracting metadata from {file_path}: {e}")
+        return None
+
+class FileCatalog:
+    """
+    Metadata records of all files under a main folder
+    
+    Can be exported as a manifest (CSV or JSON) and grouped by subfolder.
+    """
+    __slots__ = ('main_folder_path', 'records')
+    
+    def __init__(self, main_folder_path, records=None):
+        self.main_folder_path = str(main_folder_path)
+        self.records = list(records or [])
+    
+    @classmethod
+    def from_folder(cls, main_folder_path, include=None, exclude=None, max_depth=None):
+        """
+        Build the catalog of the CSV files found under a main folder
         
-        # Add dynamic fields based on subfolder structure
-        for i, folder in enumerate(subfolders):
-            metadata[f'subfolder_{i+1}'] = folder
+        Args:
+            main_folder_path (str): Path to the main folder
+            include (list): Globs of files to include (defaults to DISCOVERY_INCLUDE)
+            exclude (list): Globs of files and folders to skip (defaults to DISCOVERY_EXCLUDE)
+            max_depth (int): Deepest subfolder level to search (defaults to DISCOVERY_MAX_DEPTH)
         
-        return metadata
+        Returns:
+            FileCatalog: Catalog of the discovered files
+        """
+        from src.file_finder import iter_csv_files
         
-    except Exception as e:
-        logger.error(f"Error extracting metadata from {file_path}: {e}")
-        return {}
\ No newline at end of file
+        catalog = cls(main_folder_path)
+        for entry in iter_csv_files(main_folder_path, include, exclude, max_depth):
+            catalog.add(extract_metadata_from_path(entry.path, main_folder_path, entry))
+        return catalog
+    
+    def add(self, record):
+        if record is not None:
+            self.records.append(record)
+    
+    def __len__(self):
+        return len(self.records)
+    
+    def __iter__(self):
+        return iter(self.records)
+    
+    def group_by_subfolder(self, level=1):
+        """
+        Group the records by their subfolder at a given level
+        
+        Args:
+            level (int): 1 for the first subfolder below the main folder, 2 for the next, ...
+        
+        Returns:
+            dict: {subfolder name: [FileRecord, ...]}; files not that deep are grouped under ''
+        """
+        groups = {}
+        for record in self.records:
+            key = record.folders[level - 1] if len(record.folders) >= level else ''
+            groups.setdefault(key, []).append(record)
+        return groups
+    
+    def export_manifest(self, output_path):
+        """
+        Write the catalog as a manifest, CSV or JSON depending on the file extension
+        
+        Args:
+            output_path (str): Destination .csv or .json file
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            rows = [record.to_dict() for record in self.records]
+            
+            if str(output_path).lower().endswith('.json'):
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    json.dump({'main_folder': self.main_folder_path, 'files': rows}, f, indent=2)
+            else:
+                depth = max((len(record.folders) for record in self.records), default=0)
+                fieldnames = ['full_path', 'filename', 'parent_folder', 'file_size', 'modified_time']
+                fieldnames += [f'subfolder_{i+1}' for i in range(depth)]
+                with open(output_path, 'w', newline='', encoding='utf-8') as f:
+                    writer = csv.DictWriter(f, fieldnames=fieldnames)
+                    writer.writeheader()
+                    writer.writerows(rows)
+            
+            logger.info(f"Catalog of {len(self.records)} files exported to {output_path}")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error exporting catalog to {output_path}: {e}")
+            return False
@@ -0,0 +1,77 @@
+# Vectorized Date+Time parsing into native datetime64 timestamps
+
+import pandas as pd
+import logging
+
+from config.settings import TIMESTAMP_FORMATS, TIMESTAMP_DAYFIRST, TIMESTAMP_SAMPLE_ROWS
+
+logger = logging.getLogger(__name__)
+
+# Format that last worked for each source (e.g. a logger folder), per process
+_format_cache = {}
+
+def _parse_with_format(text, fmt):
+    return pd.to_datetime(text, format=fmt, errors='coerce')
+
+def _parses_fully(text, fmt):
+    parsed = _parse_with_format(text, fmt)
+    return parsed.notna().sum() == text.notna().sum()
+
+def detect_timestamp_format(text):
+    """
+    Pick the first TIMESTAMP_FORMATS layout that parses a sample of the column
+    
+    Args:
+        text (pd.Series): Combined "date time" strings
+        
+    Returns:
+        str: The matching strftime format, or None if none fits
+    """
+    sample = text.dropna().head(TIMESTAMP_SAMPLE_ROWS)
+    if sample.empty:
+        return None
+    
+    for fmt in TIMESTAMP_FORMATS:
+        if _parses_fully(sample, fmt):
+            return fmt
+    return None
+
+def parse_timestamps(date, time, source=None):
+    """
+    Combine Date and Time columns into one datetime64[ns] column
+    
+    The whole column is parsed in one vectorized call with an explicit
+    format. The format is detected once on a sample and remembered per
+    source, so files from the same logger reuse it without detection.
+    When no configured layout fits, pandas' own inference is used as a
+    last resort.
+    
+    Args:
+        date (pd.Series): Date strings
+        time (pd.Series): Time strings
+        source (str): Key to remember the detected format under (e.g. the parent folder)
+        
+    Returns:
+        pandas.Series: datetime64[ns] timestamps (NaT where a row could not be parsed)
+    """
+    text = date.str.strip() + ' ' + time.str.strip()
+    
+    fmt = _format_cache.get(source)
+    if fmt is None or not _parses_fully(text.dropna().head(TIMESTAMP_SAMPLE_ROWS), fmt):
+        fmt = detect_timestamp_format(text)
+    
+    if fmt is None:
+        # Nothing to warn about for an empty table
+        if text.notna().any():
+            example = text.dropna().iloc[0]
+            logger.warning(f"No configured timestamp format matches values like '{example}', inferring the format")
+        timestamps = pd.to_datetime(text, errors='coerce', dayfirst=TIMESTAMP_DAYFIRST)
+    else:
+        _format_cache[source] = fmt
+        timestamps = _parse_with_format(text, fmt)
+    
+    unparsed = int(timestamps.isna().sum() - text.isna().sum())
+    if unparsed > 0:
+        logger.warning(f"{unparsed} timestamps could not be parsed and are left empty")
+    
+    return timestamps.astype('datetime64[ns]')
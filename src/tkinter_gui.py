@@ -7,6 +7,8 @@ from pathlib import Path
 import threading
 import queue
 
+from config.settings import SUPPORTED_OUTPUT_FORMATS, DEFAULT_OUTPUT_FORMAT, AGGREGATION_ENABLED
+
 class CSVExtractorGUI:
     def __init__(self, root):
         self.root = root
@@ -24,6 +26,10 @@ class CSVExtractorGUI:
         # Variables
         self.main_folder = tk.StringVar()
         self.output_folder = tk.StringVar()
+        self.low_memory = tk.BooleanVar(value=False)
+        self.profile_run = tk.BooleanVar(value=False)
+        self.export_aggregates = tk.BooleanVar(value=AGGREGATION_ENABLED)
+        self.output_format = tk.StringVar(value=DEFAULT_OUTPUT_FORMAT)
         
         # Progress tracking
         self.progress = tk.DoubleVar()
@@ -59,7 +65,7 @@ class CSVExtractorGUI:
         ttk.Button(main_frame, text="Browse", command=self.browse_output_folder).grid(row=3, column=2, padx=5, pady=5)
         
         # Info about output files
-        info_text = "Output files will be created:\n- Raw.csv (all data)\n- Temp.csv (temperature only)\n- RH.csv (humidity only)"
+        info_text = "Output files will be created:\n- Raw (all data)\n- Temp (temperature only)\n- RH (humidity only)"
         ttk.Label(main_frame, text=info_text).grid(row=4, column=0, columnspan=3, sticky=tk.W, pady=5)
         
         # Separator
@@ -76,6 +82,15 @@ class CSVExtractorGUI:
                   style='Blue.TButton').pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Exit", command=self.root.quit,
                   style='Red.TButton').pack(side=tk.LEFT, padx=5)
+        ttk.Label(button_frame, text="Format:").pack(side=tk.LEFT, padx=(5, 2))
+        ttk.Combobox(button_frame, textvariable=self.output_format, values=SUPPORTED_OUTPUT_FORMATS,
+                     state='readonly', width=8).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(button_frame, text="Low memory mode",
+                        variable=self.low_memory).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(button_frame, text="Profile run",
+                        variable=self.profile_run).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(button_frame, text="Aggregates",
+                        variable=self.export_aggregates).pack(side=tk.LEFT, padx=5)
         
         # Separator
         separator3 = ttk.Separator(main_frame, orient='horizontal')
@@ -153,25 +168,50 @@ class CSVExtractorGUI:
             output_folder = self.output_folder.get()
             
             # Import here to avoid circular imports
-            from src.utils import process_all_files_with_progress
+            from src.utils import process_all_files_with_progress, process_all_files_streaming
             from src.data_exporter import export_data
+            from src.extraction_cache import get_cache_path
+            from src.instrumentation import RunReport
+            from src.metadata_extractor import FileCatalog
             
             # Process files with progress updates
             def progress_callback(current, total, message):
                 progress_percent = (current / total) * 100 if total > 0 else 0
                 self.queue.put(('progress', progress_percent, message))
             
-            raw_df, temp_df, rh_df = process_all_files_with_progress(
-                main_folder, 
-                progress_callback=progress_callback
-            )
-            
-            # Export data
-            success = export_data(raw_df, temp_df, rh_df, output_folder)
+            report = RunReport(profile=self.profile_run.get())
+            if self.low_memory.get():
+                # Process and export in chunks
+                success = process_all_files_streaming(
+                    main_folder,
+                    output_folder,
+                    progress_callback=progress_callback,
+                    cache_path=get_cache_path(output_folder),
+                    report=report
+                )
+            else:
+                catalog = FileCatalog(main_folder)
+                combined_df = process_all_files_with_progress(
+                    main_folder, 
+                    progress_callback=progress_callback,
+                    cache_path=get_cache_path(output_folder),
+                    report=report,
+                    catalog=catalog
+                )
+                
+                # Export data
+                success = export_data(combined_df, output_folder, self.output_format.get(), report)
+                
+                if success and self.export_aggregates.get():
+                    from src.aggregation import export_aggregates
+                    success = export_aggregates(combined_df, output_folder, self.output_format.get(),
+                                                records=catalog, report=report)
+            report.finish(output_folder)
             if success:
                 self.queue.put(('success', f'Data extraction completed successfully!\nOutput saved to {output_folder}'))
             else:
                 self.queue.put(('error', 'Failed to export some data'))
+            self.queue.put(('report', report.summary()))
                 
         except Exception as e:
             self.queue.put(('error', f'An error occurred: {str(e)}'))
@@ -206,6 +246,10 @@ class CSVExtractorGUI:
                     messagebox.showwarning("Warning", message)
                     self.progress_label.set("Extraction completed with warnings")
                     self.set_buttons_state(tk.NORMAL)
+                
+                elif message_type == 'report':
+                    self.output_text.insert(tk.END, f"Run report: {args[0]}\n")
+                    self.output_text.see(tk.END)
                     
         except queue.Empty:
             pass
@@ -230,6 +274,10 @@ class CSVExtractorGUI:
         if not output_folder:
             messagebox.showerror("Error", "Please select an output folder")
             return False
+        
+        if self.low_memory.get() and self.output_format.get() != 'csv':
+            messagebox.showerror("Error", "Low memory mode only writes CSV files")
+            return False
             
         return True
 
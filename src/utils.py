@@ -1,9 +1,22 @@
 # Utility functions
 
 import pandas as pd
+import numpy as np
 import logging
+import os
+import queue
+import threading
+import time
+from functools import reduce
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
 
+from config.settings import (
+    EXTRACTION_EXECUTOR, EXTRACTION_MAX_WORKERS, SUPPORTED_EXECUTORS,
+    COMBINE_MODE, COMBINE_TOLERANCE, SUPPORTED_COMBINE_MODES,
+    PIPELINE_QUEUE_SIZE, PIPELINE_MAX_IN_FLIGHT, CHUNKED_READ_MIN_BYTES, READ_CHUNK_ROWS
+)
+
 logger = logging.getLogger(__name__)
 
 def process_single_file(file_path, main_folder_path):
@@ -15,7 +28,7 @@ def process_single_file(file_path, main_folder_path):
         main_folder_path (str): Path to the main folder
         
     Returns:
-        tuple: (raw_df, temp_df, rh_df) - Three DataFrames with different data
+        pandas.DataFrame: Table with hierarchical Timestamp, Temp and RH columns
     """
     from src.metadata_extractor import extract_metadata_from_path
     from src.csv_processor import read_csv_file
@@ -23,104 +36,511 @@ def process_single_file(file_path, main_folder_path):
     metadata = extract_metadata_from_path(file_path, main_folder_path)
     if metadata:
         return read_csv_file(file_path, metadata)
-    return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+    return pd.DataFrame()
 
-def process_all_files(main_folder_path):
+def _read_table_timed(csv_file):
     """
-    Process all CSV files in the main folder and subfolders
+    Read a file's table, timing it on the thread that reads it
     
     Args:
-        main_folder_path (str): Path to the main folder
+        csv_file (Path): Path to the CSV file
         
     Returns:
-        tuple: (raw_df, temp_df, rh_df) - Three combined DataFrames
+        tuple: (table, wall seconds, CPU seconds)
     """
-    from src.file_finder import get_csv_files
+    from src.csv_processor import read_table
     
-    csv_files = get_csv_files(main_folder_path)
+    wall = time.perf_counter()
+    cpu = time.thread_time()
+    table = read_table(csv_file)
+    return table, time.perf_counter() - wall, time.thread_time() - cpu
+
+def _create_executor(executor, max_workers):
+    """
+    Create a concurrent.futures executor for the requested mode
     
-    if not csv_files:
-        logger.warning("No CSV files found!")
-        return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+    Args:
+        executor (str): 'thread' or 'process'
+        max_workers (int): Maximum number of workers, or None for the default
+        
+    Returns:
+        concurrent.futures.Executor: Executor instance
+    """
+    if executor == 'thread':
+        return ThreadPoolExecutor(max_workers=max_workers)
+    if executor == 'process':
+        return ProcessPoolExecutor(max_workers=max_workers)
+    raise ValueError(f"Unsupported executor '{executor}'. Expected one of {SUPPORTED_EXECUTORS}")
+
+def _prefetch(iterable, maxsize):
+    """
+    Consume an iterable on a background thread through a bounded queue
     
-    raw_data = []
-    temp_data = []
-    rh_data = []
+    The producer runs at most maxsize items ahead of the consumer, so a slow
+    directory walk overlaps with parsing without buffering the whole tree.
+    Errors in the producer are re-raised in the consumer.
     
-    for i, csv_file in enumerate(csv_files):
-        logger.info(f"Processing file {i+1}/{len(csv_files)}: {csv_file.name}")
+    Args:
+        iterable (iterable): Items to produce, e.g. a lazy file discovery
+        maxsize (int): Maximum number of items buffered between the stages
         
-        raw_df, temp_df, rh_df = process_single_file(csv_file, main_folder_path)
+    Yields:
+        object: The items of iterable, in order
+    """
+    items = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    done = object()
+    
+    def put(item):
+        # Give up if the consumer went away
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+    
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+            put(done)
+        except Exception as e:
+            put(e)
+    
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = items.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+def _iter_tables(entries, main_folder_path, executor, max_workers, progress_callback=None, cache_path=None,
+                 report=None, chunk_rows=None):
+    """
+    Extract metadata and tables for all files as a discover -> parse pipeline
+    
+    Entries (which may be a lazy directory walk) are pulled through a bounded
+    queue on a background thread, so parsing starts with the first file found.
+    Unchanged files are loaded from the extraction cache; the rest are parsed
+    serially or on an executor with at most PIPELINE_MAX_IN_FLIGHT files
+    submitted at once. Tables are yielded as soon as they are ready, so the
+    aggregation stage (collecting or spilling them) overlaps with parsing,
+    and memory holds a bounded number of unconsumed tables.
+    
+    Progress reports count files completed against files discovered so far
+    (the total is only known once the walk finishes) with the current
+    throughput.
+    
+    With chunk_rows set, files of at least CHUNKED_READ_MIN_BYTES bypass the
+    cache and the pool: they are read on this thread chunk_rows rows at a
+    time and yielded as several (index, metadata, chunk) tuples in row
+    order, so the caller must append chunks that share an index.
+    
+    Args:
+        entries (iterable): FileEntry records of the files to process
+        main_folder_path (str): Path to the main folder
+        executor (str): 'serial', 'thread' or 'process'
+        max_workers (int): Maximum number of workers for pooled executors
+        progress_callback (function): Callback function for progress updates
+        cache_path (str): Path to the extraction cache, or None to disable it
+        report (RunReport): Records the source, size, rows and read time of every file
+        chunk_rows (int): Rows per chunk for large files, or None to read every file whole
         
-        if not raw_df.empty:
-            raw_data.append(raw_df)
-        if not temp_df.empty:
-            temp_data.append(temp_df)
-        if not rh_df.empty:
-            rh_data.append(rh_df)
+    Yields:
+        tuple: (index, metadata, table) for every file (or chunk), in completion order
+    """
+    from src.metadata_extractor import extract_metadata_from_path
+    from src.extraction_cache import open_cache, load_cached_table, store_cached_table
+    from src.csv_processor import iter_table_chunks
+    from src.instrumentation import measure_file_memory
     
-    # Combine all data
-    raw_combined = combine_dataframes_horizontally(raw_data)
-    temp_combined = combine_dataframes_horizontally(temp_data)
-    rh_combined = combine_dataframes_horizontally(rh_data)
+    max_in_flight = PIPELINE_MAX_IN_FLIGHT or 2 * (max_workers or os.cpu_count() or 1)
+    started = time.perf_counter()
+    discovered = 0
+    completed = 0
+    cached_count = 0
     
-    return raw_combined, temp_combined, rh_combined
+    def discover():
+        # Runs on the prefetch thread, so the count includes files not yet parsed
+        nonlocal discovered
+        for entry in entries:
+            discovered += 1
+            yield entry
+    
+    def notify(csv_file, action):
+        logger.info(f"{action} file {completed}/{discovered}: {csv_file.name}")
+        if progress_callback:
+            rate = completed / max(time.perf_counter() - started, 1e-9)
+            progress_callback(completed, discovered, f"{action} {csv_file.name} ({rate:.1f} files/s)")
+    
+    def record(csv_file, source, size, table, wall=None, cpu=None, memory=None):
+        if report is not None:
+            report.record_file(csv_file, source if not table.empty else 'failed', size, len(table), wall, cpu,
+                               (memory or {}).get('peak_traced_bytes'))
+    
+    conn = open_cache(cache_path)
+    pool = None if executor == 'serial' else _create_executor(executor, max_workers)
+    in_flight = {}
+    
+    def finished(futures):
+        nonlocal completed
+        for future in futures:
+            # Drop the future so its result is freed once the caller is done with it
+            i, metadata, csv_file = in_flight.pop(future)
+            try:
+                table, wall, cpu = future.result()
+            except Exception as e:
+                logger.error(f"Error processing {csv_file}: {e}")
+                table, wall, cpu = pd.DataFrame(), None, None
+            
+            record(csv_file, 'parsed', metadata.size, table, wall, cpu)
+            if not table.empty:
+                store_cached_table(conn, csv_file, metadata.size, metadata.mtime_ns, table)
+            completed += 1
+            notify(csv_file, "Processed")
+            yield i, metadata, table
+    
+    try:
+        for i, entry in enumerate(_prefetch(discover(), PIPELINE_QUEUE_SIZE)):
+            csv_file = entry.path
+            metadata = extract_metadata_from_path(csv_file, main_folder_path, entry)
+            if not metadata:
+                completed += 1
+                record(csv_file, 'failed', entry.size, pd.DataFrame())
+                yield i, metadata, pd.DataFrame()
+                continue
+            
+            if chunk_rows and metadata.size >= CHUNKED_READ_MIN_BYTES:
+                # Time only the reading, not the caller's work between chunks
+                chunks = iter_table_chunks(csv_file, chunk_rows)
+                rows = 0
+                wall = cpu = 0.0
+                peak = None
+                while True:
+                    started_wall, started_cpu = time.perf_counter(), time.thread_time()
+                    with measure_file_memory(report) as memory:
+                        chunk = next(chunks, None)
+                    wall += time.perf_counter() - started_wall
+                    cpu += time.thread_time() - started_cpu
+                    if 'peak_traced_bytes' in memory:
+                        peak = max(peak or 0, memory['peak_traced_bytes'])
+                    if chunk is None:
+                        break
+                    rows += len(chunk)
+                    yield i, metadata, chunk
+                
+                if report is not None:
+                    report.record_file(csv_file, 'chunked' if rows else 'failed', metadata.size, rows, wall, cpu, peak)
+                completed += 1
+                notify(csv_file, "Processed in chunks")
+                if not rows:
+                    yield i, metadata, pd.DataFrame()
+                continue
+            
+            wall = time.perf_counter()
+            cached = load_cached_table(conn, csv_file, metadata.size, metadata.mtime_ns)
+            if cached is not None:
+                record(csv_file, 'cached', metadata.size, cached, time.perf_counter() - wall)
+                completed += 1
+                cached_count += 1
+                notify(csv_file, "Loaded cached")
+                yield i, metadata, cached
+                continue
+            
+            if pool is None:
+                with measure_file_memory(report) as memory:
+                    table, wall, cpu = _read_table_timed(csv_file)
+                record(csv_file, 'parsed', metadata.size, table, wall, cpu, memory)
+                if not table.empty:
+                    store_cached_table(conn, csv_file, metadata.size, metadata.mtime_ns, table)
+                completed += 1
+                notify(csv_file, "Processed")
+                yield i, metadata, table
+                continue
+            
+            # Keep a bounded number of files queued on the pool
+            while len(in_flight) >= max_in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                yield from finished(done)
+            
+            in_flight[pool.submit(_read_table_timed, csv_file)] = (i, metadata, csv_file)
+        
+        logger.info(f"Found {discovered} CSV files")
+        
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            yield from finished(done)
+        
+        if conn is not None:
+            logger.info(f"Loaded {cached_count}/{discovered} files from the extraction cache")
+            conn.commit()
+        
+        elapsed = time.perf_counter() - started
+        logger.info(f"Processed {discovered} files in {elapsed:.2f}s ({discovered / max(elapsed, 1e-9):.1f} files/s)")
+    finally:
+        if pool is not None:
+            for future in in_flight:
+                future.cancel()
+            pool.shutdown(wait=True)
+        if conn is not None:
+            conn.close()
+
+def _process_files(entries, main_folder_path, executor, max_workers, progress_callback=None, cache_path=None,
+                   report=None, catalog=None):
+    """
+    Extract the labelled table for all files
+    
+    Results are always returned in the order of entries, regardless of the
+    order in which the workers finish, so the combined column order is stable.
+    
+    Args:
+        entries (iterable): FileEntry records of the files to process
+        main_folder_path (str): Path to the main folder
+        executor (str): 'serial', 'thread' or 'process'
+        max_workers (int): Maximum number of workers for pooled executors
+        progress_callback (function): Callback function for progress updates
+        cache_path (str): Path to the extraction cache, or None to disable it
+        report (RunReport): Records every file, or None
+        catalog (FileCatalog): Gets the metadata record of every file, or None
+        
+    Returns:
+        list: One labelled table per file, in input order
+    """
+    from src.csv_processor import label_table
+    
+    results = {}
+    for i, metadata, table in _iter_tables(entries, main_folder_path, executor, max_workers,
+                                           progress_callback, cache_path, report):
+        results[i] = label_table(table, metadata)
+        if catalog is not None:
+            catalog.add(metadata)
+    
+    return [results[i] for i in sorted(results)]
+
+def process_all_files(main_folder_path, executor=None, max_workers=None, cache_path=None,
+                      combine_mode=None, tolerance=None, include=None, exclude=None, max_depth=None,
+                      report=None, catalog=None):
+    """
+    Process all CSV files in the main folder and subfolders
+    
+    Args:
+        main_folder_path (str): Path to the main folder
+        executor (str): 'serial', 'thread' or 'process' (defaults to EXTRACTION_EXECUTOR)
+        max_workers (int): Maximum number of workers (defaults to EXTRACTION_MAX_WORKERS)
+        cache_path (str): Path to the extraction cache, or None to parse every file
+        combine_mode (str): 'position' or 'timestamp' (defaults to COMBINE_MODE)
+        tolerance (str): Timestamp tolerance for 'timestamp' mode (defaults to COMBINE_TOLERANCE)
+        include (list): Globs of files to process (defaults to DISCOVERY_INCLUDE)
+        exclude (list): Globs of files and folders to skip (defaults to DISCOVERY_EXCLUDE)
+        max_depth (int): Deepest subfolder level to search (defaults to DISCOVERY_MAX_DEPTH)
+        report (RunReport): Records the extract and combine stages and every file, or None
+        catalog (FileCatalog): Gets the metadata record of every file processed, or None
+        
+    Returns:
+        pandas.DataFrame: Combined table (Temp and RH are projected from it at export)
+    """
+    return process_all_files_with_progress(
+        main_folder_path,
+        executor=executor,
+        max_workers=max_workers,
+        cache_path=cache_path,
+        combine_mode=combine_mode,
+        tolerance=tolerance,
+        include=include,
+        exclude=exclude,
+        max_depth=max_depth,
+        report=report,
+        catalog=catalog
+    )
 
-def process_all_files_with_progress(main_folder_path, progress_callback=None):
+def process_all_files_with_progress(main_folder_path, progress_callback=None, executor=None, max_workers=None,
+                                    cache_path=None, combine_mode=None, tolerance=None,
+                                    include=None, exclude=None, max_depth=None, report=None, catalog=None):
     """
     Process all CSV files in the main folder and subfolders with progress reporting
     
+    Discovery, parsing and aggregation run as a pipeline: files are parsed
+    while the folder tree is still being walked, and each table is collected
+    as soon as it is ready.
+    
     Args:
         main_folder_path (str): Path to the main folder
         progress_callback (function): Callback function for progress updates
+        executor (str): 'serial', 'thread' or 'process' (defaults to EXTRACTION_EXECUTOR)
+        max_workers (int): Maximum number of workers (defaults to EXTRACTION_MAX_WORKERS)
+        cache_path (str): Path to the extraction cache, or None to parse every file
+        combine_mode (str): 'position' or 'timestamp' (defaults to COMBINE_MODE)
+        tolerance (str): Timestamp tolerance for 'timestamp' mode (defaults to COMBINE_TOLERANCE)
+        include (list): Globs of files to process (defaults to DISCOVERY_INCLUDE)
+        exclude (list): Globs of files and folders to skip (defaults to DISCOVERY_EXCLUDE)
+        max_depth (int): Deepest subfolder level to search (defaults to DISCOVERY_MAX_DEPTH)
+        report (RunReport): Records the extract and combine stages and every file, or None
+        catalog (FileCatalog): Gets the metadata record of every file processed, or None
         
     Returns:
-        tuple: (raw_df, temp_df, rh_df) - Three combined DataFrames
+        pandas.DataFrame: Combined table (Temp and RH are projected from it at export)
     """
-    from src.file_finder import get_csv_files
+    from src.file_finder import iter_csv_files
+    from src.instrumentation import measure
     
-    csv_files = get_csv_files(main_folder_path)
+    executor = executor or EXTRACTION_EXECUTOR
+    max_workers = max_workers or EXTRACTION_MAX_WORKERS
     
-    if not csv_files:
+    # Discovery overlaps with parsing, so both are measured as one stage
+    with measure(report, 'extract') as stage:
+        results = _process_files(
+            iter_csv_files(main_folder_path, include, exclude, max_depth),
+            main_folder_path,
+            executor,
+            max_workers,
+            progress_callback=progress_callback,
+            cache_path=cache_path,
+            report=report,
+            catalog=catalog
+        )
+        stage['files'] = len(results)
+        stage['rows'] = sum(len(table) for table in results)
+        if report is not None:
+            stage['bytes'] = sum(f['file_bytes'] or 0 for f in report.files)
+    
+    if not results:
         logger.warning("No CSV files found!")
         if progress_callback:
             progress_callback(0, 0, "No CSV files found")
-        return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+        return pd.DataFrame()
     
-    raw_data = []
-    temp_data = []
-    rh_data = []
-    total_files = len(csv_files)
+    total_files = len(results)
     
-    for i, csv_file in enumerate(csv_files):
-        if progress_callback:
-            progress_callback(i, total_files, f"Processing {csv_file.name}")
-        
-        logger.info(f"Processing file {i+1}/{total_files}: {csv_file.name}")
-        
-        raw_df, temp_df, rh_df = process_single_file(csv_file, main_folder_path)
+    # Combine all data into the single canonical table
+    with measure(report, 'combine') as stage:
+        combined_df = combine_dataframes(
+            [table for table in results if not table.empty],
+            combine_mode,
+            tolerance
+        )
+        stage['rows'] = len(combined_df)
+        stage['columns'] = len(combined_df.columns)
+    
+    if progress_callback:
+        progress_callback(total_files, total_files, "Processing complete")
+    
+    return combined_df
+
+def process_all_files_streaming(main_folder_path, output_folder, progress_callback=None, executor=None,
+                                max_workers=None, cache_path=None, chunk_rows=None,
+                                include=None, exclude=None, max_depth=None, report=None, read_chunk_rows=None):
+    """
+    Process all CSV files and export Raw, Temp and RH without holding them in memory
+    
+    Each parsed table is spilled to disk as soon as it is read (while
+    discovery and parsing carry on), and the outputs are then written in row
+    chunks, so peak memory is bounded by the tables in flight plus one chunk
+    of the combined output. Files are aligned by row position. Files of at
+    least CHUNKED_READ_MIN_BYTES are also read and spilled read_chunk_rows
+    rows at a time, so a single file larger than memory can be processed.
+    
+    Args:
+        main_folder_path (str): Path to the main folder
+        output_folder (str): Path to the output folder
+        progress_callback (function): Callback function for progress updates
+        executor (str): 'serial', 'thread' or 'process' (defaults to EXTRACTION_EXECUTOR)
+        max_workers (int): Maximum number of workers (defaults to EXTRACTION_MAX_WORKERS)
+        cache_path (str): Path to the extraction cache, or None to parse every file
+        chunk_rows (int): Rows per written chunk (defaults to STREAMING_CHUNK_ROWS)
+        include (list): Globs of files to process (defaults to DISCOVERY_INCLUDE)
+        exclude (list): Globs of files and folders to skip (defaults to DISCOVERY_EXCLUDE)
+        max_depth (int): Deepest subfolder level to search (defaults to DISCOVERY_MAX_DEPTH)
+        report (RunReport): Records the stream stage and every file, or None
+        read_chunk_rows (int): Rows per chunk when reading large files (defaults to READ_CHUNK_ROWS)
         
-        if not raw_df.empty:
-            raw_data.append(raw_df)
-        if not temp_df.empty:
-            temp_data.append(temp_df)
-        if not rh_df.empty:
-            rh_data.append(rh_df)
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    from src.file_finder import iter_csv_files
+    from src.data_exporter import export_data_streaming
+    from src.instrumentation import measure
     
-    # Combine all data
-    raw_combined = combine_dataframes_horizontally(raw_data)
-    temp_combined = combine_dataframes_horizontally(temp_data)
-    rh_combined = combine_dataframes_horizontally(rh_data)
+    executor = executor or EXTRACTION_EXECUTOR
+    max_workers = max_workers or EXTRACTION_MAX_WORKERS
+    read_chunk_rows = read_chunk_rows or READ_CHUNK_ROWS
+    
+    seen = set()
+    
+    def tables():
+        for item in _iter_tables(
+            iter_csv_files(main_folder_path, include, exclude, max_depth),
+            main_folder_path,
+            executor,
+            max_workers,
+            progress_callback=progress_callback,
+            cache_path=cache_path,
+            report=report,
+            chunk_rows=read_chunk_rows
+        ):
+            seen.add(item[0])
+            yield item
+    
+    # Parsing, spilling and export are interleaved, so they are measured as one stage
+    with measure(report, 'stream') as stage:
+        success = export_data_streaming(tables(), output_folder, chunk_rows)
+        total_files = len(seen)
+        stage['files'] = total_files
+        if report is not None:
+            stage['bytes'] = sum(f['file_bytes'] or 0 for f in report.files)
+            stage['rows'] = sum(f['rows'] for f in report.files)
+    
+    if total_files == 0:
+        logger.warning("No CSV files found!")
+        if progress_callback:
+            progress_callback(0, 0, "No CSV files found")
+        return False
     
     if progress_callback:
         progress_callback(total_files, total_files, "Processing complete")
     
-    return raw_combined, temp_combined, rh_combined
+    return success
+
+def _is_numeric_dtype(dtype):
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+def get_float_dtype(dtypes):
+    """
+    Get the float dtype that holds every one of the given numeric dtypes
+    
+    Float columns keep their precision (float32 Temp/RH stay float32);
+    integer columns need a float to be padded with NaN.
+    
+    Args:
+        dtypes (iterable): numpy or pandas numeric dtypes
+        
+    Returns:
+        numpy.dtype: The promoted float dtype (float64 if there are none)
+    """
+    # Nullable pandas dtypes (e.g. Float32) carry their numpy dtype
+    dtypes = [np.dtype(getattr(dtype, 'numpy_dtype', dtype)) for dtype in dtypes]
+    dtype = reduce(np.promote_types, dtypes) if dtypes else np.dtype(np.float64)
+    return dtype if np.issubdtype(dtype, np.floating) else np.promote_types(dtype, np.float64)
 
 def combine_dataframes_horizontally(dataframes):
     """
     Combine DataFrames horizontally with proper alignment
     
+    Numeric columns are written straight into one preallocated NaN-filled
+    float block, so shorter files are padded without intermediate copies.
+    The block has the float dtype of the columns (see get_float_dtype), so
+    float32 measurements are not widened. Other columns (timestamps) are
+    padded with missing values.
+    
     Args:
         dataframes (list): List of DataFrames to combine
         
@@ -132,24 +552,176 @@ def combine_dataframes_horizontally(dataframes):
     
     # Find the maximum number of rows
     max_rows = max(len(df) for df in dataframes)
+    index = pd.RangeIndex(max_rows)
+    
+    numeric_dtypes = [dtype for df in dataframes for dtype in df.dtypes if _is_numeric_dtype(dtype)]
+    block_dtype = get_float_dtype(numeric_dtypes)
+    
+    # One row per numeric column, so each column is a contiguous view
+    block = np.full((len(numeric_dtypes), max_rows), np.nan, dtype=block_dtype)
     
-    # Align all DataFrames to the same number of rows
-    aligned_dfs = []
+    data = {}
+    names = []
+    k = 0
     for df in dataframes:
-        if len(df) < max_rows:
-            # Add empty rows to match the maximum
-            empty_rows = pd.DataFrame(
-                {col: [None] * (max_rows - len(df)) for col in df.columns},
-                index=range(len(df), max_rows)
-            )
-            aligned_df = pd.concat([df, empty_rows])
-        else:
-            aligned_df = df
-        
-        aligned_dfs.append(aligned_df)
+        n = len(df)
+        for j, name in enumerate(df.columns):
+            column = df.iloc[:, j]
+            position = len(names)
+            names.append(name)
+            
+            if _is_numeric_dtype(column.dtype):
+                block[k, :n] = column.to_numpy(dtype=block_dtype, na_value=np.nan)
+                data[position] = block[k]
+                k += 1
+            else:
+                data[position] = column.reset_index(drop=True).reindex(index)
     
-    # Combine all DataFrames horizontally
-    combined_df = pd.concat(aligned_dfs, axis=1)
+    # Build without copying or consolidating the preallocated block
+    combined_df = pd.DataFrame(data, index=index, copy=False)
+    combined_df.columns = names
     
     logger.info(f"Combined data shape: {combined_df.shape}")
-    return combined_df
\ No newline at end of file
+    return combined_df
+
+def _merge_sorted_timelines(timelines):
+    """
+    Merge sorted int64 timestamp arrays into one sorted unique timeline
+    
+    The arrays are concatenated and sorted with numpy's stable sort, which
+    finds the already sorted runs and merges them, so the merge stays
+    vectorized however many loggers there are.
+    
+    Args:
+        timelines (list): List of sorted numpy int64 arrays
+        
+    Returns:
+        numpy.ndarray: Sorted array of the distinct timestamps
+    """
+    if not timelines:
+        return np.array([], dtype=np.int64)
+    
+    merged = np.concatenate(timelines)
+    merged.sort(kind='stable')
+    
+    # Keep the first of each run of equal timestamps
+    keep = np.empty(len(merged), dtype=bool)
+    keep[:1] = True
+    np.not_equal(merged[1:], merged[:-1], out=keep[1:])
+    return merged[keep]
+
+def _frame_timestamps(df, tolerance=None):
+    """
+    Get the timestamps (the first column) of a frame
+    
+    Args:
+        df (pd.DataFrame): Frame whose first column is its Timestamp
+        tolerance (str): Optional frequency to floor the timestamps to
+        
+    Returns:
+        pandas.Series: datetime64 timestamps (NaT where parsing failed)
+    """
+    timestamps = df.iloc[:, 0]
+    if tolerance:
+        timestamps = timestamps.dt.floor(tolerance)
+    return timestamps
+
+def combine_dataframes_by_timestamp(dataframes, tolerance=None):
+    """
+    Combine DataFrames horizontally, aligning rows on their timestamps
+    
+    The sorted timestamps of all frames are merged into a single timeline
+    (see _merge_sorted_timelines), and each frame's values are written into
+    the rows of their timestamps. Loggers that started at different times
+    therefore line up on the same time axis. When several readings of one
+    frame fall on the same timestamp (e.g. after applying the tolerance),
+    only the last one in time order is kept and the merge is logged.
+    
+    Args:
+        dataframes (list): List of DataFrames whose first column is a Timestamp
+        tolerance (str): Optional frequency (e.g. '1min') to snap timestamps to
+        
+    Returns:
+        pandas.DataFrame: Combined DataFrame with a Timestamp column and the value columns
+    """
+    if not dataframes:
+        return pd.DataFrame()
+    
+    frames = []
+    for df in dataframes:
+        timestamps = _frame_timestamps(df, tolerance)
+        valid = timestamps.notna().to_numpy()
+        if not valid.all():
+            logger.warning(f"Dropping {(~valid).sum()} rows without a timestamp from {df.columns[-1]}")
+        
+        keys = timestamps.to_numpy()[valid].astype('datetime64[ns]').astype(np.int64)
+        values = df.iloc[valid, 1:]
+        
+        # Loggers write in time order; only sort when that does not hold
+        if len(keys) and not (keys[1:] >= keys[:-1]).all():
+            order = np.argsort(keys, kind='stable')
+            keys = keys[order]
+            values = values.iloc[order]
+        
+        # One reading per timestamp: keep the last of each run of equal keys
+        last = np.ones(len(keys), dtype=bool)
+        np.not_equal(keys[:-1], keys[1:], out=last[:-1])
+        if not last.all():
+            logger.warning(f"Merged {(~last).sum()} readings sharing a timestamp into the last one for {df.columns[-1]}")
+            keys = keys[last]
+            values = values.iloc[last]
+        
+        frames.append((keys, values))
+    
+    timeline = _merge_sorted_timelines([keys for keys, _ in frames])
+    max_rows = len(timeline)
+    index = pd.RangeIndex(max_rows)
+    
+    numeric_dtypes = [dtype for _, values in frames for dtype in values.dtypes if _is_numeric_dtype(dtype)]
+    block_dtype = get_float_dtype(numeric_dtypes)
+    block = np.full((len(numeric_dtypes), max_rows), np.nan, dtype=block_dtype)
+    
+    data = {0: pd.Series(timeline.astype('datetime64[ns]'), index=index)}
+    names = ['Timestamp']
+    k = 0
+    for keys, values in frames:
+        rows = np.searchsorted(timeline, keys)
+        for j, name in enumerate(values.columns):
+            column = values.iloc[:, j].to_numpy()
+            position = len(names)
+            names.append(name)
+            
+            if _is_numeric_dtype(values.dtypes.iloc[j]):
+                block[k, rows] = column.astype(block_dtype)
+                data[position] = block[k]
+                k += 1
+            else:
+                padded = np.full(max_rows, None, dtype=object)
+                padded[rows] = column
+                data[position] = padded
+    
+    combined_df = pd.DataFrame(data, index=index, copy=False)
+    combined_df.columns = names
+    
+    logger.info(f"Combined data shape (timestamp aligned): {combined_df.shape}")
+    return combined_df
+
+def combine_dataframes(dataframes, mode=None, tolerance=None):
+    """
+    Combine DataFrames horizontally using the selected alignment mode
+    
+    Args:
+        dataframes (list): List of DataFrames to combine
+        mode (str): 'position' or 'timestamp' (defaults to COMBINE_MODE)
+        tolerance (str): Timestamp tolerance for 'timestamp' mode (defaults to COMBINE_TOLERANCE)
+        
+    Returns:
+        pandas.DataFrame: Combined DataFrame
+    """
+    mode = mode or COMBINE_MODE
+    
+    if mode == 'position':
+        return combine_dataframes_horizontally(dataframes)
+    if mode == 'timestamp':
+        return combine_dataframes_by_timestamp(dataframes, tolerance or COMBINE_TOLERANCE)
+    raise ValueError(f"Unsupported combine mode '{mode}'. Expected one of {SUPPORTED_COMBINE_MODES}")
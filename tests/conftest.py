@@ -0,0 +1,26 @@
+# Shared fixtures: small logger export trees
+
+import pytest
+
+PREAMBLE = "Logger Name,{name}\r\nDownload Date,01/02/2024 10:00:00\r\n"
+HEADER = "Date,Time,Temperature(C),Humidity(%RH),Battery\r\n"
+
+@pytest.fixture
+def write_logger(tmp_path):
+    """
+    Write a logger export under tmp_path/data
+    
+    Returns:
+        function: write(relative_path, start_minute, rows) -> Path, with one reading every 10 minutes
+    """
+    def write(relative_path, start_minute=0, rows=5):
+        path = tmp_path / 'data' / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lines = [PREAMBLE.format(name=path.stem), HEADER]
+        for i in range(rows):
+            minute = start_minute + 10 * i
+            lines.append(f"01/01/2024,{minute // 60:02d}:{minute % 60:02d}:00,{20 + i / 10:.1f},{50 + i / 10:.1f},3.3\r\n")
+        path.write_text(''.join(lines), newline='')
+        return path
+    
+    return write
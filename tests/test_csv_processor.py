@@ -0,0 +1,172 @@
+# Tests for table location, parsing and encoding detection
+
+import codecs
+import io
+import mmap
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src import csv_processor
+from src.csv_processor import _TranscodingReader, iter_table_chunks, locate_table, locate_table_mapped, read_table
+from src.header_rules import compile_header_rules
+
+PREAMBLE = "Logger Name,DL001\r\nDownload Date,01/02/2024 10:00:00\r\n"
+TABLE = (
+    "Date,Time,Temperature(C),Humidity(%RH),Battery\r\n"
+    "01/01/2024,00:00:00,20.5,50.0,3.3\r\n"
+    "01/01/2024,00:10:00,20.6,50.5,3.3\r\n"
+)
+
+def write_file(folder, name, text, encoding='utf-8'):
+    path = Path(folder) / name
+    path.write_bytes(text.encode(encoding))
+    return path
+
+def locate_both(path, rules):
+    # (table start, rest of the file from the table header row) from the streaming and the mmap path
+    with open(path, 'rb') as f:
+        streamed = locate_table(f, path, rules), f.read()
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        table_start, position = locate_table_mapped(mapped, path, rules)
+        mapped_result = table_start, (mapped[position:] if position is not None else b'')
+    return streamed, mapped_result
+
+@pytest.mark.parametrize('offset, table_start, first_line', [
+    (0, 1, b'Download Date'),
+    (1, 2, b'Date,Time'),
+    (2, 3, b'01/01/2024,00:00:00'),
+])
+def test_locate_table_paths_agree_on_offsets(tmp_path, offset, table_start, first_line):
+    path = write_file(tmp_path, 'a.csv', PREAMBLE + TABLE)
+    rules = compile_header_rules([{'vendor': 'test', 'signatures': ['download date'], 'offset': offset}])
+    
+    streamed, mapped = locate_both(path, rules)
+    assert streamed == mapped
+    assert streamed[0] == table_start
+    assert streamed[1].startswith(first_line)
+
+def test_locate_table_paths_agree_on_header_at_end_of_file(tmp_path):
+    path = write_file(tmp_path, 'a.csv', PREAMBLE)
+    rules = compile_header_rules([{'vendor': 'test', 'signatures': ['download date'], 'offset': 1}])
+    
+    streamed, mapped = locate_both(path, rules)
+    assert streamed[0] == mapped[0] == -1
+
+def test_locate_table_paths_agree_on_missing_header(tmp_path):
+    path = write_file(tmp_path, 'a.csv', PREAMBLE + TABLE)
+    rules = compile_header_rules([{'vendor': 'test', 'signatures': ['serial'], 'offset': 1}])
+    
+    streamed, mapped = locate_both(path, rules)
+    assert streamed[0] == mapped[0] == -1
+
+def test_first_rule_wins_when_several_match_one_line(tmp_path):
+    # 'date' comes first on the header row, but the vendor rule is listed first
+    path = write_file(tmp_path, 'a.csv', "Logger Name,DL001\r\n" + TABLE)
+    rules = compile_header_rules([
+        {'vendor': 'vendor', 'signatures': ['temperature'], 'offset': 0},
+        {'vendor': 'default', 'signatures': ['date'], 'offset': 1},
+    ])
+    
+    streamed, mapped = locate_both(path, rules)
+    assert streamed == mapped
+    assert streamed[0] == 1
+    assert streamed[1].startswith(b'Date,Time')
+
+def test_negative_offset_is_rejected():
+    with pytest.raises(ValueError):
+        compile_header_rules([{'vendor': 'test', 'signatures': ['date'], 'offset': -1}])
+
+@pytest.mark.parametrize('use_mmap', [True, False])
+def test_read_table(tmp_path, monkeypatch, use_mmap):
+    monkeypatch.setattr(csv_processor, 'HEADER_SCAN_MMAP', use_mmap)
+    path = write_file(tmp_path, 'a.csv', PREAMBLE + TABLE)
+    
+    df = read_table(path)
+    assert list(df.columns) == ['Timestamp', 'Temp', 'RH']
+    assert df['Timestamp'].dt.strftime('%Y-%m-%d %H:%M').tolist() == ['2024-01-01 00:00', '2024-01-01 00:10']
+    assert df['Temp'].tolist() == [20.5, 20.6]
+    assert df['RH'].tolist() == [50.0, 50.5]
+
+@pytest.mark.parametrize('use_mmap', [True, False])
+def test_read_table_with_header_row_only(tmp_path, monkeypatch, use_mmap):
+    monkeypatch.setattr(csv_processor, 'HEADER_SCAN_MMAP', use_mmap)
+    path = write_file(tmp_path, 'a.csv', PREAMBLE + TABLE.splitlines(keepends=True)[0])
+    
+    df = read_table(path)
+    assert list(df.columns) == ['Timestamp', 'Temp', 'RH']
+    assert df.empty
+
+@pytest.mark.parametrize('use_mmap', [True, False])
+def test_read_table_coerces_non_numeric_measurements(tmp_path, monkeypatch, use_mmap):
+    monkeypatch.setattr(csv_processor, 'HEADER_SCAN_MMAP', use_mmap)
+    path = write_file(tmp_path, 'a.csv', PREAMBLE + TABLE + "01/01/2024,00:20:00,error,51.0,3.3\r\n")
+    
+    df = read_table(path)
+    assert len(df) == 3
+    assert df['Temp'].isna().tolist() == [False, False, True]
+    assert df['RH'].tolist() == [50.0, 50.5, 51.0]
+
+@pytest.mark.parametrize('engine', ['c', 'pyarrow'])
+def test_read_table_with_truncated_last_row(tmp_path, monkeypatch, engine):
+    if engine == 'pyarrow':
+        pytest.importorskip('pyarrow')
+    monkeypatch.setattr(csv_processor, '_csv_engine', engine)
+    path = write_file(tmp_path, 'a.csv', PREAMBLE + TABLE + "01/01/2024,00:20:00,20.7,51.0")
+    
+    df = read_table(path)
+    assert df['Temp'].tolist() == [20.5, 20.6, 20.7]
+    assert df['RH'].tolist() == [50.0, 50.5, 51.0]
+
+@pytest.mark.parametrize('engine', ['c', 'pyarrow'])
+def test_read_table_with_truncated_last_row_and_bad_value(tmp_path, monkeypatch, engine):
+    if engine == 'pyarrow':
+        pytest.importorskip('pyarrow')
+    monkeypatch.setattr(csv_processor, '_csv_engine', engine)
+    path = write_file(tmp_path, 'a.csv', PREAMBLE + TABLE + "01/01/2024,00:20:00,error,51.0,3.3\r\n01/01/2024,00:30")
+    
+    df = read_table(path)
+    assert len(df) == 4
+    assert df['Temp'].isna().tolist() == [False, False, True, True]
+    assert df['RH'].tolist()[:3] == [50.0, 50.5, 51.0]
+
+def test_utf16_without_bom_after_cp1252_file_in_same_folder(tmp_path):
+    cp1252_file = write_file(tmp_path, 'a.csv', "Logger Name,Caf\xe9\r\n" + PREAMBLE + TABLE, 'cp1252')
+    utf16_file = write_file(tmp_path, 'b.csv', PREAMBLE + TABLE, 'utf-16-le')
+    
+    assert len(read_table(cp1252_file)) == 2
+    df = read_table(utf16_file)
+    assert len(df) == 2
+    assert df['Temp'].tolist() == [20.5, 20.6]
+
+@pytest.mark.parametrize('encoding', ['utf-16', 'utf-16-be', 'utf-32'])
+def test_read_table_wide_encodings(tmp_path, encoding):
+    path = write_file(tmp_path, 'a.csv', PREAMBLE + TABLE + "01/01/2024,00:20:00,error,51.0,3.3\r\n", encoding)
+    
+    df = read_table(path)
+    assert df['Temp'].tolist()[:2] == [20.5, 20.6]
+    assert df['RH'].tolist() == [50.0, 50.5, 51.0]
+
+@pytest.mark.parametrize('block_size', [1, 3, 7, 1024])
+def test_transcoding_reader_reads_and_seeks(block_size):
+    text = PREAMBLE + "Caf\xe9 \u2103\r\n" + TABLE
+    raw = io.BytesIO(codecs.BOM_UTF16_LE + text.encode('utf-16-le'))
+    
+    with io.BufferedReader(_TranscodingReader(raw, 'utf-16-le', 2, block_size)) as stream:
+        first = stream.readline()
+        position = stream.tell()
+        rest = stream.read()
+        stream.seek(position)
+        assert stream.read() == rest
+        stream.seek(0)
+        assert stream.read() == text.encode('utf-8')
+    assert first == PREAMBLE.splitlines(keepends=True)[0].encode('utf-8')
+
+def test_iter_table_chunks_utf16_matches_read_table(tmp_path):
+    rows = "".join(f"01/01/2024,{h:02d}:00:00,{20 + h / 10:.1f},{50 + h:.1f},3.3\r\n" for h in range(24))
+    path = write_file(tmp_path, 'a.csv', PREAMBLE + TABLE.splitlines(keepends=True)[0] + rows, 'utf-16')
+    
+    chunks = list(iter_table_chunks(path, chunk_rows=5))
+    assert [len(chunk) for chunk in chunks] == [5, 5, 5, 5, 4]
+    assert pd.concat(chunks, ignore_index=True).equals(read_table(path))
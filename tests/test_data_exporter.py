@@ -0,0 +1,38 @@
+# Tests for writing the Raw, Temp and RH outputs
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import utils
+from src.data_exporter import _table_to_records, export_data
+from src.utils import process_all_files, process_all_files_streaming
+
+def test_table_to_records_keeps_float32_measurements():
+    table = pd.DataFrame({
+        'Timestamp': pd.date_range('2024-01-01', periods=2, freq='1min'),
+        'Temp': np.array([20.5, np.nan], dtype=np.float32),
+        'RH': np.array([50, 51], dtype=np.int64),
+    })
+    
+    records = _table_to_records(table)
+    assert records.dtype['Temp'] == np.float32
+    assert records.dtype['RH'] == np.float64
+    assert (records['Timestamp'] == table['Timestamp'].to_numpy()).all()
+
+@pytest.mark.parametrize('chunked_reads', [False, True])
+def test_streaming_export_matches_in_memory_export(tmp_path, monkeypatch, write_logger, chunked_reads):
+    write_logger('roomA/dl1.csv', start_minute=0, rows=7)
+    write_logger('roomA/dl2.csv', start_minute=20, rows=3)
+    write_logger('roomB/dl1.csv', start_minute=10, rows=12)
+    write_logger('roomB/empty.csv', rows=0)
+    if chunked_reads:
+        # Read and spill every file a few rows at a time
+        monkeypatch.setattr(utils, 'CHUNKED_READ_MIN_BYTES', 0)
+    data_folder = str(tmp_path / 'data')
+    
+    assert export_data(process_all_files(data_folder), str(tmp_path / 'memory'), 'csv')
+    assert process_all_files_streaming(data_folder, str(tmp_path / 'stream'), chunk_rows=4, read_chunk_rows=5)
+    
+    for name in ['Raw', 'Temp', 'RH']:
+        assert (tmp_path / 'stream' / f'{name}.csv').read_bytes() == (tmp_path / 'memory' / f'{name}.csv').read_bytes()
@@ -0,0 +1,50 @@
+# Tests for the persistent extraction cache
+
+import pickle
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import extraction_cache
+from src.extraction_cache import load_cached_table, open_cache, store_cached_table
+
+pytest.importorskip('pyarrow')
+
+@pytest.fixture
+def table():
+    return pd.DataFrame({
+        'Timestamp': pd.to_datetime(['2024-01-01 00:00', None]).astype('datetime64[ns]'),
+        'Temp': np.array([20.5, np.nan], dtype=np.float32),
+        'RH': [50.0, 50.5],
+    })
+
+def test_round_trip_keeps_values_and_dtypes(tmp_path, table):
+    conn = open_cache(str(tmp_path / 'cache.sqlite'))
+    store_cached_table(conn, tmp_path / 'a.csv', 10, 20, table)
+    
+    cached = load_cached_table(conn, tmp_path / 'a.csv', 10, 20)
+    pd.testing.assert_frame_equal(cached, table)
+    assert load_cached_table(conn, tmp_path / 'a.csv', 11, 20) is None
+
+def test_pickled_entries_are_not_loaded(tmp_path, table):
+    conn = open_cache(str(tmp_path / 'cache.sqlite'))
+    conn.execute(
+        "INSERT INTO tables (path, size, mtime_ns, data) VALUES (?, ?, ?, ?)",
+        (str((tmp_path / 'a.csv').resolve()), 10, 20, sqlite3.Binary(pickle.dumps(table)))
+    )
+    
+    assert load_cached_table(conn, tmp_path / 'a.csv', 10, 20) is None
+
+def test_version_change_clears_the_cache(tmp_path, monkeypatch, table):
+    cache_path = str(tmp_path / 'cache.sqlite')
+    (tmp_path / 'a.csv').write_text('')
+    conn = open_cache(cache_path)
+    store_cached_table(conn, tmp_path / 'a.csv', 10, 20, table)
+    conn.commit()
+    conn.close()
+    
+    monkeypatch.setattr(extraction_cache.pd, '__version__', '0.0.0')
+    conn = open_cache(cache_path)
+    assert load_cached_table(conn, tmp_path / 'a.csv', 10, 20) is None
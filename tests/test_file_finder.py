@@ -0,0 +1,36 @@
+# Tests for CSV file discovery
+
+import pytest
+
+from src.file_finder import get_csv_files
+
+@pytest.fixture
+def tree(tmp_path):
+    for name in ['top.csv', 'a/x.csv', 'a/b/y.csv', 'a/b/c/z.csv', 'archive/old.csv', 'd/archive/old.csv', 'a/notes.txt']:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('')
+    return tmp_path
+
+def found(folder, include=None, exclude=None, max_depth=None):
+    return sorted(path.relative_to(folder).as_posix() for path in get_csv_files(folder, include, exclude, max_depth))
+
+def test_default_include_finds_csv_files_at_any_depth(tree):
+    assert found(tree) == ['a/b/c/z.csv', 'a/b/y.csv', 'a/x.csv', 'archive/old.csv', 'd/archive/old.csv', 'top.csv']
+
+@pytest.mark.parametrize('pattern, expected', [
+    ('a/*.csv', ['a/x.csv']),
+    ('a/*/*.csv', ['a/b/y.csv']),
+    ('a/**/*.csv', ['a/b/c/z.csv', 'a/b/y.csv', 'a/x.csv']),
+    ('**/archive/*.csv', ['archive/old.csv', 'd/archive/old.csv']),
+    ('y.csv', ['a/b/y.csv']),
+])
+def test_include_globs_match_one_folder_level_per_star(tree, pattern, expected):
+    assert found(tree, include=[pattern]) == expected
+
+def test_exclude_folder_by_name_or_path(tree):
+    assert found(tree, exclude=['archive']) == ['a/b/c/z.csv', 'a/b/y.csv', 'a/x.csv', 'top.csv']
+    assert found(tree, exclude=['a/*']) == ['archive/old.csv', 'd/archive/old.csv', 'top.csv']
+
+def test_max_depth(tree):
+    assert found(tree, max_depth=1) == ['a/x.csv', 'archive/old.csv', 'top.csv']
@@ -0,0 +1,91 @@
+# Tests for incremental updates of the outputs
+
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from src.data_exporter import export_data, read_exported_data
+from src.incremental import get_manifest_path, update_outputs
+from src.utils import process_all_files
+
+@pytest.fixture
+def folders(tmp_path, write_logger):
+    # Loggers with different start times and lengths, so position and timestamp alignment differ
+    write_logger('roomA/dl1.csv', start_minute=0, rows=5)
+    write_logger('roomA/dl2.csv', start_minute=20, rows=3)
+    write_logger('roomB/dl1.csv', start_minute=10, rows=8)
+    return tmp_path / 'data', tmp_path / 'out'
+
+def rebuilt_raw(data_folder, output_folder, combine_mode):
+    # Raw output of a full rebuild, read back the same way as the incremental one
+    full_folder = f"{output_folder}_full"
+    assert export_data(process_all_files(str(data_folder), combine_mode=combine_mode), full_folder, 'csv')
+    return read_exported_data(os.path.join(full_folder, 'Raw.csv'))
+
+def assert_matches_rebuild(data_folder, output_folder, combine_mode):
+    raw = read_exported_data(os.path.join(output_folder, 'Raw.csv'))
+    expected = rebuilt_raw(data_folder, output_folder, combine_mode)
+    # New and changed files are appended as the last columns
+    pd.testing.assert_frame_equal(raw[sorted(raw.columns)], expected[sorted(expected.columns)])
+
+def update(data_folder, output_folder, combine_mode, **options):
+    return update_outputs(str(data_folder), str(output_folder), 'csv', combine_mode=combine_mode,
+                          settle_seconds=0, **options)
+
+def manifest_files(output_folder):
+    with open(get_manifest_path(str(output_folder)), encoding='utf-8') as f:
+        return json.load(f)['files']
+
+@pytest.mark.parametrize('combine_mode', ['position', 'timestamp'])
+def test_add_change_and_remove_match_a_full_rebuild(folders, write_logger, combine_mode):
+    data_folder, output_folder = folders
+    assert update(data_folder, output_folder, combine_mode)
+    assert_matches_rebuild(data_folder, output_folder, combine_mode)
+    
+    write_logger('roomC/dl9.csv', start_minute=90, rows=4)
+    assert update(data_folder, output_folder, combine_mode)
+    assert_matches_rebuild(data_folder, output_folder, combine_mode)
+    
+    write_logger('roomA/dl2.csv', start_minute=20, rows=6)
+    assert update(data_folder, output_folder, combine_mode)
+    assert_matches_rebuild(data_folder, output_folder, combine_mode)
+    
+    # The longest and the latest logger: position mode trims rows, timestamp mode drops timestamps
+    os.remove(data_folder / 'roomB' / 'dl1.csv')
+    os.remove(data_folder / 'roomC' / 'dl9.csv')
+    assert update(data_folder, output_folder, combine_mode)
+    assert_matches_rebuild(data_folder, output_folder, combine_mode)
+    assert sorted(os.path.relpath(path, data_folder) for path in manifest_files(output_folder)) == [
+        os.path.join('roomA', 'dl1.csv'), os.path.join('roomA', 'dl2.csv')
+    ]
+
+def test_unchanged_folder_leaves_the_outputs_alone(folders):
+    data_folder, output_folder = folders
+    assert update(data_folder, output_folder, 'position')
+    raw_path = output_folder / 'Raw.csv'
+    os.utime(raw_path, ns=(0, 0))
+    
+    assert update(data_folder, output_folder, 'position')
+    assert os.stat(raw_path).st_mtime_ns == 0
+
+def test_unsettled_files_wait_for_a_later_pass(folders, write_logger):
+    data_folder, output_folder = folders
+    assert update(data_folder, output_folder, 'position')
+    
+    new_file = write_logger('roomC/dl9.csv', rows=4)
+    assert update_outputs(str(data_folder), str(output_folder), 'csv', combine_mode='position', settle_seconds=3600)
+    assert str(new_file) not in manifest_files(output_folder)
+    assert 'roomC_dl9_Temp' not in read_exported_data(str(output_folder / 'Raw.csv')).columns
+    
+    assert update(data_folder, output_folder, 'position')
+    assert str(new_file) in manifest_files(output_folder)
+    assert_matches_rebuild(data_folder, output_folder, 'position')
+
+def test_changed_output_settings_rebuild_the_outputs(folders):
+    data_folder, output_folder = folders
+    assert update(data_folder, output_folder, 'position')
+    
+    assert update(data_folder, output_folder, 'timestamp')
+    assert_matches_rebuild(data_folder, output_folder, 'timestamp')
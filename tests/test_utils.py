@@ -0,0 +1,58 @@
+# Tests for combining logger tables
+
+import numpy as np
+import pandas as pd
+
+from src.utils import combine_dataframes_by_timestamp, combine_dataframes_horizontally, get_float_dtype
+
+def logger_frame(name, start, periods, freq='1min', first_value=0.0):
+    timestamps = pd.date_range(start, periods=periods, freq=freq)
+    values = np.arange(periods, dtype=np.float64) + first_value
+    return pd.DataFrame({f'{name}_Timestamp': timestamps, f'{name}_Temp': values})
+
+def test_combine_by_timestamp_aligns_mixed_start_times():
+    early = logger_frame('a', '2024-01-01 00:00', 3)
+    late = logger_frame('b', '2024-01-01 00:02', 3, first_value=10.0)
+    
+    combined = combine_dataframes_by_timestamp([early, late])
+    assert combined['Timestamp'].dt.strftime('%H:%M').tolist() == ['00:00', '00:01', '00:02', '00:03', '00:04']
+    assert combined['a_Temp'].tolist()[:3] == [0.0, 1.0, 2.0]
+    assert combined['a_Temp'].isna().tolist() == [False, False, False, True, True]
+    assert combined['b_Temp'].isna().tolist() == [True, True, False, False, False]
+    assert combined['b_Temp'].tolist()[2:] == [10.0, 11.0, 12.0]
+
+def test_combine_by_timestamp_keeps_unsorted_frames_aligned():
+    df = logger_frame('a', '2024-01-01 00:00', 4).iloc[[2, 0, 3, 1]]
+    
+    combined = combine_dataframes_by_timestamp([df])
+    assert combined['a_Temp'].tolist() == [0.0, 1.0, 2.0, 3.0]
+
+def test_combine_by_timestamp_keeps_last_reading_within_tolerance(caplog):
+    minutes = logger_frame('a', '2024-01-01 00:00', 10)
+    five_minutes = logger_frame('b', '2024-01-01 00:00', 2, freq='5min', first_value=10.0)
+    
+    combined = combine_dataframes_by_timestamp([minutes, five_minutes], tolerance='5min')
+    assert combined['Timestamp'].dt.strftime('%H:%M').tolist() == ['00:00', '00:05']
+    assert combined['a_Temp'].tolist() == [4.0, 9.0]
+    assert combined['b_Temp'].tolist() == [10.0, 11.0]
+    assert any('Merged 8 readings' in record.getMessage() for record in caplog.records)
+
+def test_combine_horizontally_pads_shorter_frames():
+    combined = combine_dataframes_horizontally([logger_frame('a', '2024-01-01', 3), logger_frame('b', '2024-01-01', 1)])
+    assert list(combined.columns) == ['a_Timestamp', 'a_Temp', 'b_Timestamp', 'b_Temp']
+    assert combined['b_Temp'].isna().tolist() == [False, True, True]
+    assert combined['b_Timestamp'].isna().tolist() == [False, True, True]
+
+def test_combine_keeps_float32_measurements():
+    frames = [logger_frame('a', '2024-01-01', 3).astype({'a_Temp': 'float32'}),
+              logger_frame('b', '2024-01-01', 1).astype({'b_Temp': 'float32'})]
+    
+    assert (combine_dataframes_horizontally(frames).dtypes.iloc[[1, 3]] == 'float32').all()
+    assert (combine_dataframes_by_timestamp(frames).dtypes.iloc[1:] == 'float32').all()
+
+def test_get_float_dtype():
+    assert get_float_dtype([np.dtype('float32'), np.dtype('float32')]) == np.float32
+    assert get_float_dtype([np.dtype('float32'), np.dtype('float64')]) == np.float64
+    assert get_float_dtype([np.dtype('int64')]) == np.float64
+    assert get_float_dtype([pd.Float32Dtype()]) == np.float32
+    assert get_float_dtype([]) == np.float64